@@ -5,16 +5,15 @@ Opens desktop applications
 import os
 import subprocess
 import platform
-from config.settings import Settings
+from config.command_catalog import command_catalog
 from utils.logger import logger
-from utils.helpers import load_json
+from utils.service_registry import registry
 
 class AppLauncher:
     """Launch desktop applications"""
     
     def __init__(self):
         """Initialize app launcher"""
-        self.commands_config = load_json(Settings.COMMANDS_CONFIG_FILE)
         self.system = platform.system()
         logger.info(f"App launcher initialized for {self.system}")
     
@@ -29,15 +28,13 @@ class AppLauncher:
             bool: True if successful
         """
         try:
-            # Get app configuration
-            app_config = self.commands_config.get("applications", {}).get(app_name)
+            # Get app command from the shared catalog
+            command = command_catalog.snapshot().app_commands.get(app_name)
             
-            if not app_config:
+            if not command:
                 logger.error(f"Unknown application: {app_name}")
                 return False
             
-            command = app_config.get("command")
-            
             # Platform-specific launching
             if self.system == "Windows":
                 success = self._launch_windows(command)
@@ -122,4 +119,4 @@ class AppLauncher:
             return False
 
 # Global app launcher instance
-app_launcher = AppLauncher()
\ No newline at end of file
+app_launcher = registry.register("app_launcher", AppLauncher)
\ No newline at end of file
@@ -7,6 +7,7 @@ import shutil
 from datetime import datetime
 from pathlib import Path
 from utils.logger import logger
+from utils.service_registry import registry
 
 class FileManager:
     """Manage file operations"""
@@ -182,4 +183,4 @@ class FileManager:
             return 0
 
 # Global file manager instance
-file_manager = FileManager()
\ No newline at end of file
+file_manager = registry.register("file_manager", FileManager)
\ No newline at end of file
@@ -6,6 +6,7 @@ from datetime import datetime
 import platform
 import psutil
 from utils.logger import logger
+from utils.service_registry import registry
 
 class SystemInfo:
     """Provide system information"""
@@ -90,4 +91,4 @@ class SystemInfo:
             return None
 
 # Global system info instance
-system_info = SystemInfo()
\ No newline at end of file
+system_info = registry.register("system_info", SystemInfo)
\ No newline at end of file
@@ -3,16 +3,15 @@ Web Opener
 Opens websites in default browser
 """
 import webbrowser
-from config.settings import Settings
+from config.command_catalog import command_catalog
 from utils.logger import logger
-from utils.helpers import load_json
+from utils.service_registry import registry
 
 class WebOpener:
     """Open websites in browser"""
     
     def __init__(self):
         """Initialize web opener"""
-        self.commands_config = load_json(Settings.COMMANDS_CONFIG_FILE)
         logger.info("Web opener initialized")
     
     def open_website(self, site_name):
@@ -26,15 +25,13 @@ class WebOpener:
             bool: True if successful
         """
         try:
-            # Get website configuration
-            site_config = self.commands_config.get("websites", {}).get(site_name)
+            # Get website URL from the shared catalog
+            url = command_catalog.snapshot().urls.get(site_name)
             
-            if not site_config:
+            if not url:
                 logger.error(f"Unknown website: {site_name}")
                 return False
             
-            url = site_config.get("url")
-            
             # Open in browser
             webbrowser.open(url)
             logger.info(f"Opened website: {site_name} ({url})")
@@ -115,4 +112,4 @@ class WebOpener:
             return False
 
 # Global web opener instance
-web_opener = WebOpener()
\ No newline at end of file
+web_opener = registry.register("web_opener", WebOpener)
\ No newline at end of file
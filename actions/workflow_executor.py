@@ -5,6 +5,7 @@ Executes complex multi-step workflows like "start my day"
 import time
 from config.settings import Settings
 from utils.logger import logger
+from utils.service_registry import registry
 from memory.memory_manager import memory
 from actions.app_launcher import app_launcher
 from actions.web_opener import web_opener
@@ -147,4 +148,4 @@ class WorkflowExecutor:
             return False
 
 # Global workflow executor instance
-workflow_executor = WorkflowExecutor()
\ No newline at end of file
+workflow_executor = registry.register("workflow_executor", WorkflowExecutor)
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Command Catalog
+Single shared, pre-compiled view of commands_config.json with hot reload
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import namedtuple
+from config.settings import Settings
+from utils.logger import logger
+from utils.service_registry import registry
+
+# Intent produced by each catalog section (entries may override with "intent")
+CATEGORY_INTENTS = {
+    "applications": "open_app",
+    "websites": "open_website",
+    "workflows": "workflow",
+    "system_commands": "system_info",
+}
+
+# Confidence of a direct keyword hit in each section
+CATEGORY_CONFIDENCE = {
+    "applications": 0.9,
+    "websites": 0.9,
+    "workflows": 0.85,
+    "system_commands": 0.95,
+}
+
+CatalogEntry = namedtuple("CatalogEntry", ["category", "name", "intent", "confidence", "keywords", "data"])
+
+class CatalogSnapshot:
+    """Immutable parsed catalog plus the structures derived from it"""
+
+    def __init__(self, raw, fingerprint, mtime):
+        """
+        Build lookup tables from the raw config
+
+        Args:
+            raw: Parsed commands_config.json
+            fingerprint: Content hash of the file
+            mtime: File modification time the snapshot was read at
+        """
+        self.raw = raw
+        self.fingerprint = fingerprint
+        self.mtime = mtime
+
+        self.entries = []
+        for category, intent in CATEGORY_INTENTS.items():
+            for name, data in raw.get(category, {}).items():
+                keywords = tuple(k.lower().strip() for k in data.get("keywords", []) if k.strip())
+                self.entries.append(CatalogEntry(
+                    category=category,
+                    name=name,
+                    intent=data.get("intent", intent),
+                    confidence=CATEGORY_CONFIDENCE[category],
+                    keywords=keywords,
+                    data=data,
+                ))
+
+        # Keyword table in config order: (keyword, entry)
+        self.keywords = [(keyword, entry) for entry in self.entries for keyword in entry.keywords]
+
+        # Action lookup tables
+        self.actions = {(entry.intent, entry.name): entry for entry in self.entries}
+        self.applications = dict(raw.get("applications", {}))
+        self.websites = dict(raw.get("websites", {}))
+        self.workflows = dict(raw.get("workflows", {}))
+        self.app_commands = {name: data.get("command") for name, data in self.applications.items()}
+        self.urls = {name: data.get("url") for name, data in self.websites.items()}
+
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+    def get_entry(self, intent, action):
+        """Get the catalog entry for an (intent, action) pair"""
+        return self.actions.get((intent, action))
+
+    def derive(self, key, builder):
+        """
+        Get a structure derived from this snapshot, building it once
+
+        Derived structures (matchers, indexes, prompts) live on the snapshot,
+        so they are rebuilt automatically when the catalog reloads.
+
+        Args:
+            key: Cache key for the structure
+            builder: Callable taking the snapshot and returning the structure
+        """
+        try:
+            return self._derived[key]
+        except KeyError:
+            pass
+
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = builder(self)
+            return self._derived[key]
+
+class CommandCatalog:
+    """Shared command catalog that reloads when the config file changes"""
+
+    def __init__(self, filepath, check_interval=1.0):
+        """
+        Initialize catalog
+
+        Args:
+            filepath: Path to commands_config.json
+            check_interval: Minimum seconds between mtime checks
+        """
+        self.filepath = filepath
+        self.check_interval = check_interval
+        self._snapshot = CatalogSnapshot({}, fingerprint=None, mtime=None)
+        self._checked_mtime = None   # mtime of the file as last read (snapshots stay untouched)
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._listeners = []
+
+        self.refresh(force=True)
+        logger.info(f"Command catalog loaded: {len(self._snapshot.entries)} entries")
+
+    def snapshot(self):
+        """
+        Get the current catalog, reloading first if the file changed
+
+        Returns:
+            CatalogSnapshot: Current immutable snapshot
+        """
+        if time.monotonic() - self._last_check >= self.check_interval:
+            self.refresh()
+        return self._snapshot
+
+    def refresh(self, force=False):
+        """
+        Reload the catalog if the file's mtime changed
+
+        The new snapshot is fully built before it replaces the old one, and a
+        file that fails to parse (e.g. saved half-way) leaves the old one in place.
+
+        Args:
+            force: Reload even if the mtime is unchanged
+
+        Returns:
+            bool: True if a new snapshot was installed
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+
+            try:
+                mtime = os.path.getmtime(self.filepath)
+            except OSError as e:
+                logger.error(f"Command catalog not readable: {e}")
+                return False
+
+            if not force and mtime == self._checked_mtime:
+                return False
+
+            try:
+                with open(self.filepath, "rb") as f:
+                    content = f.read()
+                raw = json.loads(content.decode("utf-8"))
+            except Exception as e:
+                logger.error(f"Could not reload command catalog, keeping previous version: {e}")
+                return False
+
+            fingerprint = hashlib.sha1(content).hexdigest()
+            self._checked_mtime = mtime
+            if fingerprint == self._snapshot.fingerprint:
+                return False
+
+            is_reload = self._snapshot.fingerprint is not None
+            self._snapshot = CatalogSnapshot(raw, fingerprint, mtime)
+            listeners = list(self._listeners)
+
+        if is_reload:
+            logger.info(f"Command catalog reloaded ({len(self._snapshot.entries)} entries)")
+        for callback in listeners:
+            try:
+                callback(self._snapshot)
+            except Exception as e:
+                logger.error(f"Catalog reload listener failed: {e}")
+        return True
+
+    def add_listener(self, callback):
+        """Call callback(snapshot) whenever a new catalog is installed"""
+        self._listeners.append(callback)
+
+# Global command catalog instance
+command_catalog = registry.register(
+    "command_catalog",
+    lambda: CommandCatalog(Settings.COMMANDS_CONFIG_FILE)
+)
@@ -19,20 +19,82 @@ class Settings:
     USE_GROQ = os.getenv("USE_GROQ", "true").lower() == "true"
     GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
     GROQ_MODEL = os.getenv("GROQ_MODEL", "llama3-70b-8192")
+    GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+    GROQ_STREAMING = os.getenv("GROQ_STREAMING", "true").lower() == "true"
+    # Confidence assumed when acting on a streamed intent before "confidence" arrives
+    GROQ_STREAM_PROVISIONAL_CONFIDENCE = float(os.getenv("GROQ_STREAM_PROVISIONAL_CONFIDENCE", "0.8"))
     
     # OpenAI (Popular)
     USE_OPENAI = os.getenv("USE_OPENAI", "false").lower() == "true"
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
     
     # Anthropic (High Quality)
     USE_ANTHROPIC = os.getenv("USE_ANTHROPIC", "false").lower() == "true"
     ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
     ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "claude-3-haiku-20240307")
+    ANTHROPIC_BASE_URL = os.getenv("ANTHROPIC_BASE_URL", "https://api.anthropic.com/v1")
+    ANTHROPIC_VERSION = os.getenv("ANTHROPIC_VERSION", "2023-06-01")
+    
+    # LLM Provider Routing (when more than one provider is enabled)
+    LLM_RACE_PROVIDERS = os.getenv("LLM_RACE_PROVIDERS", "false").lower() == "true"   # Ask the two fastest at once
+    LLM_PROVIDER_WINDOW = int(os.getenv("LLM_PROVIDER_WINDOW", "50"))                 # Requests in rolling stats
+    LLM_PROVIDER_MAX_FAILURES = int(os.getenv("LLM_PROVIDER_MAX_FAILURES", "3"))      # Consecutive, before the circuit opens
+    LLM_PROVIDER_COOLDOWN = float(os.getenv("LLM_PROVIDER_COOLDOWN", "30.0"))         # Seconds open before the first probe
+    
+    # LLM Transport (pooled async HTTP)
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "4.0"))                      # Per attempt
+    LLM_REQUEST_DEADLINE = float(os.getenv("LLM_REQUEST_DEADLINE", "8.0"))    # Including retries
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.25"))
+    LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "2.0"))
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "8"))
+    LLM_HEDGE_REQUESTS = os.getenv("LLM_HEDGE_REQUESTS", "false").lower() == "true"
+    LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    LLM_HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "1.5"))
+    
+    # Classification Cascade
+    # Local tiers answer on their own at or above this confidence; below it the LLM is asked
+    LOCAL_CONFIDENCE_THRESHOLD = float(os.getenv("LOCAL_CONFIDENCE_THRESHOLD", "0.8"))
+    # Longest a spoken command waits for the LLM before acting on the local result (0 waits forever)
+    CLASSIFICATION_DEADLINE = float(os.getenv("CLASSIFICATION_DEADLINE", "1.5"))
+    
+    # Phonetic Matching (sound-alike keywords such as "note bad" -> notepad)
+    ENABLE_PHONETIC_MATCHING = os.getenv("ENABLE_PHONETIC_MATCHING", "true").lower() == "true"
+    PHONETIC_MIN_SIMILARITY = float(os.getenv("PHONETIC_MIN_SIMILARITY", "0.75"))
+    
+    # Staged Pipeline (listen / recognize / classify / execute on separate workers)
+    ENABLE_PIPELINE = os.getenv("ENABLE_PIPELINE", "true").lower() == "true"   # false handles one command at a time
+    PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))           # Commands waiting between two stages
+    
+    # Speculative Classification
+    # Interim transcripts of a command are recognized every PARTIAL_TRANSCRIPT_INTERVAL
+    # seconds while the user is still speaking and classified ahead of the final one
+    SPECULATIVE_CLASSIFICATION = os.getenv("SPECULATIVE_CLASSIFICATION", "true").lower() == "true"
+    PARTIAL_TRANSCRIPT_INTERVAL = float(os.getenv("PARTIAL_TRANSCRIPT_INTERVAL", "0.75"))
+    
+    # Offline Embedding Classifier
+    ENABLE_EMBEDDING_CLASSIFIER = os.getenv("ENABLE_EMBEDDING_CLASSIFIER", "true").lower() == "true"
+    EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    EMBEDDING_TOP_K = int(os.getenv("EMBEDDING_TOP_K", "5"))
+    EMBEDDING_MIN_SIMILARITY = float(os.getenv("EMBEDDING_MIN_SIMILARITY", "0.35"))
+    
+    # Classification Cache
+    CLASSIFICATION_CACHE_SIZE = int(os.getenv("CLASSIFICATION_CACHE_SIZE", "500"))
+    CLASSIFICATION_CACHE_TTL = int(os.getenv("CLASSIFICATION_CACHE_TTL", str(7 * 24 * 3600)))
+    
+    # Batch Classification (classify_many)
+    BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+    BATCH_REQUESTS_PER_MINUTE = int(os.getenv("BATCH_REQUESTS_PER_MINUTE", "30"))
     
     # Voice Settings
+    ENABLE_TTS = os.getenv("ENABLE_TTS", "true").lower() == "true"   # false prints replies instead of speaking them
     VOICE_RATE = int(os.getenv("VOICE_RATE", "150"))
     VOICE_VOLUME = float(os.getenv("VOICE_VOLUME", "1.0"))
+    TTS_MAX_AGE = float(os.getenv("TTS_MAX_AGE", "8"))   # Seconds a queued reply stays worth saying
+    ENABLE_SPEECH_CACHE = os.getenv("ENABLE_SPEECH_CACHE", "true").lower() == "true"   # Play repeated phrases from rendered audio (needs PyAudio)
+    SPEECH_CACHE_MAX_MB = float(os.getenv("SPEECH_CACHE_MAX_MB", "20"))   # Disk budget for phrases outside the pre-rendered set
     
     # Memory Settings
     ENABLE_MEMORY = os.getenv("ENABLE_MEMORY", "true").lower() == "true"
@@ -48,6 +110,11 @@ class Settings:
     DAILY_TABS_FILE = os.path.join(DATA_DIR, "daily_tabs.json")
     COMMAND_HISTORY_FILE = os.path.join(DATA_DIR, "command_history.json")
     COMMANDS_CONFIG_FILE = os.path.join(CONFIG_DIR, "commands_config.json")
+    STARTUP_PROFILE_FILE = os.path.join(DATA_DIR, "startup_profile.json")
+    CLASSIFICATION_CACHE_FILE = os.path.join(DATA_DIR, "classification_cache.json")
+    WAKE_WORD_TEMPLATES_FILE = os.path.join(DATA_DIR, "wake_word_templates.json")
+    AUDIO_CALIBRATION_FILE = os.path.join(DATA_DIR, "audio_calibration.json")
+    SPEECH_CACHE_DIR = os.path.join(DATA_DIR, "speech_cache")
     
     # Audio Settings
     SAMPLE_RATE = 16000
@@ -55,6 +122,34 @@ class Settings:
     TIMEOUT = 10
     PHRASE_TIME_LIMIT = 15
     
+    # Continuous Capture (one open input stream feeding a ring buffer)
+    AUDIO_BUFFER_SECONDS = float(os.getenv("AUDIO_BUFFER_SECONDS", "30"))   # Must exceed PHRASE_TIME_LIMIT
+    AUDIO_MAX_BACKLOG = float(os.getenv("AUDIO_MAX_BACKLOG", "3"))          # Unread seconds replayed by the next listen
+    AUDIO_READ_TIMEOUT = float(os.getenv("AUDIO_READ_TIMEOUT", "2"))        # Seconds a read waits for the capture thread
+    
+    # Noise Floor (calibration is cached per input device; the floor is then tracked while running)
+    RECALIBRATE_AUDIO = os.getenv("RECALIBRATE_AUDIO", "false").lower() == "true"           # Ignore the cached calibration
+    ADAPTIVE_NOISE_FLOOR = os.getenv("ADAPTIVE_NOISE_FLOOR", "true").lower() == "true"
+    NOISE_FLOOR_WINDOW = float(os.getenv("NOISE_FLOOR_WINDOW", "1.0"))                      # Seconds per noise level sample
+    NOISE_FLOOR_PERCENTILE = float(os.getenv("NOISE_FLOOR_PERCENTILE", "20"))               # Chunk energy percentile taken as the noise level
+    NOISE_FLOOR_TIME_CONSTANT = float(os.getenv("NOISE_FLOOR_TIME_CONSTANT", "60"))         # Seconds to follow a new noise level
+    AUDIO_CALIBRATION_SAVE_INTERVAL = float(os.getenv("AUDIO_CALIBRATION_SAVE_INTERVAL", "300"))
+    
+    # Input Source: microphone, wav (INPUT_PATHS are WAV files or directories) or text
+    # (one transcript per line from INPUT_PATHS[0], or stdin)
+    INPUT_MODE = os.getenv("INPUT_MODE", "microphone").lower()
+    INPUT_PATHS = [path for path in os.getenv("INPUT_PATHS", "").split(os.pathsep) if path]
+    WAV_INPUT_GAP = float(os.getenv("WAV_INPUT_GAP", "1.5"))   # Seconds of silence after each WAV file
+    
+    # Speech Recognition Backend: google (cloud), vosk (offline, needs a model) or race (both, first confident wins)
+    ASR_BACKEND = os.getenv("ASR_BACKEND", "google").lower()
+    VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", os.path.join(BASE_DIR, "models", "vosk-model-small-en-us-0.15"))
+    ASR_MIN_CONFIDENCE = float(os.getenv("ASR_MIN_CONFIDENCE", "0.6"))   # Race answer accepted without waiting for the other
+    
+    # On-Device Wake Word (enroll with: python -m tools.enroll_wake_word)
+    ENABLE_WAKE_WORD_SPOTTER = os.getenv("ENABLE_WAKE_WORD_SPOTTER", "true").lower() == "true"
+    WAKE_WORD_SENSITIVITY = float(os.getenv("WAKE_WORD_SENSITIVITY", "1.0"))   # Scales the enrolled threshold; higher fires more easily
+    
     @classmethod
     def ensure_data_dir(cls):
         """Create data directory if it doesn't exist"""
@@ -0,0 +1,209 @@
+"""
+ASR Backends - Speech-to-Text Engines
+Google's cloud recognizer, Vosk on the local CPU, or both raced for the first confident transcript
+"""
+import json
+import time
+import queue
+import threading
+import importlib.util
+from abc import ABC, abstractmethod
+import speech_recognition as sr
+from config.settings import Settings
+from utils.logger import logger
+
+VOSK_AVAILABLE = importlib.util.find_spec("vosk") is not None
+
+# Vosk models are trained on 16 kHz mono audio
+VOSK_SAMPLE_RATE = 16000
+
+# Confidence given to a Google result that didn't report one. It is below
+# ASR_MIN_CONFIDENCE on purpose: such an answer only wins a race when no
+# backend was confident, instead of ending it as soon as it arrives.
+GOOGLE_DEFAULT_CONFIDENCE = 0.5
+
+class Transcript:
+    """One recognition result"""
+
+    def __init__(self, text, confidence, backend, latency=0.0):
+        self.text = text
+        self.confidence = confidence
+        self.backend = backend
+        self.latency = latency
+
+    def __repr__(self):
+        return f"Transcript({self.text!r}, confidence={self.confidence:.2f}, backend={self.backend}, latency={self.latency * 1000:.0f}ms)"
+
+class ASRBackend(ABC):
+    """
+    Base class: turn sr.AudioData into a Transcript
+
+    recognize() raises sr.UnknownValueError when there was no intelligible
+    speech and sr.RequestError when the engine itself failed, the same
+    contract as speech_recognition's recognize_* methods.
+    """
+
+    name = "base"
+
+    def recognize(self, audio):
+        """
+        Recognize one utterance
+
+        Returns:
+            Transcript: Best hypothesis (latency filled in)
+        """
+        started = time.monotonic()
+        transcript = self._recognize(audio)
+        transcript.latency = time.monotonic() - started
+        return transcript
+
+    @abstractmethod
+    def _recognize(self, audio):
+        """Recognize one utterance; recognize() adds the latency"""
+
+class GoogleBackend(ASRBackend):
+    """Google Web Speech API via speech_recognition (needs network)"""
+
+    name = "google"
+
+    def __init__(self, recognizer):
+        """
+        Initialize backend
+
+        Args:
+            recognizer: sr.Recognizer to issue requests with
+        """
+        self.recognizer = recognizer
+
+    def _recognize(self, audio):
+        result = self.recognizer.recognize_google(audio, show_all=True)
+        alternatives = result.get("alternative") if isinstance(result, dict) else None
+        if not alternatives:
+            raise sr.UnknownValueError()
+
+        best = alternatives[0]
+        # Google reports confidence only for some results; an answer without it is still its best guess
+        return Transcript(best["transcript"], best.get("confidence", GOOGLE_DEFAULT_CONFIDENCE), self.name)
+
+class VoskBackend(ASRBackend):
+    """Offline recognition with a Vosk/Kaldi model on the local CPU"""
+
+    name = "vosk"
+
+    def __init__(self, model_path=None):
+        """
+        Load the model (takes a moment; do it once)
+
+        Args:
+            model_path: Unpacked Vosk model directory (default: Settings.VOSK_MODEL_PATH)
+        """
+        if not VOSK_AVAILABLE:
+            raise ImportError("vosk is not installed (pip install vosk)")
+        import vosk
+
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self.model_path = model_path or Settings.VOSK_MODEL_PATH
+        self.model = vosk.Model(self.model_path)
+
+    def _recognize(self, audio):
+        # A recognizer is cheap next to the model and isn't thread-safe, so use one per utterance
+        recognizer = self._vosk.KaldiRecognizer(self.model, VOSK_SAMPLE_RATE)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=VOSK_SAMPLE_RATE, convert_width=2))
+        result = json.loads(recognizer.FinalResult())
+
+        text = result.get("text", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+
+        words = result.get("result") or []
+        confidence = sum(word.get("conf", 0.0) for word in words) / len(words) if words else 0.0
+        return Transcript(text, confidence, self.name)
+
+class RaceBackend(ASRBackend):
+    """
+    Run several backends at once and take the first confident transcript
+
+    A transcript below Settings.ASR_MIN_CONFIDENCE doesn't end the race; if
+    nobody is confident, the most confident answer wins once all are in.
+    """
+
+    name = "race"
+
+    def __init__(self, backends, min_confidence=None):
+        """
+        Initialize race
+
+        Args:
+            backends: ASRBackend list
+            min_confidence: Confidence that wins outright (default: Settings.ASR_MIN_CONFIDENCE)
+        """
+        self.backends = list(backends)
+        self.min_confidence = Settings.ASR_MIN_CONFIDENCE if min_confidence is None else min_confidence
+        self.wins = {backend.name: 0 for backend in self.backends}
+
+    def _recognize(self, audio):
+        results = queue.Queue()
+
+        def run(backend):
+            try:
+                results.put((backend, backend.recognize(audio), None))
+            except Exception as e:
+                results.put((backend, None, e))
+
+        for backend in self.backends:
+            threading.Thread(target=run, args=(backend,), daemon=True, name=f"asr-{backend.name}").start()
+
+        best, error = None, None
+        for _ in self.backends:
+            backend, transcript, e = results.get()
+            if e is not None:
+                if not isinstance(e, sr.UnknownValueError):
+                    logger.warning(f"ASR backend {backend.name} failed: {e}")
+                error = error if isinstance(error, sr.UnknownValueError) else e
+                continue
+            if transcript.confidence >= self.min_confidence:
+                best = transcript
+                break
+            if best is None or transcript.confidence > best.confidence:
+                best = transcript
+
+        if best is None:
+            raise error
+        self.wins[best.backend] += 1
+        logger.debug(f"ASR race won by {best.backend}")
+        return Transcript(best.text, best.confidence, best.backend)
+
+    def get_statistics(self):
+        """Races won per backend"""
+        return dict(self.wins)
+
+def create_asr_backend(recognizer, mode=None):
+    """
+    Build the backend selected by Settings.ASR_BACKEND
+
+    Args:
+        recognizer: sr.Recognizer for the Google backend
+        mode: "google", "vosk" or "race" (default: Settings.ASR_BACKEND)
+
+    Returns:
+        ASRBackend: Falls back to Google if the local model can't be loaded
+    """
+    mode = (mode or Settings.ASR_BACKEND).lower()
+    google = GoogleBackend(recognizer)
+    if mode == "google":
+        return google
+
+    try:
+        local = VoskBackend()
+        logger.info(f"Local ASR model loaded from {local.model_path}")
+    except Exception as e:
+        logger.warning(f"Local ASR unavailable ({e}); using Google recognition only")
+        return google
+
+    if mode == "vosk":
+        return local
+    if mode != "race":
+        logger.warning(f"Unknown ASR_BACKEND '{mode}'; racing local and cloud recognition")
+    return RaceBackend([local, google])
@@ -0,0 +1,347 @@
+"""
+Audio Capture - Continuous Ring Buffer
+One always-open input stream feeding a preallocated ring buffer that every listener reads from
+"""
+import math
+import time
+import threading
+import speech_recognition as sr
+from config.settings import Settings
+from core import pcm
+from utils.logger import logger
+
+class AudioRingBuffer:
+    """
+    Fixed-size byte ring addressed by absolute stream position
+
+    The writer never blocks and never allocates. Readers get memoryviews into
+    the buffer itself, which stay valid until the writer laps them
+    (capacity bytes later).
+    """
+
+    def __init__(self, capacity, alignment=1):
+        """
+        Preallocate the ring
+
+        Args:
+            capacity: Size in bytes (rounded down to a multiple of alignment)
+            alignment: Read size readers use, so aligned reads never wrap
+        """
+        self.alignment = max(1, alignment)
+        self.capacity = max(self.alignment, capacity - capacity % self.alignment)
+        self._buffer = bytearray(self.capacity)
+        self._view = memoryview(self._buffer)
+        self.written = 0
+        self.consumed = 0
+        self.closed = False
+        self._condition = threading.Condition()
+
+    def write(self, data, max_lead=None):
+        """
+        Append captured audio, overwriting the oldest bytes
+
+        Args:
+            data: PCM bytes
+            max_lead: Block until the data fits within this many bytes of
+                the reader's position (None never blocks)
+        """
+        if max_lead is not None:
+            with self._condition:
+                self._condition.wait_for(lambda: self.written + len(data) - self.consumed <= max_lead)
+
+        size = len(data)
+        if size > self.capacity:
+            data = data[-self.capacity:]
+            skipped = size - self.capacity
+            size = self.capacity
+        else:
+            skipped = 0
+
+        with self._condition:
+            start = (self.written + skipped) % self.capacity
+            first = min(size, self.capacity - start)
+            self._view[start:start + first] = data[:first]
+            if first < size:
+                self._view[:size - first] = data[first:]
+            self.written += skipped + size
+            self._condition.notify_all()
+
+    def release(self, position):
+        """Mark everything before position as read (unblocks a lossless writer)"""
+        with self._condition:
+            if position > self.consumed:
+                self.consumed = position
+                self._condition.notify_all()
+
+    def close(self):
+        """Wake blocked readers; later reads return what is left, then b\"\" """
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def oldest(self):
+        """Oldest absolute position still in the buffer"""
+        return max(0, self.written - self.capacity)
+
+    def align(self, position):
+        """Round a position down to the read alignment"""
+        return position - position % self.alignment
+
+    def read(self, position, size, timeout=None):
+        """
+        Wait for size bytes starting at position
+
+        Args:
+            position: Absolute stream position to read from
+            size: Bytes wanted
+            timeout: Seconds to wait for the writer (None waits forever)
+
+        Returns:
+            tuple: (memoryview or bytes - empty when closed or timed out,
+                position after the data)
+        """
+        with self._condition:
+            ready = self._condition.wait_for(
+                lambda: self.written - position >= size or self.closed,
+                timeout=timeout
+            )
+            if not ready:
+                return b"", position
+
+            if position < self.oldest():
+                lost = self.oldest() - position
+                logger.warning(f"Audio reader fell behind; skipped {lost} bytes")
+                position = self.align(self.oldest() + self.alignment - 1)
+
+            size = min(size, self.written - position)
+            if size <= 0:
+                return b"", position
+
+            start = position % self.capacity
+            if start + size <= self.capacity:
+                data = self._view[start:start + size]
+            else:
+                # Unaligned read across the end of the ring - the only copy
+                first = self.capacity - start
+                data = bytes(self._view[start:]) + bytes(self._view[:size - first])
+            return data, position + size
+
+class _RingStream:
+    """File-like stream over the ring, as speech_recognition expects from source.stream"""
+
+    def __init__(self, source):
+        self.source = source
+
+    def read(self, size):
+        """Read size frames (blocking), like MicrophoneStream.read"""
+        ring = self.source.capture.ring
+        data, self.source.position = ring.read(
+            self.source.position,
+            size * self.source.SAMPLE_WIDTH,
+            timeout=Settings.AUDIO_READ_TIMEOUT
+        )
+        if self.source.capture.lossless:
+            ring.release(self.source.position)
+        return data
+
+    def close(self):
+        pass
+
+class BufferedSource(sr.AudioSource):
+    """
+    AudioSource reading from the capture ring instead of a device
+
+    Entering it is free - the device stream stays open. Recognizer.listen,
+    adjust_for_ambient_noise and our own capture loops work on it unchanged.
+    """
+
+    def __init__(self, capture, position):
+        self.capture = capture
+        self.position = position
+        self.SAMPLE_RATE = capture.SAMPLE_RATE
+        self.SAMPLE_WIDTH = capture.SAMPLE_WIDTH
+        self.CHUNK = capture.CHUNK
+        self.stream = None
+
+    def __enter__(self):
+        self.stream = _RingStream(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None
+
+    def skip_to_now(self):
+        """Drop everything captured so far (lossless capture drops nothing)"""
+        if self.capture.lossless:
+            return
+        self.position = self.capture.ring.align(self.capture.ring.written)
+
+    def limit_backlog(self, seconds):
+        """Skip ahead so at most `seconds` of unread audio remain (not for lossless capture)"""
+        if self.capture.lossless:
+            return
+        now = self.capture.ring.align(self.capture.ring.written)
+        self.position = max(self.position, now - self.capture.seconds_to_bytes(seconds))
+
+def noise_level(energies, percentile=None):
+    """
+    Noise level of a stretch of audio from its chunk energies
+
+    Args:
+        energies: RMS energy of each chunk
+        percentile: Energy percentile taken as the noise level
+            (default: Settings.NOISE_FLOOR_PERCENTILE)
+
+    Returns:
+        float: The level, or None without chunks
+    """
+    if not energies:
+        return None
+    percentile = Settings.NOISE_FLOOR_PERCENTILE if percentile is None else percentile
+    ordered = sorted(energies)
+    return float(ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))])
+
+class NoiseFloorTracker:
+    """
+    Running estimate of the ambient noise level
+
+    A low percentile of every window's chunk energies stands in for idle
+    audio (even continuous speech has gaps), and the window levels are
+    averaged with an exponential time constant, so the floor follows a room
+    that gets louder or quieter over the day without reacting to speech.
+    The quietest chunk alone is biased low: one dropout drags it below the
+    noise in the rest of the window, and phrases then never end.
+    """
+
+    def __init__(self, seconds_per_chunk, sample_width, floor=None, window=None, time_constant=None, percentile=None):
+        """
+        Initialize tracker
+
+        Args:
+            seconds_per_chunk: Duration of each observed chunk
+            sample_width: Bytes per sample
+            floor: Starting estimate (RMS energy), e.g. from a cached calibration
+            window: Seconds per noise sample (default: Settings.NOISE_FLOOR_WINDOW)
+            time_constant: Seconds for the estimate to move ~63% of the way
+                to a new level (default: Settings.NOISE_FLOOR_TIME_CONSTANT)
+            percentile: Chunk energy percentile taken as each window's noise
+                level (default: Settings.NOISE_FLOOR_PERCENTILE)
+        """
+        window = window or Settings.NOISE_FLOOR_WINDOW
+        time_constant = time_constant or Settings.NOISE_FLOOR_TIME_CONSTANT
+        self.percentile = Settings.NOISE_FLOOR_PERCENTILE if percentile is None else percentile
+        self.sample_width = sample_width
+        self.window_chunks = max(1, int(round(window / seconds_per_chunk)))
+        self.alpha = 1.0 - math.exp(-window / time_constant)
+        self.floor = floor
+        self.updated_at = None
+        self._energies = []
+
+    def observe(self, chunk):
+        """Feed one captured chunk (called on the capture thread)"""
+        self._energies.append(pcm.rms(chunk, self.sample_width))
+        if len(self._energies) < self.window_chunks:
+            return
+
+        level = noise_level(self._energies, self.percentile)
+        if self.floor is None:
+            self.floor = level
+        else:
+            self.floor += self.alpha * (level - self.floor)
+        self.updated_at = time.monotonic()
+        self._energies = []
+
+class AudioCapture:
+    """Background thread keeping one input stream open and filling the ring"""
+
+    def __init__(self, device, buffer_seconds=None, lossless=False):
+        """
+        Initialize capture (call start() to begin)
+
+        Args:
+            device: speech_recognition AudioSource to capture from (e.g. sr.Microphone())
+            buffer_seconds: Audio kept in the ring (default: Settings.AUDIO_BUFFER_SECONDS)
+            lossless: Pace capture to the reader instead of dropping audio it
+                falls behind on - for recordings, which can be read faster
+                than real time
+        """
+        self.device = device
+        self.lossless = lossless
+        self.SAMPLE_RATE = device.SAMPLE_RATE
+        self.SAMPLE_WIDTH = device.SAMPLE_WIDTH
+        self.CHUNK = device.CHUNK
+
+        seconds = buffer_seconds or Settings.AUDIO_BUFFER_SECONDS
+        chunk_bytes = self.CHUNK * self.SAMPLE_WIDTH
+        self.ring = AudioRingBuffer(int(seconds * self.SAMPLE_RATE * self.SAMPLE_WIDTH), alignment=chunk_bytes)
+        # Lossless capture stays half a ring ahead at most, so views the reader
+        # took within the last half ring are never overwritten
+        self._max_lead = self.ring.align(self.ring.capacity // 2) if lossless else None
+
+        # Called with every captured chunk on the capture thread; must be quick
+        self.observers = []
+
+        self.running = False
+        self.error = None
+        self._started = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Open the device and start capturing (returns once the stream is open)"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="audio-capture")
+        self._thread.start()
+        self._started.wait(timeout=5)
+        if self.error:
+            raise self.error
+
+    def _run(self):
+        """Capture thread body"""
+        try:
+            with self.device as source:
+                self._started.set()
+                logger.info("Audio capture started")
+                while self.running:
+                    data = source.stream.read(self.CHUNK)
+                    if not data:
+                        break
+                    self.ring.write(data, max_lead=self._max_lead)
+                    for observe in self.observers:
+                        observe(data)
+        except Exception as e:
+            self.error = e
+            logger.error(f"Audio capture stopped: {e}")
+        finally:
+            self.running = False
+            self._started.set()
+            self.ring.close()
+
+    def stop(self):
+        """Stop capturing and release the device"""
+        self.running = False
+        self.ring.release(self.ring.written + self.ring.capacity)
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def seconds_to_bytes(self, seconds):
+        """Convert a duration to a chunk-aligned byte count"""
+        return self.ring.align(int(seconds * self.SAMPLE_RATE * self.SAMPLE_WIDTH))
+
+    def source(self, position=None):
+        """
+        Get an AudioSource reading from the ring
+
+        The source remembers how far it has read, so keeping one and entering
+        it for every listen continues exactly where the last listen stopped.
+
+        Args:
+            position: Absolute position to start at (default: now)
+
+        Returns:
+            BufferedSource
+        """
+        if position is None:
+            position = self.ring.written
+        return BufferedSource(self, max(self.ring.align(position), self.ring.oldest()))
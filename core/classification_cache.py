@@ -0,0 +1,161 @@
+"""
+Classification Cache
+Persistent LRU + TTL cache of normalized command text -> classification
+"""
+import os
+import re
+import copy
+import time
+import atexit
+import threading
+from collections import OrderedDict
+from utils.logger import logger
+from utils.helpers import load_json, save_json
+
+_PUNCTUATION = re.compile(r"[^\w\s']")
+
+def normalize_command(text):
+    """Normalize command text into a cache key"""
+    text = _PUNCTUATION.sub(" ", text.lower())
+    return " ".join(text.split())
+
+class ClassificationCache:
+    """LRU cache with TTL eviction, persisted as JSON"""
+
+    def __init__(self, filepath, max_entries=500, ttl_seconds=7 * 24 * 3600, save_interval=5.0):
+        """
+        Initialize cache and load previous entries from disk
+
+        Args:
+            filepath: JSON file the cache persists to
+            max_entries: LRU capacity
+            ttl_seconds: Entries older than this are dropped
+            save_interval: Minimum seconds between writes to disk
+        """
+        self.filepath = filepath
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.save_interval = save_interval
+
+        self.entries = OrderedDict()
+        self.fingerprint = None
+        self.hits = 0
+        self.misses = 0
+
+        self._dirty = False
+        self._last_save = 0.0
+        self._lock = threading.Lock()
+
+        self._load()
+        atexit.register(self.flush)
+
+    def _load(self):
+        """Load persisted entries, skipping expired ones"""
+        data = load_json(self.filepath, default={})
+        self.fingerprint = data.get("fingerprint")
+
+        now = time.time()
+        for key, item in data.get("entries", []):
+            if now - item.get("created", 0) < self.ttl_seconds:
+                self.entries[key] = item
+
+        logger.debug(f"Classification cache loaded: {len(self.entries)} entries")
+
+    def validate(self, fingerprint):
+        """
+        Drop every entry if the cache was built for a different catalog/model
+
+        Args:
+            fingerprint: Identifier of the current catalog + model
+        """
+        with self._lock:
+            if fingerprint == self.fingerprint:
+                return
+            if self.entries:
+                logger.info("Command catalog or model changed - clearing classification cache")
+            self.entries.clear()
+            self.fingerprint = fingerprint
+            self._dirty = True
+
+    def get(self, text):
+        """
+        Look up a classification
+
+        Args:
+            text: Command text (normalized internally)
+
+        Returns:
+            dict: Copy of the cached classification, or None
+        """
+        key = normalize_command(text)
+        with self._lock:
+            item = self.entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            if time.time() - item["created"] >= self.ttl_seconds:
+                del self.entries[key]
+                self._dirty = True
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(item["result"])
+
+    def put(self, text, result):
+        """
+        Store a classification
+
+        Args:
+            text: Command text (normalized internally)
+            result: Classification dict
+        """
+        key = normalize_command(text)
+        with self._lock:
+            self.entries[key] = {"result": copy.deepcopy(result), "created": time.time()}
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._dirty = True
+
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.flush()
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self.entries.clear()
+            self._dirty = True
+        self.flush()
+
+    def flush(self):
+        """Write the cache to disk if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "fingerprint": self.fingerprint,
+                "entries": [[key, item] for key, item in self.entries.items()]
+            }
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+        # Write to a temp file first so a crash never leaves half a cache behind
+        temp_path = self.filepath + ".tmp"
+        if save_json(temp_path, data):
+            try:
+                os.replace(temp_path, self.filepath)
+            except OSError as e:
+                logger.error(f"Could not save classification cache: {e}")
+
+    def get_statistics(self):
+        """Get hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
@@ -1,39 +1,96 @@
 """
-Command Classifier - Groq API Only
-Simple & Fast - FREE API!
+Command Classifier - Local Tiers + Groq API
+Local strategies answer confident commands instantly; Groq handles the ambiguous rest
 """
+import copy
 import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from config.settings import Settings
+from config.command_catalog import command_catalog
+from core.keyword_matcher import KeywordMatcher
+from core.phonetic_index import PhoneticIndex
+from core.embedding_classifier import embedding_classifier
+from core.classification_cache import ClassificationCache, normalize_command
+from core.incremental_json import IncrementalJSONParser
 from utils.logger import logger
-from utils.helpers import load_json
-
-# Import Groq API client
-try:
-    from groq import Groq
-    GROQ_AVAILABLE = True
-    print("✅ Groq module imported successfully")
-except ImportError:
-    GROQ_AVAILABLE = False
-    print("❌ Groq module NOT available - Install: pip install groq")
-    logger.warning("Groq not available. Install: pip install groq")
+from utils.service_registry import registry
+from utils.rate_limiter import RateLimiter
+from utils.circuit_breaker import CircuitOpenError
+
+# LLMs are reached through the pooled async transport
+from core.llm_transport import HTTPX_AVAILABLE as GROQ_AVAILABLE
+from core.llm_providers import LLMRouter, create_groq_provider, create_secondary_providers
+
+# Confidence multiplier for rule hits that compete with other actions
+RULE_AMBIGUITY_PENALTY = 0.6
+
+# Confidence multiplier for sound-alike hits whose phonetic key is only close, not equal
+PHONETIC_KEY_MISMATCH_PENALTY = 0.8
+
+# Ceiling for those hits: below the 0.5 the assistant acts on, so without an LLM
+# to confirm them they ask the user to rephrase instead of running an action
+PHONETIC_KEY_MISMATCH_MAX_CONFIDENCE = 0.45
 
 class CommandClassifier:
-    """Classify commands using Groq API"""
+    """Classify commands with local tiers, escalating to the Groq API"""
     
     def __init__(self):
         """Initialize classifier with Groq API client"""
-        self.commands_config = load_json(Settings.COMMANDS_CONFIG_FILE)
         self.llm_client = None
         self.llm_type = None
+        self.system_prompt = self._build_system_prompt()
         
-        # Initialize Groq API client
-        self._initialize_groq()
+        # Local strategies tried in order before escalating to the LLM
+        self.local_tiers = [
+            ("rules", self._classify_rule_based),
+            ("phonetic", self._classify_phonetic),
+            ("embedding", self._classify_embedding),
+        ]
+        self.cache = ClassificationCache(
+            Settings.CLASSIFICATION_CACHE_FILE,
+            max_entries=Settings.CLASSIFICATION_CACHE_SIZE,
+            ttl_seconds=Settings.CLASSIFICATION_CACHE_TTL
+        )
+        
+        # LLM calls that outlive the per-command deadline finish here and fill the cache
+        self.llm_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-budget")
+        
+        # Initialize LLM providers (Groq, plus OpenAI/Anthropic when enabled)
+        self._initialize_llm()
         
         logger.info(f"Command classifier initialized with {self.llm_type}")
         print(f"🤖 Classifier: {self.llm_type}")
     
+    def _initialize_llm(self):
+        """Route LLM requests across every configured provider"""
+        providers = []
+        groq = self._initialize_groq()
+        if groq:
+            providers.append(groq)
+        providers.extend(create_secondary_providers())
+        
+        if not providers:
+            return
+        
+        self.llm_client = LLMRouter(providers)
+        if len(providers) > 1:
+            names = ", ".join(f"{p.name}: {p.model}" for p in providers)
+            self.llm_type = f"LLM router ({names})"
+            print(f"🔀 Routing to the fastest healthy provider: {names}")
+            if self.llm_client.race:
+                print("   Racing the two best providers on every request")
+        elif not groq:
+            self.llm_type = f"{providers[0].name} ({providers[0].model})"
+    
     def _initialize_groq(self):
-        """Initialize Groq API client"""
+        """
+        Initialize Groq API client
+        
+        Returns:
+            LLMProvider or None if Groq is unavailable
+        """
         
         print(f"\n{'='*60}")
         print(f"🔧 Initializing Groq API Classifier")
@@ -47,63 +104,194 @@ class CommandClassifier:
         
         # Check if Groq is available and configured
         if not GROQ_AVAILABLE:
-            print("❌ Groq module not installed!")
-            print("   Run: pip install groq")
-            logger.warning("Groq module not available. Falling back to rule-based.")
-            self.llm_type = "Rule-based (Groq not installed)"
-            return
+            print("❌ httpx module not installed!")
+            print("   Run: pip install httpx")
+            logger.warning("httpx module not available. Falling back to rule-based.")
+            self.llm_type = "Rule-based (httpx not installed)"
+            return None
         
         if not Settings.USE_GROQ:
             print("❌ USE_GROQ is False in .env file!")
             logger.warning("USE_GROQ is disabled. Falling back to rule-based.")
             self.llm_type = "Rule-based (USE_GROQ=false)"
-            return
+            return None
         
         if not Settings.GROQ_API_KEY or len(Settings.GROQ_API_KEY) < 20:
             print("❌ GROQ_API_KEY not set or invalid!")
             print("   Get free API key: https://console.groq.com")
             logger.warning("GROQ_API_KEY not configured. Falling back to rule-based.")
             self.llm_type = "Rule-based (No API key)"
-            return
+            return None
         
         # Try to initialize Groq client
         print("🔄 Attempting to initialize Groq client...")
         try:
-            self.llm_client = Groq(api_key=Settings.GROQ_API_KEY)
+            provider = create_groq_provider()
             self.llm_type = f"Groq ({Settings.GROQ_MODEL})"
             
             print(f"✅ SUCCESS! Groq API initialized")
             print(f"   Model: {Settings.GROQ_MODEL}")
             print(f"   API Key: {Settings.GROQ_API_KEY[:20]}...")
             logger.info(f"✅ Using Groq API (FREE!) - Model: {Settings.GROQ_MODEL}")
+            return provider
             
         except Exception as e:
             print(f"❌ Failed to initialize Groq: {e}")
             logger.error(f"Failed to initialize Groq: {e}")
             self.llm_type = "Rule-based (Groq init failed)"
+            return None
     
     def classify(self, command_text):
         """
         Classify command and extract intent
         
+        Local tiers are tried first; the LLM is only asked when none of them
+        reaches Settings.LOCAL_CONFIDENCE_THRESHOLD, and only waited for up to
+        Settings.CLASSIFICATION_DEADLINE seconds.
+        
         Args:
             command_text: User's command text
             
         Returns:
-            dict: Classification result with intent, action, and parameters
+            dict: Classification result with intent, action, parameters and
+                the tier that produced it
         """
-        # Use Groq if available
+        confident, best_local = self._classify_locally(command_text)
+        if confident:
+            return confident
+        
+        # Escalate ambiguous commands to Groq if available
         if self.llm_client:
-            return self._classify_with_groq(command_text)
+            return self._classify_within_deadline(command_text, best_local)
         
-        # Fallback to rule-based
-        print(f"⚠️  Using rule-based classification for: {command_text}")
-        return self._classify_rule_based(command_text)
+        print(f"⚠️  No LLM available - using best local classification for: {command_text}")
+        return best_local
     
-    def _classify_with_groq(self, command_text):
-        """Classify using Groq API (FREE & FAST!)"""
+    def _classify_within_deadline(self, command_text, best_local):
+        """
+        Ask the LLM, but answer with the local result once the deadline passes
+        
+        A late LLM call keeps running in the background, so its answer is
+        cached for the next time the command is heard.
+        """
+        deadline = Settings.CLASSIFICATION_DEADLINE
+        if deadline <= 0:
+            return self._classify_with_groq(command_text, fallback=best_local)
+        
+        future = self.llm_executor.submit(self._classify_with_groq, command_text, best_local)
+        try:
+            return future.result(timeout=deadline)
+        except FutureTimeout:
+            print(f"⏱️  LLM missed the {deadline}s deadline - using {best_local['tier']} result")
+            logger.warning(f"LLM missed the {deadline}s deadline for '{command_text}'; using {best_local['tier']} result")
+            return best_local
+    
+    def _classify_locally(self, command_text):
+        """
+        Run the local tiers in order
         
-        system_prompt = f"""You are a command classifier for voice assistant "{Settings.ASSISTANT_NAME}".
+        Returns:
+            tuple: (first result above the confidence threshold or None,
+                best local result seen)
+        """
+        best_local = None
+        
+        for tier, strategy in self.local_tiers:
+            result = strategy(command_text)
+            result["tier"] = tier
+            
+            if result["confidence"] >= Settings.LOCAL_CONFIDENCE_THRESHOLD:
+                logger.info(f"Classified locally by {tier}: {result['intent']} → {result['action']}")
+                return result, result
+            
+            if best_local is None or result["confidence"] > best_local["confidence"]:
+                best_local = result
+        
+        return None, best_local
+    
+    def classify_many(self, commands, max_workers=None, requests_per_minute=None, use_local_tiers=True):
+        """
+        Classify many commands (transcripts, replays, evaluations)
+        
+        Inputs are deduplicated by normalized text and cache hits are served
+        directly. The rest run on a bounded worker pool with LLM requests
+        rate-limited, and results are yielded in input order as they complete.
+        
+        Args:
+            commands: Iterable of command texts
+            max_workers: Concurrent classifications (default: Settings.BATCH_MAX_WORKERS)
+            requests_per_minute: LLM request budget (default: Settings.BATCH_REQUESTS_PER_MINUTE)
+            use_local_tiers: Try the local tiers before the LLM, like classify()
+            
+        Yields:
+            tuple: (command text, classification result)
+        """
+        commands = list(commands)
+        if max_workers is None:
+            max_workers = Settings.BATCH_MAX_WORKERS
+        if requests_per_minute is None:
+            requests_per_minute = Settings.BATCH_REQUESTS_PER_MINUTE
+        
+        limiter = RateLimiter.per_minute(requests_per_minute, burst=max_workers)
+        self.cache.validate(self._cache_fingerprint())
+        
+        # One job per distinct normalized command
+        keys = [normalize_command(command) for command in commands]
+        ready = {}
+        pending = {}
+        
+        logger.info(f"Batch classifying {len(commands)} commands ({len(set(keys))} distinct)")
+        
+        # Set if the consumer stops early, so queued jobs don't spend LLM quota
+        abandoned = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="classify")
+        try:
+            for command, key in zip(commands, keys):
+                if key in ready or key in pending:
+                    continue
+                
+                cached = self.cache.get(command)
+                if cached is not None:
+                    cached["tier"] = "cache"
+                    ready[key] = cached
+                else:
+                    pending[key] = executor.submit(
+                        self._classify_batch_item, command, limiter, use_local_tiers, abandoned
+                    )
+            
+            for command, key in zip(commands, keys):
+                if key not in ready:
+                    ready[key] = pending.pop(key).result()
+                yield command, copy.deepcopy(ready[key])
+        finally:
+            # Runs when the batch ends, the consumer breaks out or the generator is
+            # closed: don't wait for rate-limited jobs nobody will read
+            abandoned.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.cache.flush()
+    
+    def _classify_batch_item(self, command_text, limiter, use_local_tiers, abandoned=None):
+        """Classify one batch command, pacing LLM requests through the limiter"""
+        best_local = None
+        if use_local_tiers:
+            confident, best_local = self._classify_locally(command_text)
+            if confident:
+                return confident
+        
+        if not self.llm_client:
+            if best_local is None:
+                best_local = self._classify_rule_based(command_text)
+                best_local["tier"] = "rules"
+            return best_local
+        
+        limiter.acquire()
+        if abandoned is not None and abandoned.is_set():
+            return best_local
+        return self._classify_with_groq(command_text, fallback=best_local, streaming=False)
+    
+    def _build_system_prompt(self):
+        """Build the Groq system prompt (once per classifier)"""
+        return f"""You are a command classifier for voice assistant "{Settings.ASSISTANT_NAME}".
 
 
 Classify commands into these categories:
@@ -145,100 +333,202 @@ Examples:
 "open c drive" → {{"intent": "open_app", "action": "c_drive", "confidence": 0.95, "parameters": {{}}}}
 "what time" → {{"intent": "system_info", "action": "time", "confidence": 0.9, "parameters": {{}}}}"""
 
+    def _cache_fingerprint(self):
+        """Identify the catalog + model the cached classifications belong to"""
+        catalog_fingerprint = command_catalog.snapshot().fingerprint or ""
+        model = self.llm_client.model if self.llm_client else Settings.GROQ_MODEL
+        return hashlib.sha1(f"{catalog_fingerprint}:{model}".encode("utf-8")).hexdigest()
+    
+    def _classify_with_groq(self, command_text, fallback=None, streaming=None):
+        """
+        Classify using Groq API (FREE & FAST!)
+        
+        Args:
+            command_text: User's command text
+            fallback: Local result to return if the API call fails
+            streaming: Return as soon as intent/action are streamed
+                (default: Settings.GROQ_STREAMING)
+        """
+        
+        # Repeated commands are answered from the cache without a network call
+        self.cache.validate(self._cache_fingerprint())
+        cached = self.cache.get(command_text)
+        if cached is not None:
+            print(f"⚡ Cached classification: {cached['intent']} → {cached['action']}")
+            logger.debug(f"Classification cache hit: {command_text}")
+            cached["tier"] = "cache"
+            return cached
+        
         try:
-            print(f"\n🔍 Classifying with Groq: '{command_text}'")
+            print(f"\n🔍 Classifying with LLM: '{command_text}'")
             
-            response = self.llm_client.chat.completions.create(
-                model=Settings.GROQ_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Classify: {command_text}"}
-                ],
-                temperature=0.2,
-                max_tokens=150
-            )
+            if streaming is None:
+                # Racing providers needs complete answers to compare
+                streaming = Settings.GROQ_STREAMING and not self.llm_client.race
             
-            result_text = response.choices[0].message.content.strip()
-            print(f"📥 Groq response: {result_text}")
-            
-            # Extract JSON (remove markdown code blocks if present)
-            result_text = result_text.replace("```json", "").replace("```", "").strip()
+            if streaming:
+                result = self._request_groq_streaming(command_text)
+            else:
+                result = self._request_groq(command_text)
             
-            # Extract JSON
-            if "{" in result_text:
-                json_start = result_text.index("{")
-                json_end = result_text.rindex("}") + 1
-                result = json.loads(result_text[json_start:json_end])
+            print(f"✅ Classification: {result['intent']} → {result['action']} (confidence: {result['confidence']})")
+            result["tier"] = "llm"
+            return result
+        
+        except CircuitOpenError:
+            # Known outage - no request was made, so there's nothing to wait for
+            if fallback is None:
+                fallback = self._classify_rule_based(command_text)
+                fallback["tier"] = "rules"
+            print(f"⚡ LLM unavailable (circuit open) - using {fallback['tier']} classification")
+            return fallback
                 
-                print(f"✅ Classification: {result['intent']} → {result['action']} (confidence: {result['confidence']})")
-                logger.info(f"Groq Classification: {result}")
+        except Exception as e:
+            print(f"❌ LLM API error: {e}")
+            logger.error(f"LLM API error: {e}")
+            if fallback is None:
+                fallback = self._classify_rule_based(command_text)
+                fallback["tier"] = "rules"
+            print(f"⚠️  Falling back to {fallback['tier']} classification")
+            return fallback
+    
+    def _groq_messages(self, command_text):
+        """Chat messages for a classification request"""
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": f"Classify: {command_text}"}
+        ]
+    
+    def _request_groq(self, command_text):
+        """Wait for the full Groq completion and parse it"""
+        result_text = self.llm_client.complete(
+            self._groq_messages(command_text),
+            temperature=0.2,
+            max_tokens=150,
+            validate=self._parse_response_text
+        ).strip()
+        print(f"📥 Groq response: {result_text}")
+        
+        result = self._parse_response_text(result_text)
+        logger.info(f"Groq Classification: {result}")
+        self.cache.put(command_text, result)
+        return result
+    
+    def _parse_response_text(self, result_text):
+        """Extract the classification JSON from a complete response"""
+        # Extract JSON (remove markdown code blocks if present)
+        result_text = result_text.replace("```json", "").replace("```", "").strip()
+        
+        if "{" not in result_text:
+            raise ValueError("No JSON in response")
+        
+        json_start = result_text.index("{")
+        json_end = result_text.rindex("}") + 1
+        return json.loads(result_text[json_start:json_end])
+    
+    def _request_groq_streaming(self, command_text):
+        """
+        Stream the Groq completion and return as soon as intent and action are known
+        
+        The rest of the stream (confidence, parameters, trailing chatter) is
+        drained in the background and the complete result is cached.
+        """
+        chunks = self.llm_client.stream(
+            self._groq_messages(command_text),
+            temperature=0.2,
+            max_tokens=150
+        )
+        parser = IncrementalJSONParser()
+        
+        for chunk in chunks:
+            parser.feed(chunk)
+            
+            fields = parser.fields
+            if "intent" in fields and "action" in fields and fields["intent"] != "unknown":
+                result = {
+                    "intent": fields["intent"],
+                    "action": fields["action"],
+                    "confidence": fields.get("confidence", Settings.GROQ_STREAM_PROVISIONAL_CONFIDENCE),
+                    "parameters": fields.get("parameters", {})
+                }
+                print(f"⚡ Groq streamed intent early: {result['intent']} → {result['action']}")
+                threading.Thread(
+                    target=self._drain_stream,
+                    args=(command_text, chunks, parser),
+                    daemon=True,
+                    name="groq-stream-drain"
+                ).start()
                 return result
-            else:
-                raise ValueError("No JSON in response")
-                
+            
+            if parser.done:
+                break
+        
+        chunks.close()
+        
+        # Stream ended (or the model answered "unknown") - use whatever was parsed
+        if not parser.done and not ("intent" in parser.fields and "action" in parser.fields):
+            print(f"📥 Groq response: {parser.text.strip()}")
+            result = self._parse_response_text(parser.text)
+        else:
+            result = dict(parser.fields)
+            result.setdefault("confidence", 0.0)
+            result.setdefault("parameters", {})
+        
+        logger.info(f"Groq Classification: {result}")
+        self.cache.put(command_text, result)
+        return result
+    
+    def _drain_stream(self, command_text, chunks, parser):
+        """Consume the rest of a streamed completion and cache the full result"""
+        try:
+            for chunk in chunks:
+                if parser.done:
+                    break
+                parser.feed(chunk)
+            
+            result = dict(parser.fields)
+            if "confidence" in result:
+                result.setdefault("parameters", {})
+                logger.info(f"Groq Classification: {result}")
+                self.cache.put(command_text, result)
         except Exception as e:
-            print(f"❌ Groq API error: {e}")
-            logger.error(f"Groq API error: {e}")
-            print(f"⚠️  Falling back to rule-based classification")
-            return self._classify_rule_based(command_text)
+            logger.warning(f"Could not finish Groq stream: {e}")
+        finally:
+            close = getattr(chunks, "close", None)
+            if close:
+                close()
     
     def _classify_rule_based(self, command_text):
         """Fallback rule-based classification"""
-        command_lower = command_text.lower()
-        
         print(f"🔍 Rule-based classification for: '{command_text}'")
         
-        # Check for applications
-        for app_name, app_data in self.commands_config.get("applications", {}).items():
-            for keyword in app_data.get("keywords", []):
-                if keyword in command_lower:
-                    result = {
-                        "intent": "open_app",
-                        "action": app_name,
-                        "parameters": {},
-                        "confidence": 0.9
-                    }
-                    print(f"✅ Matched: {result}")
-                    return result
-        
-        # Check for websites
-        for site_name, site_data in self.commands_config.get("websites", {}).items():
-            for keyword in site_data.get("keywords", []):
-                if keyword in command_lower:
-                    result = {
-                        "intent": "open_website",
-                        "action": site_name,
-                        "parameters": {},
-                        "confidence": 0.9
-                    }
-                    print(f"✅ Matched: {result}")
-                    return result
-        
-        # Check for workflows
-        for workflow_name, workflow_data in self.commands_config.get("workflows", {}).items():
-            for keyword in workflow_data.get("keywords", []):
-                if keyword in command_lower:
-                    result = {
-                        "intent": "workflow",
-                        "action": workflow_name,
-                        "parameters": {},
-                        "confidence": 0.85
-                    }
-                    print(f"✅ Matched: {result}")
-                    return result
-        
-        # Check for system commands
-        for cmd_name, cmd_data in self.commands_config.get("system_commands", {}).items():
-            for keyword in cmd_data.get("keywords", []):
-                if keyword in command_lower:
-                    result = {
-                        "intent": "system_info",
-                        "action": cmd_name,
-                        "parameters": {},
-                        "confidence": 0.95
-                    }
-                    print(f"✅ Matched: {result}")
-                    return result
+        # One pass over the utterance; the longest whole-word keyword wins
+        matcher = command_catalog.snapshot().derive("keyword_matcher", KeywordMatcher.from_catalog)
+        match = matcher.best_match(command_text)
+        
+        if match:
+            entry = match.payload
+            confidence = entry.confidence
+            
+            # Other keywords elsewhere in the utterance pointing at a different
+            # action ("open notepad and youtube") make the hit ambiguous
+            conflicts = {
+                (m.payload.intent, m.payload.name)
+                for m in matcher.find_all(command_text)
+                if (m.end <= match.start or m.start >= match.end)
+                and (m.payload.intent, m.payload.name) != (entry.intent, entry.name)
+            }
+            if conflicts:
+                confidence *= RULE_AMBIGUITY_PENALTY
+            
+            result = {
+                "intent": entry.intent,
+                "action": entry.name,
+                "parameters": {},
+                "confidence": round(confidence, 3)
+            }
+            print(f"✅ Matched '{match.keyword}': {result}")
+            return result
         
         # Unknown
         print(f"❌ No match found - returning unknown")
@@ -249,5 +539,59 @@ Examples:
             "confidence": 0.0
         }
 
+    def _classify_phonetic(self, command_text):
+        """Sound-alike keyword classification for misrecognized transcripts"""
+        unknown = {"intent": "unknown", "action": None, "parameters": {}, "confidence": 0.0}
+        if not Settings.ENABLE_PHONETIC_MATCHING:
+            return unknown
+        
+        print(f"🔍 Phonetic classification for: '{command_text}'")
+        
+        index = command_catalog.snapshot().derive(
+            "phonetic_index",
+            lambda snapshot: PhoneticIndex.from_catalog(snapshot, min_similarity=Settings.PHONETIC_MIN_SIMILARITY)
+        )
+        matches = index.search(command_text)
+        if not matches:
+            return unknown
+        
+        best = matches[0]
+        entry = best.payload
+        confidence = entry.confidence * (0.6 + 0.4 * best.similarity)
+        if not best.exact_key:
+            confidence = min(confidence * PHONETIC_KEY_MISMATCH_PENALTY, PHONETIC_KEY_MISMATCH_MAX_CONFIDENCE)
+        
+        # An equally good sound-alike for a different action makes the hit ambiguous
+        if any(
+            (m.payload.intent, m.payload.name) != (entry.intent, entry.name)
+            and m.exact_key == best.exact_key
+            and best.similarity - m.similarity < 0.05
+            for m in matches[1:]
+        ):
+            confidence *= RULE_AMBIGUITY_PENALTY
+        
+        result = {
+            "intent": entry.intent,
+            "action": entry.name,
+            "parameters": {},
+            "confidence": round(confidence, 3)
+        }
+        print(f"✅ Heard '{best.heard}' as '{best.keyword}': {result}")
+        return result
+    
+    def _classify_embedding(self, command_text):
+        """Offline nearest-neighbour classification over the catalog"""
+        print(f"🔍 Embedding classification for: '{command_text}'")
+        
+        try:
+            result = embedding_classifier.classify(command_text)
+        except Exception as e:
+            logger.error(f"Embedding classification error: {e}")
+            return {"intent": "unknown", "action": None, "parameters": {}, "confidence": 0.0}
+        
+        if result["action"]:
+            print(f"✅ Nearest match: {result}")
+        return result
+
 # Global classifier instance
-classifier = CommandClassifier()
\ No newline at end of file
+classifier = registry.register("classifier", CommandClassifier)
\ No newline at end of file
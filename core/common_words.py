@@ -0,0 +1,34 @@
+"""
+Common Words
+Everyday English words a recognizer is likely to have heard correctly
+
+A transcript word from this list is taken at face value by the phonetic
+tier: "data" was said, not a mangled "date".
+"""
+
+COMMON_WORDS = frozenset("""
+a about above after again against all almost also always am an and another any anything are
+around as ask at away back bad be because been before being below best better between big bit
+both bring but buy by call called calm came can car case cat change check child children city
+class close cold come coming could couple course cut dad data day days dear did different do
+does dog doing done door down drink drive during each early easy eat else end enough even
+evening ever every everything eye face fact fall family far fast father feel few find fine
+first five food for found four friend from front full fun game gate get girl give go going
+gone good got great group grow had half hand happen happy hard has have he head hear heard
+heart hello help her here high him his hold home hope hot hour house how i if important in
+into is it its just keep kid kind know large last late later learn leave left less let life
+light like line list listen little live long look lot love low made make man many may me mean
+meet might mind minute mom money month more morning most mother move much music must my name
+near need never new news next nice night no nothing now number of off often oh ok okay old
+on once one only open or order other our out over own page paper part party people person
+phone pick place plan play please point power pretty problem put question quick quite rain
+read ready real really right road room run said same say school second see seem send set
+several she short should show side since sleep slow small so some someone something sometimes
+song soon sorry sound speak start stay still stop story street such sun sure take talk tea
+tell than thank thanks that the their them then there these they thing things think this those
+though thought three through till time timer to today together told tomorrow tonight too took
+top toward tree true try turn two under until up us use very wait walk want warm was watch
+water way we weather week well went were what when where which while white who whole why will
+window wish with without woman word words work world would write year yes yesterday yet you
+young your
+""".split())
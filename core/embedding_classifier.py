@@ -0,0 +1,142 @@
+"""
+Embedding Classifier
+Offline nearest-neighbour intent classification over the command catalog
+"""
+from config.settings import Settings
+from config.command_catalog import command_catalog
+from core.text_embeddings import NUMPY_AVAILABLE
+from utils.logger import logger
+from utils.service_registry import registry
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# Confidence ceiling - a nearest-neighbour guess never beats an exact keyword hit
+MAX_EMBEDDING_CONFIDENCE = 0.85
+
+# Below this similarity to its nearest catalog phrase a guess is not trusted on its own
+ACTIONABLE_SIMILARITY = 0.9
+
+# Ceiling for those guesses: below the 0.5 the assistant acts on, so without an
+# LLM to confirm them ("open downloads" is not "clean downloads") they ask the
+# user to rephrase instead of running an action
+UNCONFIRMED_MAX_CONFIDENCE = 0.45
+
+class EmbeddingIndex:
+    """Pre-computed, normalized embedding matrix of every catalog phrase"""
+
+    def __init__(self, snapshot, encoder):
+        """
+        Embed every keyword, example and action name in the catalog
+
+        Args:
+            snapshot: CatalogSnapshot to index
+            encoder: Object with encode(texts, normalize_embeddings=True)
+        """
+        self.encoder = encoder
+        self.entries = []
+        texts = []
+
+        for entry in snapshot.entries:
+            phrases = list(entry.keywords) + list(entry.data.get("examples", []))
+            phrases.append(entry.name.replace("_", " "))
+            for phrase in dict.fromkeys(phrases):
+                texts.append(phrase)
+                self.entries.append(entry)
+
+        if texts:
+            self.matrix = np.asarray(encoder.encode(texts, normalize_embeddings=True), dtype=np.float32)
+        else:
+            self.matrix = np.zeros((0, 1), dtype=np.float32)
+        self.texts = texts
+
+        logger.debug(f"Embedding index built: {len(texts)} phrases")
+
+    def search(self, text, top_k):
+        """
+        Find the nearest catalog phrases
+
+        Args:
+            text: Query text
+            top_k: Number of neighbours
+
+        Returns:
+            list: (similarity, entry) pairs, most similar first
+        """
+        if not self.texts:
+            return []
+
+        query = np.asarray(self.encoder.encode([text], normalize_embeddings=True)[0], dtype=np.float32)
+        similarities = self.matrix @ query
+
+        k = min(top_k, len(similarities))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [(float(similarities[i]), self.entries[i]) for i in top]
+
+class EmbeddingClassifier:
+    """Classify commands by a similarity-weighted top-k vote"""
+
+    def __init__(self):
+        """Initialize classifier and index the current catalog"""
+        self.available = NUMPY_AVAILABLE and Settings.ENABLE_EMBEDDING_CLASSIFIER
+        if self.available:
+            self._get_index()
+            encoder_name = type(registry.get("intent_encoder")).__name__
+            logger.info(f"Embedding classifier initialized ({encoder_name})")
+        else:
+            logger.warning("Embedding classifier disabled (numpy missing or ENABLE_EMBEDDING_CLASSIFIER=false)")
+
+    def _get_index(self):
+        """Get the index for the current catalog (rebuilt when the catalog reloads)"""
+        return command_catalog.snapshot().derive(
+            "embedding_index",
+            lambda snapshot: EmbeddingIndex(snapshot, registry.get("intent_encoder"))
+        )
+
+    def classify(self, command_text):
+        """
+        Classify a command without any network access
+
+        Args:
+            command_text: User's command text
+
+        Returns:
+            dict: Classification result
+        """
+        unknown = {"intent": "unknown", "action": None, "parameters": {}, "confidence": 0.0}
+        if not self.available:
+            return unknown
+
+        neighbours = self._get_index().search(command_text, Settings.EMBEDDING_TOP_K)
+        if not neighbours or neighbours[0][0] < Settings.EMBEDDING_MIN_SIMILARITY:
+            return unknown
+
+        # Similarity-weighted vote among the top-k neighbours
+        votes = {}
+        best_similarity = {}
+        for similarity, entry in neighbours:
+            if similarity <= 0:
+                continue
+            key = (entry.intent, entry.name)
+            votes[key] = votes.get(key, 0.0) + similarity
+            best_similarity[key] = max(best_similarity.get(key, 0.0), similarity)
+
+        if not votes:
+            return unknown
+
+        winner = max(votes, key=votes.get)
+        vote_share = votes[winner] / sum(votes.values())
+        confidence = min(MAX_EMBEDDING_CONFIDENCE, best_similarity[winner] * (0.5 + 0.5 * vote_share))
+        if best_similarity[winner] < ACTIONABLE_SIMILARITY:
+            confidence = min(confidence, UNCONFIRMED_MAX_CONFIDENCE)
+
+        return {
+            "intent": winner[0],
+            "action": winner[1],
+            "parameters": {},
+            "confidence": round(confidence, 3)
+        }
+
+# Global embedding classifier instance
+embedding_classifier = registry.register("embedding_classifier", EmbeddingClassifier)
@@ -0,0 +1,151 @@
+"""
+Incremental JSON Parser
+Extracts top-level fields of a streamed JSON object as soon as each one is complete
+"""
+import json
+
+class IncrementalJSONParser:
+    """
+    Parse the first top-level JSON object in a token stream
+
+    Text before the opening brace (chatter, markdown fences) is skipped, and
+    everything after the closing brace is ignored.
+    """
+
+    def __init__(self):
+        """Initialize parser state"""
+        self.fields = {}
+        self.done = False
+        self.text = ""
+
+        self._started = False
+        self._expect = "key"     # key | colon | value | comma
+        self._key = None
+        self._value_start = None
+        self._value_kind = None  # string | container | scalar
+        self._depth = 0          # nesting inside a container value
+        self._in_string = False
+        self._escape = False
+        self._key_start = None
+
+    def feed(self, chunk):
+        """
+        Consume the next piece of text
+
+        Args:
+            chunk: Newly received text
+
+        Returns:
+            dict: Fields completed by this chunk
+        """
+        completed = {}
+        if self.done or not chunk:
+            return completed
+
+        position = len(self.text)
+        self.text += chunk
+
+        while position < len(self.text) and not self.done:
+            char = self.text[position]
+            self._step(char, position, completed)
+            position += 1
+
+        return completed
+
+    def _complete_value(self, end, completed):
+        """Decode the value that ends at `end` (exclusive) and store it"""
+        raw = self.text[self._value_start:end].strip()
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        self.fields[self._key] = value
+        completed[self._key] = value
+        self._key = None
+        self._value_start = None
+        self._value_kind = None
+        self._expect = "comma"
+
+    def _step(self, char, position, completed):
+        """Advance the state machine by one character"""
+        if not self._started:
+            if char == "{":
+                self._started = True
+            return
+
+        # Inside a key string
+        if self._key_start is not None:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._key = json.loads(self.text[self._key_start:position + 1])
+                self._key_start = None
+                self._expect = "colon"
+            return
+
+        # Inside a value
+        if self._value_kind == "string":
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._complete_value(position + 1, completed)
+            return
+
+        if self._value_kind == "container":
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_value(position + 1, completed)
+            return
+
+        if self._value_kind == "scalar":
+            if char in ",}" or char.isspace():
+                self._complete_value(position, completed)
+                self._after_value(char)
+            return
+
+        # Between tokens at the top level
+        if char.isspace():
+            return
+
+        if self._expect == "key":
+            if char == '"':
+                self._key_start = position
+            elif char == "}":
+                self.done = True
+        elif self._expect == "colon":
+            if char == ":":
+                self._expect = "value"
+        elif self._expect == "value":
+            self._value_start = position
+            if char == '"':
+                self._value_kind = "string"
+            elif char in "{[":
+                self._value_kind = "container"
+                self._depth = 1
+            else:
+                self._value_kind = "scalar"
+        elif self._expect == "comma":
+            self._after_value(char)
+
+    def _after_value(self, char):
+        """Handle the separator following a value"""
+        if char == ",":
+            self._expect = "key"
+        elif char == "}":
+            self.done = True
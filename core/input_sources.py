@@ -0,0 +1,194 @@
+"""
+Input Sources - Headless Operation
+WAV recordings and text lines standing in for the microphone, so the full pipeline runs without audio hardware
+"""
+import os
+import sys
+import glob
+import wave
+import speech_recognition as sr
+from config.settings import Settings
+from core import pcm
+from core.audio_capture import noise_level
+from utils.logger import logger
+
+def expand_wav_paths(paths):
+    """
+    Resolve files and directories to a sorted list of WAV files
+
+    Raises:
+        FileNotFoundError: Nothing to play
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.wav"))))
+        else:
+            files.append(path)
+    if not files:
+        raise FileNotFoundError(f"No WAV files in {', '.join(paths)}")
+    return files
+
+def read_wav(path, sample_rate, sample_width):
+    """Read a WAV file as mono PCM at the given rate and width"""
+    with wave.open(path, "rb") as f:
+        channels, width, rate = f.getnchannels(), f.getsampwidth(), f.getframerate()
+        data = f.readframes(f.getnframes())
+
+    if channels > 2:
+        raise ValueError(f"{path}: only mono or stereo WAV files are supported")
+    data = pcm.to_mono(data, width, channels)
+    data = pcm.convert_width(data, width, sample_width)
+    return pcm.resample(data, sample_width, rate, sample_rate)
+
+class _WavStream:
+    """Reads the recordings back to back, with silence between them"""
+
+    def __init__(self, device):
+        self.device = device
+        self._blocks = device._blocks()
+        self._pending = b""
+
+    def read(self, size):
+        """Read size frames; b"" once every file has been played"""
+        wanted = size * self.device.SAMPLE_WIDTH
+        while len(self._pending) < wanted:
+            block = next(self._blocks, None)
+            if block is None:
+                break
+            self._pending += block
+        data, self._pending = self._pending[:wanted], self._pending[wanted:]
+        return data
+
+    def close(self):
+        pass
+
+class WavFileDevice(sr.AudioSource):
+    """
+    WAV recordings played into the capture ring as if spoken into a microphone
+
+    Capture is lossless: it never runs more than half a ring ahead of the
+    listener, so every recording is heard however slowly the pipeline
+    consumes it. The energy threshold comes from the recordings' own noise
+    instead of a calibration pass that would eat the first second of audio.
+    """
+
+    lossless = True
+
+    def __init__(self, paths, gap_seconds=None):
+        """
+        Initialize device
+
+        Args:
+            paths: WAV files and/or directories of WAV files (played in order)
+            gap_seconds: Silence after each file, so each one ends a phrase
+                (default: Settings.WAV_INPUT_GAP)
+        """
+        self.files = expand_wav_paths(paths)
+        self.gap_seconds = Settings.WAV_INPUT_GAP if gap_seconds is None else gap_seconds
+        self.device_index = None
+        self.stream = None
+
+        with wave.open(self.files[0], "rb") as f:
+            self.SAMPLE_RATE = f.getframerate()
+            self.SAMPLE_WIDTH = f.getsampwidth()
+        self.CHUNK = Settings.CHUNK_SIZE
+
+        self.noise_floor = self._measure_noise_floor()
+        logger.info(f"Playing {len(self.files)} WAV file(s) as audio input (noise floor {self.noise_floor:.0f})")
+
+    def _measure_noise_floor(self):
+        """
+        Median over files of each file's noise level
+
+        Measured like the live microphone's NoiseFloorTracker (a low
+        percentile of chunk energies, not the quietest chunk), so a headless
+        run uses the same energy threshold the microphone would.
+        """
+        chunk_bytes = self.CHUNK * self.SAMPLE_WIDTH
+        levels = []
+        for path in self.files:
+            data = read_wav(path, self.SAMPLE_RATE, self.SAMPLE_WIDTH)
+            level = noise_level([
+                pcm.rms(data[start:start + chunk_bytes], self.SAMPLE_WIDTH)
+                for start in range(0, len(data) - chunk_bytes + 1, chunk_bytes)
+            ])
+            if level is not None:
+                levels.append(level)
+        levels.sort()
+        return levels[len(levels) // 2] if levels else 0.0
+
+    def _blocks(self):
+        """PCM blocks: each file followed by a gap of silence"""
+        gap = b"\0" * (int(self.gap_seconds * self.SAMPLE_RATE) * self.SAMPLE_WIDTH)
+        for path in self.files:
+            logger.debug(f"Playing {path}")
+            yield read_wav(path, self.SAMPLE_RATE, self.SAMPLE_WIDTH)
+            yield gap
+
+    def __enter__(self):
+        self.stream = _WavStream(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None
+
+class TextListener:
+    """
+    Newline-delimited transcripts in place of speech
+
+    Each line is one utterance, as if returned by the recognizer, so the
+    wake word, classification and execution paths run unchanged.
+    """
+
+    captures_audio = False
+
+    def __init__(self, stream=None):
+        """
+        Initialize listener
+
+        Args:
+            stream: Text stream to read (default: the file in
+                Settings.INPUT_PATHS, or stdin)
+        """
+        if stream is None:
+            path = Settings.INPUT_PATHS[0] if Settings.INPUT_PATHS else "-"
+            stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+        self.stream = stream
+        self.exhausted = False
+        logger.info(f"Reading utterances from {getattr(stream, 'name', 'text stream')}")
+
+    def listen(self, timeout=None, phrase_time_limit=None, on_partial=None):
+        """
+        Next non-empty line
+
+        Returns:
+            str: The line (lowercase) or None at end of input
+        """
+        for line in self.stream:
+            text = line.strip()
+            if text:
+                logger.info(f"Recognized: {text}")
+                return text.lower()
+        self.exhausted = True
+        return None
+
+    def get_command(self, on_partial=None):
+        """Command after the wake word: the next line"""
+        return self.listen()
+
+    def capture_command(self, on_partial=None):
+        """Command after the wake word, as an utterance for recognize()"""
+        return self.listen()
+
+    def recognize(self, utterance):
+        """Lines are already transcripts"""
+        return utterance
+
+    def listen_for_wake_word(self):
+        """Check the next line for the wake word"""
+        text = self.listen()
+        return bool(text and Settings.WAKE_WORD in text)
+
+    def discard_pending(self):
+        """Nothing is captured while the assistant speaks"""
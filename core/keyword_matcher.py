@@ -0,0 +1,124 @@
+"""
+Keyword Matcher - Aho-Corasick Automaton
+Finds every catalog keyword in an utterance with a single pass over the text
+"""
+from collections import deque, namedtuple
+
+KeywordMatch = namedtuple("KeywordMatch", ["start", "end", "keyword", "payload", "order"])
+
+def _is_word_char(char):
+    """Characters that continue a word (so "word" does not match inside "password")"""
+    return char.isalnum() or char == "_"
+
+class KeywordMatcher:
+    """Multi-pattern keyword matcher with word-boundary and longest-match rules"""
+
+    def __init__(self, patterns):
+        """
+        Build the automaton
+
+        Args:
+            patterns: Iterable of (keyword, payload) pairs; order breaks ties
+        """
+        self.patterns = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for keyword, payload in patterns:
+            keyword = " ".join(keyword.lower().split())
+            if not keyword:
+                continue
+            self.patterns.append((keyword, payload))
+            self._insert(keyword, len(self.patterns) - 1)
+
+        self._build_failure_links()
+
+    @classmethod
+    def from_catalog(cls, snapshot):
+        """Build a matcher over every keyword of a CatalogSnapshot (payload: CatalogEntry)"""
+        return cls(snapshot.keywords)
+
+    def _insert(self, keyword, index):
+        """Add a keyword to the trie"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(index)
+
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links and merged outputs"""
+        queue = deque()
+        for state in self._goto[0].values():
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text):
+        """
+        Find all whole-word keyword occurrences
+
+        Args:
+            text: Utterance to scan
+
+        Returns:
+            list: KeywordMatch tuples in order of their end position
+        """
+        text = " ".join(text.lower().split())
+        matches = []
+        state = 0
+        goto = self._goto
+        fail = self._fail
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for index in self._output[state]:
+                keyword, payload = self.patterns[index]
+                start = position - len(keyword) + 1
+                end = position + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(keyword[0]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]) and _is_word_char(keyword[-1]):
+                    continue
+                matches.append(KeywordMatch(start, end, keyword, payload, index))
+
+        return matches
+
+    @staticmethod
+    def rank(match):
+        """Sort key: longer keywords, then more words, then earlier catalog order"""
+        return (-len(match.keyword), -match.keyword.count(" "), match.order)
+
+    def best_match(self, text):
+        """
+        Get the most specific keyword match
+
+        Args:
+            text: Utterance to scan
+
+        Returns:
+            KeywordMatch or None
+        """
+        matches = self.find_all(text)
+        if not matches:
+            return None
+        return min(matches, key=self.rank)
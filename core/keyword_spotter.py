@@ -0,0 +1,290 @@
+"""
+Keyword Spotter - On-Device Wake Word
+MFCC features and template matching over local audio, so the wake word never needs the cloud
+
+Templates are recordings of the user saying the wake word, enrolled with
+`python -m tools.enroll_wake_word`. A captured segment is reduced to
+MFCC frames and aligned against every template with subsequence dynamic
+time warping; the wake word fires when the best alignment costs less than
+the threshold learned at enrollment.
+"""
+import functools
+from config.settings import Settings
+from core.text_embeddings import NUMPY_AVAILABLE
+from utils.helpers import load_json, save_json, get_timestamp
+from utils.logger import logger
+from utils.service_registry import registry
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+    from core import pcm
+
+FRAME_SECONDS = 0.025
+HOP_SECONDS = 0.010
+NUM_FILTERS = 26
+NUM_COEFFICIENTS = 13
+MAX_FREQUENCY = 8000
+
+# Cepstral mean normalization window; local so a command after the wake word doesn't shift it
+NORMALIZATION_SECONDS = 1.0
+
+# Frames quieter than this fraction of the loudest frame are trimmed as silence
+SILENCE_RATIO = 0.1
+
+# Enrollment threshold = worst template-to-template distance times this margin
+THRESHOLD_MARGIN = 1.25
+# Used when only one template is enrolled (nothing to measure the spread against)
+DEFAULT_THRESHOLD = 4.0
+
+def pcm_to_float(frame_data, sample_width):
+    """Raw PCM bytes -> float32 samples in [-1, 1)"""
+    return pcm.to_samples(frame_data, sample_width).astype(np.float32) / 2147483648.0
+
+@functools.lru_cache(maxsize=8)
+def _filterbank(sample_rate, fft_size):
+    """Triangular mel filterbank, (NUM_FILTERS, fft_size // 2 + 1)"""
+    top = min(MAX_FREQUENCY, sample_rate / 2)
+    mel_top = 2595.0 * np.log10(1.0 + top / 700.0)
+    mel_points = np.linspace(0.0, mel_top, NUM_FILTERS + 2)
+    hz_points = 700.0 * (10.0 ** (mel_points / 2595.0) - 1.0)
+    bins = np.floor((fft_size + 1) * hz_points / sample_rate).astype(int)
+
+    frequencies = np.arange(fft_size // 2 + 1)[None, :]
+    left, center, right = bins[:-2, None], bins[1:-1, None], bins[2:, None]
+    rising = (frequencies - left) / np.maximum(center - left, 1)
+    falling = (right - frequencies) / np.maximum(right - center, 1)
+    return np.clip(np.minimum(rising, falling), 0.0, None).astype(np.float32)
+
+@functools.lru_cache(maxsize=1)
+def _dct_matrix():
+    """DCT-II rows for coefficients 1..NUM_COEFFICIENTS (c0, the loudness, is dropped)"""
+    n = np.arange(NUM_FILTERS)
+    k = np.arange(1, NUM_COEFFICIENTS + 1)[:, None]
+    return (np.cos(np.pi * k * (2 * n + 1) / (2 * NUM_FILTERS)) * np.sqrt(2.0 / NUM_FILTERS)).astype(np.float32)
+
+def mfcc(samples, sample_rate):
+    """
+    Mel-frequency cepstral coefficients of a signal
+
+    Frame length and filterbank range are fixed in seconds and hertz, so
+    features from devices with different sample rates are comparable.
+
+    Args:
+        samples: float32 samples
+        sample_rate: Samples per second
+
+    Returns:
+        numpy.ndarray: (frames, NUM_COEFFICIENTS) float32 matrix (empty if too short)
+    """
+    frame_length = int(round(FRAME_SECONDS * sample_rate))
+    hop = int(round(HOP_SECONDS * sample_rate))
+    if len(samples) < frame_length:
+        return np.zeros((0, NUM_COEFFICIENTS), dtype=np.float32)
+
+    emphasized = np.append(samples[:1], samples[1:] - 0.97 * samples[:-1])
+    frames = np.lib.stride_tricks.sliding_window_view(emphasized, frame_length)[::hop]
+    fft_size = 1 << (frame_length - 1).bit_length()
+
+    spectrum = np.fft.rfft(frames * np.hamming(frame_length).astype(np.float32), n=fft_size)
+    power = (spectrum.real ** 2 + spectrum.imag ** 2) / fft_size
+    energies = np.log(power @ _filterbank(sample_rate, fft_size).T + 1e-10)
+    return (energies @ _dct_matrix().T).astype(np.float32)
+
+def voiced_span(samples, sample_rate):
+    """
+    Sample range from the first to the last frame near the loudest one
+
+    Returns:
+        tuple: (start, stop) sample indices (empty range for silence)
+    """
+    hop = int(round(HOP_SECONDS * sample_rate))
+    usable = len(samples) - len(samples) % hop
+    if usable == 0:
+        return 0, len(samples)
+
+    rms = np.sqrt(np.mean(samples[:usable].reshape(-1, hop) ** 2, axis=1))
+    voiced = np.flatnonzero(rms > rms.max() * SILENCE_RATIO)
+    if len(voiced) == 0:
+        return 0, 0
+    return voiced[0] * hop, (voiced[-1] + 1) * hop
+
+def features(samples, sample_rate):
+    """
+    Normalized MFCC frames of a recording
+
+    Args:
+        samples: float32 samples, already trimmed to the voiced span
+
+    Returns:
+        numpy.ndarray: MFCC frames minus their mean over the surrounding NORMALIZATION_SECONDS
+    """
+    coefficients = mfcc(samples, sample_rate)
+    if len(coefficients) == 0:
+        return coefficients
+
+    # Centered moving average via cumulative sums, clipped at the edges
+    half = int(NORMALIZATION_SECONDS / HOP_SECONDS) // 2
+    sums = np.vstack([np.zeros((1, coefficients.shape[1]), dtype=np.float64), np.cumsum(coefficients, axis=0, dtype=np.float64)])
+    index = np.arange(len(coefficients))
+    low = np.maximum(index - half, 0)
+    high = np.minimum(index + half + 1, len(coefficients))
+    means = (sums[high] - sums[low]) / (high - low)[:, None]
+    return (coefficients - means).astype(np.float32)
+
+def subsequence_dtw(template, query):
+    """
+    Align a template anywhere inside a (possibly longer) query
+
+    Each template frame advances the query by 0, 1 or 2 frames, never 0 twice
+    in a row, so the match spans between half and twice the template's length.
+    Each template row is one vectorized step over all query frames.
+
+    Args:
+        template: (m, d) feature frames
+        query: (n, d) feature frames
+
+    Returns:
+        tuple: (mean cost per template frame, query frame where the match ends)
+    """
+    if len(template) == 0 or len(query) * 2 < len(template):
+        return float("inf"), 0
+
+    cost = np.sqrt(np.maximum(
+        (template ** 2).sum(axis=1)[:, None] + (query ** 2).sum(axis=1)[None, :] - 2.0 * template @ query.T,
+        0.0
+    ))
+
+    inf = np.float32(np.inf)
+    moved = cost[0].copy()               # Reached by advancing the query (free start anywhere)
+    stayed = np.full_like(moved, inf)    # Reached by repeating the previous query frame
+    for row in cost[1:]:
+        best = np.minimum(moved, stayed)
+        step = np.full_like(best, inf)
+        step[1:] = best[:-1]
+        step[2:] = np.minimum(step[2:], best[:-2])
+        stayed = row + moved
+        moved = row + step
+
+    final = np.minimum(moved, stayed)
+    end = int(np.argmin(final))
+    return float(final[end]) / len(template), end
+
+class KeywordMatch:
+    """Outcome of spotting the wake word in one segment"""
+
+    def __init__(self, distance, threshold, end_time):
+        self.distance = distance
+        self.threshold = threshold
+        self.end_time = end_time
+
+    @property
+    def detected(self):
+        return self.distance <= self.threshold
+
+    def __repr__(self):
+        return f"KeywordMatch(distance={self.distance:.2f}, threshold={self.threshold:.2f}, end_time={self.end_time:.2f})"
+
+class KeywordSpotter:
+    """Spot the enrolled wake word in local audio"""
+
+    def __init__(self, templates_file=None):
+        """
+        Load enrolled templates
+
+        Args:
+            templates_file: Enrollment file (default: Settings.WAKE_WORD_TEMPLATES_FILE)
+        """
+        self.templates_file = templates_file or Settings.WAKE_WORD_TEMPLATES_FILE
+        self.templates = []
+        self.threshold = DEFAULT_THRESHOLD
+        self.available = NUMPY_AVAILABLE and Settings.ENABLE_WAKE_WORD_SPOTTER
+
+        if not self.available:
+            logger.warning("Keyword spotter disabled (numpy missing or ENABLE_WAKE_WORD_SPOTTER=false)")
+            return
+        self.load()
+
+    @property
+    def enrolled(self):
+        """True once at least one template is available"""
+        return self.available and bool(self.templates)
+
+    def load(self):
+        """Read templates for the configured wake word"""
+        data = load_json(self.templates_file, default={})
+        if data.get("wake_word") != Settings.WAKE_WORD:
+            if data:
+                logger.warning(f"Enrolled wake word '{data.get('wake_word')}' differs from '{Settings.WAKE_WORD}'; re-enroll")
+            self.templates = []
+            return
+
+        self.templates = [np.asarray(template, dtype=np.float32) for template in data.get("templates", [])]
+        self.threshold = data.get("threshold", DEFAULT_THRESHOLD)
+        logger.info(f"Keyword spotter loaded {len(self.templates)} template(s), threshold {self.threshold:.2f}")
+
+    def enroll(self, recordings):
+        """
+        Replace the templates with new recordings and learn a threshold
+
+        Args:
+            recordings: sr.AudioData list of the user saying the wake word
+
+        Returns:
+            float: The learned threshold
+        """
+        templates = []
+        for audio in recordings:
+            samples = pcm_to_float(audio.frame_data, audio.sample_width)
+            start, stop = voiced_span(samples, audio.sample_rate)
+            templates.append(features(samples[start:stop], audio.sample_rate))
+        templates = [template for template in templates if len(template)]
+        if not templates:
+            raise ValueError("No speech found in the enrollment recordings")
+
+        # Every template has to be accepted by the others, with some room to spare
+        spread = [
+            subsequence_dtw(template, other)[0]
+            for i, template in enumerate(templates)
+            for j, other in enumerate(templates)
+            if i != j
+        ]
+        threshold = max(spread) * THRESHOLD_MARGIN if spread else DEFAULT_THRESHOLD
+
+        save_json(self.templates_file, {
+            "wake_word": Settings.WAKE_WORD,
+            "enrolled_at": get_timestamp(),
+            "threshold": round(threshold, 4),
+            "templates": [template.round(4).tolist() for template in templates]
+        })
+        self.templates = templates
+        self.threshold = threshold
+        return threshold
+
+    def spot(self, audio):
+        """
+        Look for the wake word in a captured segment
+
+        Args:
+            audio: sr.AudioData
+
+        Returns:
+            KeywordMatch: Best alignment over all templates (None if not enrolled)
+        """
+        if not self.enrolled:
+            return None
+
+        samples = pcm_to_float(audio.frame_data, audio.sample_width)
+        start, stop = voiced_span(samples, audio.sample_rate)
+        query = features(samples[start:stop], audio.sample_rate)
+
+        best_distance, best_end = float("inf"), 0
+        for template in self.templates:
+            distance, end = subsequence_dtw(template, query)
+            if distance < best_distance:
+                best_distance, best_end = distance, end
+
+        end_time = start / audio.sample_rate + best_end * HOP_SECONDS + FRAME_SECONDS
+        return KeywordMatch(best_distance, self.threshold * Settings.WAKE_WORD_SENSITIVITY, end_time)
+
+# Global spotter instance
+keyword_spotter = registry.register("keyword_spotter", KeywordSpotter)
@@ -0,0 +1,412 @@
+"""
+LLM Providers - Latency-Aware Router
+Groq, OpenAI and Anthropic behind one chat interface, routed to the fastest healthy backend
+"""
+import time
+import queue
+import threading
+from collections import deque
+from config.settings import Settings
+from core.llm_transport import AsyncLLMTransport, OpenAICompatibleChat, RequestCancelled, HTTPX_AVAILABLE
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.logger import logger
+
+class AnthropicChat:
+    """Chat completions over the Anthropic Messages API"""
+
+    def __init__(self, transport, model):
+        """
+        Initialize chat client
+
+        Args:
+            transport: AsyncLLMTransport pointed at the API base URL
+            model: Model name
+        """
+        self.transport = transport
+        self.model = model
+
+    def _payload(self, messages, temperature, max_tokens):
+        """Move system messages into the top-level "system" field"""
+        system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+        payload = {
+            "model": self.model,
+            "messages": [m for m in messages if m["role"] != "system"],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if system:
+            payload["system"] = system
+        return payload
+
+    def complete(self, messages, temperature=0.2, max_tokens=150, deadline=None, cancel=None):
+        """
+        Get a complete chat response
+
+        Args:
+            cancel: threading.Event that abandons the request when set
+
+        Returns:
+            str: Assistant message text
+        """
+        response = self.transport.post_json(
+            "/messages",
+            self._payload(messages, temperature, max_tokens),
+            deadline=deadline,
+            cancel=cancel
+        )
+        return "".join(block.get("text", "") for block in response.get("content", []) if block.get("type") == "text")
+
+    def stream(self, messages, temperature=0.2, max_tokens=150, deadline=None):
+        """
+        Stream a chat response
+
+        Yields:
+            str: Text deltas as they arrive
+        """
+        payload = self._payload(messages, temperature, max_tokens)
+        payload["stream"] = True
+
+        for event in self.transport.stream_events("/messages", payload, deadline=deadline):
+            if event.get("type") == "content_block_delta":
+                text = (event.get("delta") or {}).get("text")
+                if text:
+                    yield text
+            elif event.get("type") == "message_stop":
+                return
+
+class ProviderStats:
+    """Rolling latency and error statistics for one provider"""
+
+    def __init__(self, window=None):
+        """
+        Initialize stats
+
+        Args:
+            window: Number of recent requests considered
+        """
+        window = window or Settings.LLM_PROVIDER_WINDOW
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_success(self, latency):
+        """Record a successful request and its latency in seconds"""
+        with self._lock:
+            self.latencies.append(latency)
+            self.outcomes.append(True)
+
+    def record_failure(self):
+        """Record a failed request"""
+        with self._lock:
+            self.outcomes.append(False)
+
+    def median_latency(self):
+        """Median recent latency in seconds (None without data)"""
+        with self._lock:
+            ordered = sorted(self.latencies)
+        if not ordered:
+            return None
+        return ordered[len(ordered) // 2]
+
+    def error_rate(self):
+        """Fraction of recent requests that failed"""
+        with self._lock:
+            if not self.outcomes:
+                return 0.0
+            return self.outcomes.count(False) / len(self.outcomes)
+
+    def expected_latency(self):
+        """
+        Expected time to a good answer
+
+        Untried providers are assumed fast so they get sampled; failures
+        inflate the estimate since a failed request has to be retried elsewhere.
+        """
+        median = self.median_latency()
+        if median is None:
+            return 0.0
+        return median / max(0.05, 1.0 - self.error_rate())
+
+class LLMProvider:
+    """A named chat backend with its own statistics and circuit breaker"""
+
+    def __init__(self, name, chat):
+        """
+        Initialize provider
+
+        Args:
+            name: Provider name (groq, openai, anthropic)
+            chat: Client with complete() and stream()
+        """
+        self.name = name
+        self.chat = chat
+        self.model = chat.model
+        self.stats = ProviderStats()
+        self.breaker = CircuitBreaker(
+            f"llm:{name}",
+            failure_threshold=Settings.LLM_PROVIDER_MAX_FAILURES,
+            reset_timeout=Settings.LLM_PROVIDER_COOLDOWN,
+            probe=self._probe
+        )
+
+    def is_healthy(self):
+        """Healthy while the circuit is closed"""
+        return self.breaker.allow()
+
+    def _probe(self):
+        """Smallest possible request, used by the breaker to detect recovery"""
+        self.chat.complete(
+            [{"role": "user", "content": "ping"}],
+            max_tokens=1,
+            deadline=Settings.LLM_TIMEOUT
+        )
+
+    def record_success(self, latency):
+        """Record a successful request"""
+        self.stats.record_success(latency)
+        self.breaker.record_success()
+
+    def record_failure(self):
+        """Record a failed or timed-out request"""
+        self.stats.record_failure()
+        self.breaker.record_failure()
+
+    def complete(self, messages, validate=None, **options):
+        """
+        Get a complete response, recording latency or failure
+
+        An answer that fails validation counts as a failure: the provider
+        didn't deliver anything usable. A request abandoned through its
+        cancel event isn't counted either way.
+
+        Args:
+            messages: Chat messages
+            validate: Callable raising on unusable text
+            options: Passed to the chat client (temperature, max_tokens, deadline, cancel)
+        """
+        started = time.monotonic()
+        try:
+            text = self.chat.complete(messages, **options)
+            if validate:
+                validate(text)
+        except RequestCancelled:
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success(time.monotonic() - started)
+        return text
+
+    def get_statistics(self):
+        """Get provider statistics"""
+        median = self.stats.median_latency()
+        return {
+            "model": self.model,
+            "circuit": self.breaker.state,
+            "median_latency_ms": round(median * 1000, 1) if median is not None else None,
+            "error_rate": round(self.stats.error_rate(), 3),
+            "samples": len(self.stats.outcomes)
+        }
+
+class LLMRouter:
+    """
+    Route chat requests to the fastest healthy provider
+
+    Exposes the same complete()/stream() interface as a single chat client,
+    failing over to the next provider when one errors. Providers with an
+    open circuit are skipped; when every circuit is open, CircuitOpenError
+    is raised at once instead of waiting on a dead backend. With race enabled,
+    complete() asks the two best providers at once and returns the first
+    answer that passes validation.
+    """
+
+    def __init__(self, providers, race=None):
+        """
+        Initialize router
+
+        Args:
+            providers: LLMProvider list (order breaks latency ties)
+            race: Race the two best providers (default: Settings.LLM_RACE_PROVIDERS)
+        """
+        self.providers = list(providers)
+        self.race = Settings.LLM_RACE_PROVIDERS if race is None else race
+        self.model = ",".join(provider.model for provider in self.providers)
+
+    def ranked(self):
+        """
+        Healthy providers by expected latency, best first
+
+        Raises:
+            CircuitOpenError: Every provider's circuit is open
+        """
+        order = {provider.name: index for index, provider in enumerate(self.providers)}
+        healthy = [provider for provider in self.providers if provider.is_healthy()]
+        if not healthy:
+            raise CircuitOpenError("Every LLM provider's circuit is open")
+        return sorted(healthy, key=lambda p: (p.stats.expected_latency(), order[p.name]))
+
+    def complete(self, messages, temperature=0.2, max_tokens=150, deadline=None, validate=None):
+        """
+        Get a complete chat response
+
+        Args:
+            messages: Chat messages
+            validate: Callable raising on unusable text (e.g. invalid JSON)
+
+        Returns:
+            str: Response text
+        """
+        options = {"temperature": temperature, "max_tokens": max_tokens, "deadline": deadline}
+        ranked = self.ranked()
+
+        error = None
+        if self.race and len(ranked) > 1:
+            try:
+                return self._race(ranked[:2], messages, options, validate)
+            except Exception as e:
+                logger.warning(f"LLM race failed ({e}); trying remaining providers")
+                error = e
+                ranked = ranked[2:]
+
+        for provider in ranked:
+            try:
+                text = provider.complete(messages, validate=validate, **options)
+                logger.debug(f"LLM answered by {provider.name}")
+                return text
+            except Exception as e:
+                logger.warning(f"LLM provider {provider.name} failed: {e}")
+                error = e
+
+        raise error
+
+    def _race(self, providers, messages, options, validate):
+        """
+        Ask several providers at once and take the first valid answer
+
+        The losers' requests are cancelled as soon as there is a winner, so
+        they don't keep holding pooled connections or count against the
+        providers' rate limits.
+        """
+        results = queue.Queue()
+        cancel = threading.Event()
+
+        def run(provider):
+            try:
+                text = provider.complete(messages, validate=validate, cancel=cancel, **options)
+                results.put((provider, text, None))
+            except Exception as e:
+                results.put((provider, None, e))
+
+        for provider in providers:
+            threading.Thread(target=run, args=(provider,), daemon=True, name=f"race-{provider.name}").start()
+
+        error = None
+        try:
+            for _ in providers:
+                provider, text, e = results.get()
+                if e is None:
+                    logger.debug(f"LLM race won by {provider.name}")
+                    return text
+                logger.warning(f"LLM provider {provider.name} failed in race: {e}")
+                error = e
+            raise error
+        finally:
+            cancel.set()
+
+    def stream(self, messages, temperature=0.2, max_tokens=150, deadline=None):
+        """
+        Stream a chat response from the best provider
+
+        Fails over to the next provider only if nothing was received yet.
+        Time to the first chunk is recorded as the provider's latency.
+
+        Yields:
+            str: Text deltas as they arrive
+        """
+        options = {"temperature": temperature, "max_tokens": max_tokens, "deadline": deadline}
+        error = None
+
+        for provider in self.ranked():
+            started = time.monotonic()
+            received_any = False
+            chunks = provider.chat.stream(messages, **options)
+            try:
+                for chunk in chunks:
+                    if not received_any:
+                        provider.record_success(time.monotonic() - started)
+                        received_any = True
+                    yield chunk
+                return
+            except Exception as e:
+                if received_any:
+                    raise
+                provider.record_failure()
+                logger.warning(f"LLM provider {provider.name} stream failed: {e}")
+                error = e
+            finally:
+                chunks.close()
+
+        raise error
+
+    def get_statistics(self):
+        """Get per-provider statistics"""
+        return {provider.name: provider.get_statistics() for provider in self.providers}
+
+def create_groq_provider():
+    """Groq over its OpenAI-compatible API"""
+    transport = AsyncLLMTransport(
+        Settings.GROQ_BASE_URL,
+        headers={"Authorization": f"Bearer {Settings.GROQ_API_KEY}"},
+        name="groq"
+    )
+    return LLMProvider("groq", OpenAICompatibleChat(transport, Settings.GROQ_MODEL))
+
+def create_openai_provider():
+    """OpenAI chat completions"""
+    transport = AsyncLLMTransport(
+        Settings.OPENAI_BASE_URL,
+        headers={"Authorization": f"Bearer {Settings.OPENAI_API_KEY}"},
+        name="openai"
+    )
+    return LLMProvider("openai", OpenAICompatibleChat(transport, Settings.OPENAI_MODEL))
+
+def create_anthropic_provider():
+    """Anthropic Messages API"""
+    transport = AsyncLLMTransport(
+        Settings.ANTHROPIC_BASE_URL,
+        headers={
+            "x-api-key": Settings.ANTHROPIC_API_KEY,
+            "anthropic-version": Settings.ANTHROPIC_VERSION
+        },
+        name="anthropic"
+    )
+    return LLMProvider("anthropic", AnthropicChat(transport, Settings.ANTHROPIC_MODEL))
+
+def create_secondary_providers():
+    """
+    Build the OpenAI and Anthropic providers enabled in settings
+
+    Returns:
+        list: LLMProvider instances that initialized successfully
+    """
+    providers = []
+    if not HTTPX_AVAILABLE:
+        return providers
+
+    candidates = [
+        ("openai", Settings.USE_OPENAI, Settings.OPENAI_API_KEY, create_openai_provider),
+        ("anthropic", Settings.USE_ANTHROPIC, Settings.ANTHROPIC_API_KEY, create_anthropic_provider),
+    ]
+    for name, enabled, api_key, factory in candidates:
+        if not enabled:
+            continue
+        if not api_key:
+            logger.warning(f"USE_{name.upper()} is set but {name.upper()}_API_KEY is missing")
+            continue
+        try:
+            providers.append(factory())
+            logger.info(f"LLM provider ready: {name}")
+        except Exception as e:
+            logger.error(f"Failed to initialize {name}: {e}")
+
+    return providers
@@ -0,0 +1,418 @@
+"""
+LLM Transport - Pooled Async HTTP
+Keep-alive connection pool, per-request deadlines, jittered retries and hedged requests
+"""
+import time
+import json
+import queue
+import random
+import asyncio
+import threading
+import concurrent.futures
+from collections import deque
+from config.settings import Settings
+from utils.logger import logger
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    logger.warning("httpx not available. Install: pip install httpx")
+
+# HTTP statuses worth retrying (rate limits and transient server errors)
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# How often a waiting caller checks its cancel event
+CANCEL_POLL_INTERVAL = 0.05
+
+def _describe(error):
+    """Readable description of an exception (timeouts have an empty message)"""
+    return str(error) or type(error).__name__
+
+class TransportError(Exception):
+    """Request failed after all retries or ran past its deadline"""
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+class RequestCancelled(TransportError):
+    """The caller gave up on the request (e.g. another provider answered first)"""
+
+class AsyncLLMTransport:
+    """Async HTTP client for JSON/SSE LLM APIs, usable from synchronous code"""
+
+    def __init__(self, base_url, headers=None, timeout=None, max_retries=None, hedge=None, name="llm"):
+        """
+        Initialize transport and start its event loop thread
+
+        Args:
+            base_url: API base URL (e.g. https://api.groq.com/openai/v1)
+            headers: Headers sent with every request (auth, versions)
+            timeout: Per-attempt timeout in seconds
+            max_retries: Retries after the first attempt
+            hedge: Send a second request when the first is slower than p95
+            name: Name used in logs and the loop thread
+        """
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx is required for the LLM transport")
+
+        self.base_url = base_url.rstrip("/")
+        self.headers = dict(headers or {})
+        self.timeout = timeout if timeout is not None else Settings.LLM_TIMEOUT
+        self.max_retries = max_retries if max_retries is not None else Settings.LLM_MAX_RETRIES
+        self.hedge = hedge if hedge is not None else Settings.LLM_HEDGE_REQUESTS
+        self.name = name
+
+        # Recent successful request latencies (seconds) for the hedge delay
+        self.latencies = deque(maxlen=200)
+        self.hedges_sent = 0
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True, name=f"{name}-transport")
+        self._thread.start()
+        self.client = self._call(self._create_client())
+
+    def _run_loop(self):
+        """Event loop thread body"""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def _create_client(self):
+        """Create the pooled client inside the transport's loop"""
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 3.0)),
+            limits=httpx.Limits(
+                max_connections=Settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=Settings.LLM_MAX_CONNECTIONS,
+                keepalive_expiry=60.0
+            )
+        )
+
+    def _call(self, coroutine, timeout=None, cancel=None):
+        """
+        Run a coroutine on the transport loop and wait for its result
+
+        Args:
+            coroutine: Coroutine to run
+            timeout: Seconds to wait
+            cancel: threading.Event; setting it abandons the request
+
+        Raises:
+            RequestCancelled: cancel was set before the result arrived
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            if cancel is None:
+                return future.result(timeout)
+
+            give_up = time.monotonic() + timeout if timeout is not None else None
+            while True:
+                if cancel.is_set():
+                    raise RequestCancelled(f"{self.name} request cancelled")
+                wait = CANCEL_POLL_INTERVAL
+                if give_up is not None:
+                    wait = min(wait, max(0.0, give_up - time.monotonic()))
+                try:
+                    return future.result(wait)
+                except concurrent.futures.TimeoutError:
+                    if give_up is not None and time.monotonic() >= give_up:
+                        raise
+        except BaseException:
+            future.cancel()
+            raise
+
+    def latency_percentile(self, percentile):
+        """Get a percentile of recent request latency in seconds (None without data)"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def hedge_delay(self):
+        """How long to wait for the first request before hedging"""
+        if len(self.latencies) < Settings.LLM_HEDGE_MIN_SAMPLES:
+            return Settings.LLM_HEDGE_DEFAULT_DELAY
+        return self.latency_percentile(95)
+
+    @staticmethod
+    def _backoff(attempt, retry_after=None):
+        """Full-jitter exponential backoff (honours Retry-After when given)"""
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(Settings.LLM_RETRY_MAX_DELAY, Settings.LLM_RETRY_BASE_DELAY * 2 ** attempt))
+
+    @staticmethod
+    def _retry_after(response):
+        """Parse a Retry-After header in seconds"""
+        try:
+            return float(response.headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+
+    async def _post_once(self, path, payload, deadline):
+        """One POST attempt bounded by the deadline"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TransportError("Deadline exceeded")
+
+        started = time.monotonic()
+        response = await asyncio.wait_for(
+            self.client.post(path, json=payload),
+            timeout=min(remaining, self.timeout)
+        )
+        if response.status_code >= 400:
+            raise TransportError(
+                f"HTTP {response.status_code}: {response.text[:200]}",
+                status=response.status_code,
+                retry_after=self._retry_after(response)
+            )
+
+        self.latencies.append(time.monotonic() - started)
+        return response.json()
+
+    async def _post_with_retries(self, path, payload, deadline):
+        """POST with jittered retries until success, a fatal error or the deadline"""
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                return await self._post_once(path, payload, deadline)
+            except TransportError as e:
+                if e.status is not None and e.status not in RETRYABLE_STATUS:
+                    raise
+                error = e
+                retry_after = e.retry_after
+            except (asyncio.TimeoutError, httpx.TransportError) as e:
+                error = e
+
+            if attempt >= self.max_retries:
+                raise TransportError(f"{self.name} request failed after {attempt + 1} attempts: {_describe(error)}")
+
+            delay = self._backoff(attempt, retry_after)
+            if time.monotonic() + delay >= deadline:
+                raise TransportError(f"{self.name} deadline exceeded: {_describe(error)}")
+
+            logger.warning(f"{self.name} request failed ({_describe(error)}); retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _post_hedged(self, path, payload, deadline):
+        """Send a backup request if the first hasn't answered by the p95 latency"""
+        first = asyncio.ensure_future(self._post_with_retries(path, payload, deadline))
+        delay = min(self.hedge_delay(), max(0.0, deadline - time.monotonic()))
+
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        self.hedges_sent += 1
+        logger.debug(f"{self.name} request slower than {delay:.2f}s - sending hedge")
+        second = asyncio.ensure_future(self._post_with_retries(path, payload, deadline))
+        pending = {first, second}
+        error = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def post_json(self, path, payload, deadline=None, hedge=None, cancel=None):
+        """
+        POST a JSON payload and return the decoded response
+
+        Args:
+            path: Path relative to the base URL
+            payload: JSON-serializable request body
+            deadline: Total seconds allowed including retries (default: Settings.LLM_REQUEST_DEADLINE)
+            hedge: Override the transport's hedging setting
+            cancel: threading.Event; setting it aborts the in-flight request
+
+        Returns:
+            dict: Decoded JSON response
+        """
+        if deadline is None:
+            deadline = Settings.LLM_REQUEST_DEADLINE
+        absolute_deadline = time.monotonic() + deadline
+        use_hedge = self.hedge if hedge is None else hedge
+
+        if use_hedge:
+            coroutine = self._post_hedged(path, payload, absolute_deadline)
+        else:
+            coroutine = self._post_with_retries(path, payload, absolute_deadline)
+
+        try:
+            return self._call(coroutine, timeout=deadline + 1.0, cancel=cancel)
+        except (asyncio.TimeoutError, TimeoutError, concurrent.futures.TimeoutError):
+            raise TransportError(f"{self.name} deadline exceeded") from None
+
+    async def _stream_events(self, path, payload, deadline, sink):
+        """Stream server-sent events into a thread-safe queue"""
+        attempt = 0
+        while True:
+            received_any = False
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TransportError("Deadline exceeded")
+
+                started = time.monotonic()
+                async with self.client.stream("POST", path, json=payload) as response:
+                    if response.status_code >= 400:
+                        body = (await response.aread()).decode("utf-8", "replace")
+                        raise TransportError(f"HTTP {response.status_code}: {body[:200]}", status=response.status_code)
+
+                    lines = response.aiter_lines()
+                    while True:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TransportError("Deadline exceeded")
+                        try:
+                            line = await asyncio.wait_for(lines.__anext__(), timeout=min(remaining, self.timeout))
+                        except StopAsyncIteration:
+                            break
+
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+                        if not received_any:
+                            self.latencies.append(time.monotonic() - started)
+                        received_any = True
+                        sink.put(("event", json.loads(data)))
+
+                sink.put(("done", None))
+                return
+
+            except (TransportError, asyncio.TimeoutError, httpx.TransportError) as e:
+                status = getattr(e, "status", None)
+                fatal = status is not None and status not in RETRYABLE_STATUS
+                # Once events were delivered the stream can't be replayed
+                if fatal or received_any or attempt >= self.max_retries:
+                    sink.put(("error", TransportError(f"{self.name} stream failed: {_describe(e)}", status=status)))
+                    return
+
+                delay = self._backoff(attempt)
+                if time.monotonic() + delay >= deadline:
+                    sink.put(("error", TransportError(f"{self.name} deadline exceeded: {_describe(e)}")))
+                    return
+
+                logger.warning(f"{self.name} stream failed ({_describe(e)}); retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+            except Exception as e:
+                sink.put(("error", e))
+                return
+
+    def stream_events(self, path, payload, deadline=None):
+        """
+        POST a streaming request and yield decoded server-sent events
+
+        Args:
+            path: Path relative to the base URL
+            payload: JSON-serializable request body
+            deadline: Total seconds allowed (default: Settings.LLM_REQUEST_DEADLINE)
+
+        Yields:
+            dict: Each decoded `data:` event
+        """
+        if deadline is None:
+            deadline = Settings.LLM_REQUEST_DEADLINE
+        absolute_deadline = time.monotonic() + deadline
+        sink = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._stream_events(path, payload, absolute_deadline, sink),
+            self.loop
+        )
+
+        try:
+            while True:
+                remaining = absolute_deadline - time.monotonic() + 1.0
+                try:
+                    kind, value = sink.get(timeout=max(0.01, remaining))
+                except queue.Empty:
+                    raise TransportError(f"{self.name} deadline exceeded") from None
+
+                if kind == "event":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            future.cancel()
+
+    def close(self):
+        """Close the connection pool and stop the loop"""
+        try:
+            self._call(self.client.aclose(), timeout=5)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+class OpenAICompatibleChat:
+    """Chat completions over an OpenAI-compatible API (Groq, OpenAI)"""
+
+    def __init__(self, transport, model):
+        """
+        Initialize chat client
+
+        Args:
+            transport: AsyncLLMTransport pointed at the API base URL
+            model: Model name
+        """
+        self.transport = transport
+        self.model = model
+
+    def complete(self, messages, temperature=0.2, max_tokens=150, deadline=None, cancel=None):
+        """
+        Get a complete chat response
+
+        Args:
+            cancel: threading.Event that abandons the request when set
+
+        Returns:
+            str: Assistant message content
+        """
+        response = self.transport.post_json("/chat/completions", {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }, deadline=deadline, cancel=cancel)
+        return response["choices"][0]["message"]["content"] or ""
+
+    def stream(self, messages, temperature=0.2, max_tokens=150, deadline=None):
+        """
+        Stream a chat response
+
+        Yields:
+            str: Content deltas as they arrive
+        """
+        events = self.transport.stream_events("/chat/completions", {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True
+        }, deadline=deadline)
+
+        for event in events:
+            choices = event.get("choices") or []
+            if choices:
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
@@ -0,0 +1,62 @@
+"""
+PCM Helpers
+NumPy versions of the audioop functions we used (audioop was removed from the standard library in Python 3.13)
+
+Samples are little-endian signed integers of 1-4 bytes, as in sr.AudioData.
+"""
+import numpy as np
+
+_DTYPES = {1: np.int8, 2: "<i2", 4: "<i4"}
+
+def to_samples(data, sample_width):
+    """PCM bytes -> int32 samples scaled to the full 32-bit range"""
+    data = bytes(data[:len(data) - len(data) % sample_width])
+    if sample_width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        return (raw[:, 0] << 8) | (raw[:, 1] << 16) | (raw[:, 2] << 24)
+    samples = np.frombuffer(data, dtype=_DTYPES[sample_width]).astype(np.int32)
+    return samples << (32 - 8 * sample_width)
+
+def from_samples(samples, sample_width):
+    """int32 samples scaled to the full 32-bit range -> PCM bytes"""
+    samples = np.asarray(samples, dtype=np.int32) >> (32 - 8 * sample_width)
+    if sample_width == 3:
+        raw = np.empty((len(samples), 3), dtype=np.uint8)
+        for byte in range(3):
+            raw[:, byte] = (samples >> (8 * byte)) & 0xFF
+        return raw.tobytes()
+    return samples.astype(_DTYPES[sample_width]).tobytes()
+
+def rms(data, sample_width):
+    """Root mean square of the samples, in sample units (like audioop.rms)"""
+    samples = to_samples(data, sample_width)
+    if not len(samples):
+        return 0
+    scaled = samples.astype(np.float64) / (1 << (32 - 8 * sample_width))
+    return int(np.sqrt(np.mean(scaled * scaled)))
+
+def convert_width(data, sample_width, new_width):
+    """Change bytes per sample (like audioop.lin2lin)"""
+    if sample_width == new_width:
+        return bytes(data)
+    return from_samples(to_samples(data, sample_width), new_width)
+
+def to_mono(data, sample_width, channels):
+    """Average interleaved channels into one"""
+    if channels == 1:
+        return bytes(data)
+    samples = to_samples(data, sample_width)
+    samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels)
+    return from_samples(samples.astype(np.int64).mean(axis=1), sample_width)
+
+def resample(data, sample_width, rate, new_rate):
+    """Change the sample rate of mono audio by linear interpolation (like audioop.ratecv)"""
+    if rate == new_rate:
+        return bytes(data)
+    samples = to_samples(data, sample_width)
+    if not len(samples):
+        return b""
+    count = int(round(len(samples) * new_rate / rate))
+    positions = np.arange(count) * (rate / new_rate)
+    resampled = np.interp(positions, np.arange(len(samples)), samples.astype(np.float64))
+    return from_samples(np.round(resampled), sample_width)
@@ -0,0 +1,190 @@
+"""
+Phonetic Index - Sound-Alike Keyword Lookup
+Resolves misrecognized keywords ("note bad", "ex cell", "get hub") without the LLM
+"""
+from collections import namedtuple
+from core.common_words import COMMON_WORDS
+
+PhoneticMatch = namedtuple("PhoneticMatch", ["keyword", "heard", "payload", "similarity", "exact_key"])
+
+# Soundex-style consonant classes, merged further where ASR confuses voicing
+# (b/p, d/t, g/k, s/z, f/v all share a code)
+_CODES = {}
+for _letters, _code in (("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"), ("l", "4"), ("mn", "5"), ("r", "6")):
+    for _letter in _letters:
+        _CODES[_letter] = _code
+
+# Shortest compacted text worth matching phonetically ("cam" vs "can" is noise)
+MIN_KEY_TEXT_LENGTH = 4
+
+# Keywords this short are one letter away from plenty of real words ("date" / "data" /
+# "gate", "word" / "work" / "world"), so they need a near-identical spelling
+SHORT_KEYWORD_LENGTH = 4
+SHORT_KEYWORD_MIN_SIMILARITY = 0.9
+
+# Runs made only of everyday words ("what day") were probably heard right; a sound-alike
+# keyword has to be closer than usual to override them
+COMMON_SPAN_MIN_SIMILARITY = 0.8
+
+def compact(text):
+    """Lowercase and drop everything but letters and digits ("Ex Cell" -> "excell")"""
+    return "".join(char for char in text.lower() if char.isalnum())
+
+def phonetic_key(text):
+    """
+    Full-length Soundex-style key of compacted text
+
+    Vowels and h/w/y are dropped and repeated codes collapse, so word breaks
+    and doubled letters don't matter. A leading vowel is kept as "0".
+    """
+    text = compact(text)
+    if not text:
+        return ""
+
+    key = ["0"] if text[0] in "aeiou" else []
+    previous = None
+    for char in text:
+        code = _CODES.get(char, char if char.isdigit() else None)
+        if code is None:
+            continue
+        if code != previous:
+            key.append(code)
+        previous = code
+    return "".join(key)
+
+def _deletions(key, max_distance):
+    """Every variant of key with up to max_distance characters removed (SymSpell)"""
+    variants = {key}
+    frontier = {key}
+    for _ in range(max_distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+def edit_distance(a, b):
+    """Levenshtein distance between two short strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        previous = current
+    return previous[-1]
+
+def similarity(a, b):
+    """Spelling similarity in [0, 1] from edit distance"""
+    if not a and not b:
+        return 1.0
+    return 1.0 - edit_distance(a, b) / max(len(a), len(b))
+
+class PhoneticIndex:
+    """
+    Keyword lookup by sound
+
+    Each keyword is indexed under every deletion variant of its phonetic key,
+    so a lookup is a handful of dict hits regardless of catalog size. Candidates
+    are verified by spelling similarity of the compacted text.
+    """
+
+    def __init__(self, patterns, max_key_distance=1, min_similarity=0.75, max_window=3, common_words=COMMON_WORDS):
+        """
+        Build the index
+
+        Args:
+            patterns: Iterable of (keyword, payload) pairs
+            max_key_distance: Phonetic key edits tolerated by the buckets
+            min_similarity: Minimum spelling similarity of a match
+            max_window: Longest run of spoken words compared against a keyword
+            common_words: Words taken at face value when heard on their own
+        """
+        self.max_key_distance = max_key_distance
+        self.min_similarity = min_similarity
+        self.max_window = max_window
+        self.common_words = common_words
+
+        self.keywords = []
+        self._buckets = {}
+
+        for keyword, payload in patterns:
+            text = compact(keyword)
+            if len(text) < MIN_KEY_TEXT_LENGTH:
+                continue
+            key = phonetic_key(text)
+            index = len(self.keywords)
+            self.keywords.append((keyword, text, key, payload))
+            for variant in _deletions(key, max_key_distance):
+                self._buckets.setdefault(variant, []).append(index)
+
+    @classmethod
+    def from_catalog(cls, snapshot, **options):
+        """Build an index over every keyword of a CatalogSnapshot (payload: CatalogEntry)"""
+        return cls(snapshot.keywords, **options)
+
+    def lookup(self, heard, min_similarity=None):
+        """
+        Find keywords that sound like a piece of text
+
+        Args:
+            heard: Spoken text (one or more words)
+            min_similarity: Override the index's minimum similarity
+
+        Returns:
+            list: PhoneticMatch tuples, best first
+        """
+        min_similarity = self.min_similarity if min_similarity is None else min_similarity
+        text = compact(heard)
+        if len(text) < MIN_KEY_TEXT_LENGTH:
+            return []
+
+        key = phonetic_key(text)
+        candidates = set()
+        for variant in _deletions(key, self.max_key_distance):
+            candidates.update(self._buckets.get(variant, ()))
+
+        matches = []
+        for index in candidates:
+            keyword, keyword_text, keyword_key, payload = self.keywords[index]
+            score = similarity(text, keyword_text)
+            required = min_similarity
+            if len(keyword_text) <= SHORT_KEYWORD_LENGTH:
+                required = max(required, SHORT_KEYWORD_MIN_SIMILARITY)
+            if score >= required:
+                matches.append(PhoneticMatch(keyword, heard, payload, score, keyword_key == key))
+
+        matches.sort(key=lambda match: (not match.exact_key, -match.similarity, -len(match.keyword)))
+        return matches
+
+    def search(self, utterance):
+        """
+        Find sound-alike keywords anywhere in an utterance
+
+        Every run of 1..max_window consecutive words is looked up, so split
+        ("ex cell") and merged recognitions both resolve. A single everyday
+        word is never reinterpreted as a different keyword, and a run of them
+        only for a close match.
+
+        Args:
+            utterance: Transcript to scan
+
+        Returns:
+            list: PhoneticMatch tuples, best first
+        """
+        words = utterance.lower().split()
+        matches = []
+        for start in range(len(words)):
+            for end in range(start + 1, min(len(words), start + self.max_window) + 1):
+                span = words[start:end]
+                min_similarity = None
+                if all(compact(word) in self.common_words for word in span):
+                    # A lone everyday word only matches a keyword spelled the same way
+                    min_similarity = 1.0 if len(span) == 1 else max(self.min_similarity, COMMON_SPAN_MIN_SIMILARITY)
+                matches.extend(self.lookup(" ".join(span), min_similarity))
+
+        matches.sort(key=lambda match: (not match.exact_key, -match.similarity, -len(match.heard)))
+        return matches
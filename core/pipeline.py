@@ -0,0 +1,150 @@
+"""
+Pipeline - Staged Command Processing
+Worker stages connected by bounded queues, so listening never waits for classification or actions
+"""
+import time
+import queue
+import threading
+from config.settings import Settings
+from utils.logger import logger
+
+# Passed down the pipeline after the source's last item
+END = object()
+
+class StageStats:
+    """Work and wait time of one stage"""
+
+    def __init__(self):
+        self.processed = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0   # Waiting for room in the next stage's queue
+        self.max_backlog = 0
+
+    def as_dict(self):
+        return {
+            "processed": self.processed,
+            "busy_s": round(self.busy_seconds, 3),
+            "blocked_s": round(self.blocked_seconds, 3),
+            "max_backlog": self.max_backlog
+        }
+
+class Pipeline:
+    """
+    Source -> stages -> sink, each on its own thread, joined by bounded queues
+
+    A full queue blocks the stage feeding it, so a slow stage throttles the
+    ones before it instead of letting work pile up, and throughput is set by
+    the slowest stage rather than the sum of all of them. Items keep their
+    order (one worker per stage). A handler returning None drops the item.
+    """
+
+    def __init__(self, source, stages, sink, queue_size=None):
+        """
+        Initialize pipeline
+
+        Args:
+            source: (name, callable(emit)) producing items until it returns
+            stages: [(name, callable(item) -> item or None)] in order
+            sink: (name, callable(item)) run on the thread calling run()
+            queue_size: Items each queue holds (default: Settings.PIPELINE_QUEUE_SIZE)
+        """
+        size = queue_size or Settings.PIPELINE_QUEUE_SIZE
+        self.source = source
+        self.stages = list(stages)
+        self.sink = sink
+        self.queues = [queue.Queue(maxsize=size) for _ in range(len(self.stages) + 1)]
+        self.stats = {name: StageStats() for name, _ in [source] + self.stages + [sink]}
+        self.running = False
+
+    def _put(self, name, index, item):
+        """Hand an item to queue index, recording time spent waiting for room"""
+        target = self.queues[index]
+        started = time.monotonic()
+        while self.running:
+            try:
+                target.put(item, timeout=0.5)
+                break
+            except queue.Full:
+                continue
+        stats = self.stats[name]
+        stats.blocked_seconds += time.monotonic() - started
+        stats.max_backlog = max(stats.max_backlog, target.qsize())
+
+    def _get(self, index):
+        """Next item from queue index (END once stopped)"""
+        while self.running:
+            try:
+                return self.queues[index].get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return END
+
+    def _run_source(self):
+        name, produce = self.source
+
+        def emit(item):
+            self.stats[name].processed += 1
+            self._put(name, 0, item)
+
+        try:
+            produce(emit)
+        except Exception as e:
+            logger.error(f"Pipeline source '{name}' failed: {e}")
+        finally:
+            self._put(name, 0, END)
+
+    def _run_stage(self, index):
+        name, handler = self.stages[index]
+        stats = self.stats[name]
+        while True:
+            item = self._get(index)
+            if item is END:
+                self._put(name, index + 1, END)
+                return
+
+            started = time.monotonic()
+            try:
+                result = handler(item)
+            except Exception as e:
+                logger.error(f"Pipeline stage '{name}' failed: {e}")
+                result = None
+            stats.busy_seconds += time.monotonic() - started
+            stats.processed += 1
+
+            if result is not None:
+                self._put(name, index + 1, result)
+
+    def run(self):
+        """
+        Start the source and stages, and run the sink on this thread
+
+        Returns when the source is exhausted and every item has reached the
+        sink, or when stop() is called.
+        """
+        self.running = True
+        threading.Thread(target=self._run_source, daemon=True, name=f"stage-{self.source[0]}").start()
+        for index, (name, _) in enumerate(self.stages):
+            threading.Thread(target=self._run_stage, args=(index,), daemon=True, name=f"stage-{name}").start()
+
+        name, handler = self.sink
+        stats = self.stats[name]
+        while self.running:
+            item = self._get(len(self.stages))
+            if item is END:
+                break
+            started = time.monotonic()
+            try:
+                handler(item)
+            except Exception as e:
+                logger.error(f"Pipeline stage '{name}' failed: {e}")
+            stats.busy_seconds += time.monotonic() - started
+            stats.processed += 1
+        self.running = False
+
+    def stop(self):
+        """Stop every stage (items still queued are dropped)"""
+        self.running = False
+
+    def get_statistics(self):
+        """Per-stage counts, busy time and time blocked on the next queue"""
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
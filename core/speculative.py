@@ -0,0 +1,150 @@
+"""
+Speculative Classifier
+Classifies interim transcripts while the user is still speaking
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from core.classification_cache import normalize_command
+from utils.logger import logger
+
+# Identical interim transcripts in a row before a partial counts as stable
+STABLE_READINGS = 2
+
+class SpeculativeClassifier:
+    """
+    Run the classifier on stable partial transcripts ahead of the final one
+
+    A speculation is confirmed when the final transcript is the same text,
+    or extends it and the local tiers agree on the action. Otherwise it is
+    discarded and the final transcript is classified normally.
+    """
+
+    def __init__(self, classifier):
+        """
+        Initialize speculative classifier
+
+        Args:
+            classifier: CommandClassifier used for both speculative and final classification
+        """
+        self.classifier = classifier
+        self.stats = {"speculated": 0, "confirmed": 0, "discarded": 0}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculate")
+        self.reset()
+
+    def reset(self):
+        """Start a new command"""
+        with self._lock:
+            self._last_partial = None
+            self._readings = 0
+            self._speculation = None
+            self._closed = False
+
+    def feed_partial(self, text):
+        """
+        Report an interim transcript (called from the recognition thread)
+
+        Args:
+            text: Transcript of the audio captured so far
+        """
+        key = normalize_command(text or "")
+        if not key:
+            return
+
+        with self._lock:
+            if self._closed:
+                return
+
+            if key == self._last_partial:
+                self._readings += 1
+            else:
+                self._last_partial = key
+                self._readings = 1
+
+            if self._readings < STABLE_READINGS:
+                return
+            if self._speculation and self._speculation[0] == key:
+                return
+
+            future = self._executor.submit(self.classifier.classify, text)
+            self._speculation = (key, future)
+            self.stats["speculated"] += 1
+
+        logger.debug(f"Speculatively classifying: {text}")
+
+    def detach(self):
+        """
+        Close the current command and hand over its speculation
+
+        Lets the next command start speculating before this one is resolved
+        (see resolve_detached).
+
+        Returns:
+            tuple: Opaque speculation, or None if nothing was speculated
+        """
+        with self._lock:
+            self._closed = True
+            speculation = self._speculation
+            self._speculation = None
+        return speculation
+
+    def resolve(self, final_text):
+        """
+        Classify the final transcript, reusing the speculation when it still holds
+
+        Args:
+            final_text: Final transcript of the command
+
+        Returns:
+            dict: Classification result
+        """
+        return self.resolve_detached(self.detach(), final_text)
+
+    def resolve_detached(self, speculation, final_text):
+        """
+        Classify a final transcript against a speculation taken with detach()
+
+        Args:
+            speculation: Value returned by detach()
+            final_text: Final transcript of the command
+
+        Returns:
+            dict: Classification result
+        """
+        if speculation:
+            result = self._confirm(speculation, final_text)
+            # Runs on the pipeline's classify thread while the listen thread speculates
+            with self._lock:
+                self.stats["confirmed" if result is not None else "discarded"] += 1
+            if result is not None:
+                print(f"⚡ Speculative classification confirmed: {result['intent']} → {result['action']}")
+                return result
+            logger.debug(f"Speculation discarded for: {final_text}")
+
+        return self.classifier.classify(final_text)
+
+    def _confirm(self, speculation, final_text):
+        """Get the speculative result if it applies to the final transcript, else None"""
+        key, future = speculation
+        final_key = normalize_command(final_text)
+
+        if final_key != key and not final_key.startswith(key + " "):
+            return None
+
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning(f"Speculative classification failed: {e}")
+            return None
+
+        if final_key == key:
+            return result
+
+        # The user kept talking - only reuse the speculation if the extra words
+        # don't change what the local tiers think the command is
+        confident, best_local = self.classifier._classify_locally(final_text)
+        if confident:
+            return confident
+        if best_local and (best_local["intent"], best_local["action"]) == (result["intent"], result["action"]):
+            return result
+        return None
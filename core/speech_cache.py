@@ -0,0 +1,223 @@
+"""
+Speech Cache
+Synthesized phrases kept as audio, so repeated replies play without running the TTS engine again
+"""
+import os
+import json
+import time
+import wave
+import atexit
+import hashlib
+import threading
+from collections import OrderedDict
+from utils.logger import logger
+from utils.helpers import load_json, save_json
+
+INDEX_NAME = "index.json"
+
+def cache_key(text, voice, rate, volume):
+    """Key of one rendering: the same text in another voice, rate or volume is a different clip"""
+    return hashlib.sha1(json.dumps([text, voice, rate, volume]).encode("utf-8")).hexdigest()
+
+class Clip:
+    """Rendered speech held in memory as PCM"""
+
+    def __init__(self, frames, sample_rate, sample_width, channels):
+        self.frames = frames
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.channels = channels
+
+    @classmethod
+    def from_wav(cls, path):
+        """Read a WAV file (raises wave.Error if the engine wrote another format)"""
+        with wave.open(path, "rb") as f:
+            return cls(f.readframes(f.getnframes()), f.getframerate(), f.getsampwidth(), f.getnchannels())
+
+class SpeechCache:
+    """
+    Rendered phrases as WAV files on disk and PCM in memory
+
+    Pinned clips (the fixed phrases pre-rendered at startup) are never
+    evicted. Everything else is an LRU bounded by total size on disk; a clip
+    is read into memory on first use and leaves memory when it is evicted.
+    """
+
+    def __init__(self, directory, max_bytes, save_interval=5.0):
+        """
+        Initialize cache and load the index from disk
+
+        Args:
+            directory: Where the WAV files and index live
+            max_bytes: Disk budget for unpinned clips
+            save_interval: Minimum seconds between index writes
+        """
+        self.directory = directory
+        self.index_file = os.path.join(directory, INDEX_NAME)
+        self.max_bytes = max_bytes
+        self.save_interval = save_interval
+
+        self.entries = OrderedDict()   # key -> {"file", "bytes", "text"} in LRU order
+        self.clips = {}
+        self.pinned = set()
+        self.hits = 0
+        self.misses = 0
+
+        self._dirty = False
+        self._last_save = 0.0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+        atexit.register(self.flush)
+
+    def _load(self):
+        """Load the index, skipping clips whose file has gone"""
+        for key, item in load_json(self.index_file, default={}).get("entries", []):
+            if os.path.exists(os.path.join(self.directory, item["file"])):
+                self.entries[key] = item
+        logger.debug(f"Speech cache loaded: {len(self.entries)} clips")
+
+    def __contains__(self, key):
+        """Whether a rendering is stored (without counting a hit or miss)"""
+        with self._lock:
+            return key in self.entries
+
+    def path_for(self, key):
+        """Where the clip for key is (or will be) stored"""
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def render_path(self, key):
+        """Where the engine should write a new rendering before put() takes it in"""
+        return os.path.join(self.directory, f"{key}.part.wav")
+
+    def get(self, key, pin=False):
+        """
+        Look up a clip the assistant is about to say, counting a hit or miss
+
+        Args:
+            key: cache_key() of the rendering
+            pin: Keep it from being evicted
+
+        Returns:
+            Clip: The audio, or None if it hasn't been rendered
+        """
+        clip = self.load(key, pin=pin)
+        with self._lock:
+            if clip is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return clip
+
+    def load(self, key, pin=False):
+        """
+        Look up a clip without counting it (for pre-rendering and background renders)
+
+        Args:
+            key: cache_key() of the rendering
+            pin: Keep it from being evicted
+
+        Returns:
+            Clip: The audio, read into memory if it wasn't already, or None
+        """
+        with self._lock:
+            item = self.entries.get(key)
+            if item is None:
+                return None
+
+            clip = self.clips.get(key)
+            if clip is None:
+                try:
+                    clip = Clip.from_wav(os.path.join(self.directory, item["file"]))
+                except (OSError, EOFError, wave.Error) as e:
+                    logger.warning(f"Dropping unreadable cached speech for '{item['text']}': {e}")
+                    del self.entries[key]
+                    self._dirty = True
+                    return None
+                self.clips[key] = clip
+
+            self.entries.move_to_end(key)
+            if pin:
+                self.pinned.add(key)
+            self._dirty = True
+        return clip
+
+    def put(self, key, text, path, pin=False):
+        """
+        Store a freshly rendered WAV file
+
+        Args:
+            key: cache_key() of the rendering
+            text: The phrase (kept in the index for inspection)
+            path: WAV file the engine wrote; moved into the cache
+            pin: Keep it from being evicted
+
+        Returns:
+            Clip: The audio
+
+        Raises:
+            wave.Error: The file is not a WAV file
+        """
+        clip = Clip.from_wav(path)
+        target = self.path_for(key)
+        os.replace(path, target)
+
+        with self._lock:
+            self.entries[key] = {"file": os.path.basename(target), "bytes": os.path.getsize(target), "text": text}
+            self.entries.move_to_end(key)
+            self.clips[key] = clip
+            if pin:
+                self.pinned.add(key)
+            self._evict()
+            self._dirty = True
+
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.flush()
+        return clip
+
+    def _evict(self):
+        """Drop least recently used unpinned clips until they fit the budget"""
+        unpinned = [key for key in self.entries if key not in self.pinned]
+        total = sum(self.entries[key]["bytes"] for key in unpinned)
+        for key in unpinned:
+            if total <= self.max_bytes:
+                break
+            item = self.entries.pop(key)
+            self.clips.pop(key, None)
+            total -= item["bytes"]
+            try:
+                os.remove(os.path.join(self.directory, item["file"]))
+            except OSError:
+                pass
+            logger.debug(f"Evicted cached speech: {item['text']}")
+
+    def flush(self):
+        """Write the index to disk if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"entries": [[key, item] for key, item in self.entries.items()]}
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+        # Write to a temp file first so a crash never leaves half an index behind
+        temp_path = self.index_file + ".tmp"
+        if save_json(temp_path, data):
+            try:
+                os.replace(temp_path, self.index_file)
+            except OSError as e:
+                logger.error(f"Could not save speech cache index: {e}")
+
+    def get_statistics(self):
+        """Get clip counts, disk usage and hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            "clips": len(self.entries),
+            "pinned": len(self.pinned),
+            "in_memory": len(self.clips),
+            "bytes": sum(item["bytes"] for item in self.entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
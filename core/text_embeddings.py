@@ -0,0 +1,90 @@
+"""
+Text Embeddings
+Shared sentence encoder plus a dependency-free hashing fallback
+"""
+import zlib
+import importlib.util
+from config.settings import Settings
+from utils.logger import logger
+from utils.service_registry import registry
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+class HashingEncoder:
+    """Character n-gram hashing encoder (no model download, no network)"""
+
+    def __init__(self, dimensions=1024, ngram_sizes=(2, 3, 4)):
+        """
+        Initialize encoder
+
+        Args:
+            dimensions: Size of the hashed feature space
+            ngram_sizes: Character n-gram lengths to hash
+        """
+        self.dimensions = dimensions
+        self.ngram_sizes = ngram_sizes
+
+    def _features(self, text):
+        """Hashed feature indices of a text (word unigrams + character n-grams)"""
+        words = text.lower().split()
+        features = [zlib.crc32(f"w:{word}".encode("utf-8")) for word in words]
+
+        for word in words:
+            padded = f" {word} "
+            for size in self.ngram_sizes:
+                for i in range(len(padded) - size + 1):
+                    features.append(zlib.crc32(padded[i:i + size].encode("utf-8")))
+
+        return [feature % self.dimensions for feature in features]
+
+    def encode(self, texts, normalize_embeddings=True):
+        """
+        Encode texts into a matrix
+
+        Args:
+            texts: String or list of strings
+            normalize_embeddings: L2-normalize each row
+
+        Returns:
+            numpy.ndarray: (len(texts), dimensions) float32 matrix (1-D for a single string)
+        """
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            indices = self._features(text)
+            if indices:
+                matrix[row] = np.bincount(indices, minlength=self.dimensions)
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.maximum(norms, 1e-12)
+
+        return matrix[0] if single else matrix
+
+def _load_sentence_model():
+    """Load the SentenceTransformer model shared by the classifier and vector store"""
+    from sentence_transformers import SentenceTransformer
+    logger.info(f"Loading sentence embedding model: {Settings.EMBEDDING_MODEL}")
+    return SentenceTransformer(Settings.EMBEDDING_MODEL)
+
+def _load_intent_encoder():
+    """Pick the best available encoder for intent classification"""
+    if SENTENCE_TRANSFORMERS_AVAILABLE:
+        try:
+            return registry.get("sentence_model")
+        except Exception as e:
+            logger.warning(f"Sentence model unavailable, using hashing encoder: {e}")
+    return HashingEncoder()
+
+# Global encoder instances
+sentence_model = registry.register("sentence_model", _load_sentence_model)
+intent_encoder = registry.register("intent_encoder", _load_intent_encoder)
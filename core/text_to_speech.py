@@ -2,80 +2,327 @@
 Text-to-Speech Engine
 Provides voice feedback to the user
 """
+import os
+import time
+import wave
+import queue
+import itertools
+import threading
+import importlib.util
 import pyttsx3
 from config.settings import Settings
+from core.speech_cache import SpeechCache, cache_key
 from utils.logger import logger
+from utils.service_registry import registry
+
+# Utterance priorities (lower is spoken first)
+PRIORITY_URGENT = 0   # Prompts the user is waiting on
+PRIORITY_NORMAL = 1   # Replies and progress messages
+PRIORITY_BACKGROUND = 2   # Pre-rendering, done when nothing is waiting to be said
+
+PYAUDIO_AVAILABLE = importlib.util.find_spec("pyaudio") is not None
+
+# Cached clips are played in blocks this long, so an interrupt stops them promptly
+PLAYBACK_BLOCK_SECONDS = 0.05
+
+class Utterance:
+    """One queued message"""
+
+    def __init__(self, text, priority, seq, key, max_age, render_only=False, pin=False):
+        self.text = text
+        self.priority = priority
+        self.seq = seq
+        self.key = key
+        self.deadline = time.monotonic() + max_age if max_age else None
+        self.render_only = render_only
+        self.pin = pin
+        self.done = threading.Event()
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
 
 class TextToSpeech:
-    """Handle text-to-speech functionality"""
-    
+    """
+    Handle text-to-speech functionality
+
+    The pyttsx3 engine lives on its own worker thread (SAPI voices are COM
+    objects tied to the thread that created them), which speaks utterances
+    from a priority queue. speak() only queues, so replies never hold up the
+    command loop. A message is skipped if it waited past its max age or a
+    newer one with the same key was queued behind it, and interrupt() cuts
+    off whatever is playing when the user starts a new command.
+
+    With the speech cache on, a phrase is spoken live the first time and
+    synthesized to a WAV file in the background afterwards, then played from
+    memory whenever it comes up again (see core.speech_cache). Fixed phrases
+    are rendered ahead of time by prerender().
+    """
+
     def __init__(self):
         """Initialize TTS engine"""
-        try:
-            self.engine = pyttsx3.init()
-            self._configure_voice()
+        self.engine = None
+        self.cache = None
+        self.stats = {"spoken": 0, "coalesced": 0, "expired": 0, "interrupted": 0}
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count(1)
+        self._latest = {}          # key -> seq of the newest utterance queued with it
+        self._cutoff = 0           # Utterances up to this seq were interrupted
+        self._current = None
+        self._lock = threading.Lock()
+
+        if not Settings.ENABLE_TTS:
+            logger.info("Text-to-Speech disabled; replies are printed only")
+            return
+
+        ready = threading.Event()
+        threading.Thread(target=self._run, args=(ready,), daemon=True, name="tts").start()
+        ready.wait()
+        if self.engine:
             logger.info("Text-to-Speech engine initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize TTS engine: {e}")
-            self.engine = None
-    
+
     def _configure_voice(self):
         """Configure voice properties"""
         if self.engine:
             # Set rate (speed of speech)
             self.engine.setProperty('rate', Settings.VOICE_RATE)
-            
+
             # Set volume (0.0 to 1.0)
             self.engine.setProperty('volume', Settings.VOICE_VOLUME)
-            
+
             # Optional: Set voice (male/female)
             voices = self.engine.getProperty('voices')
             if len(voices) > 0:
                 # Use first available voice (usually male)
                 self.engine.setProperty('voice', voices[0].id)
-    
-    def speak(self, text):
-        """Convert text to speech"""
+
+    def _run(self, ready):
+        """Worker thread: own the engine and speak queued utterances"""
+        try:
+            self.engine = pyttsx3.init()
+            self._configure_voice()
+            # Checked between words, so an interrupt stops speech mid-sentence
+            self.engine.connect('started-word', self._on_word)
+            self.cache = self._open_cache()
+        except Exception as e:
+            logger.error(f"Failed to initialize TTS engine: {e}")
+            self.engine = None
+        finally:
+            ready.set()
+
         if not self.engine:
-            print(f"[TTS Error] Cannot speak: {text}")
-            return False
-        
+            return
+
+        while True:
+            utterance = self._queue.get()
+            try:
+                self._play(utterance)
+            finally:
+                utterance.done.set()
+
+    def _open_cache(self):
+        """Speech cache plus the PyAudio output it plays through, or None"""
+        if not Settings.ENABLE_SPEECH_CACHE:
+            return None
+        if not PYAUDIO_AVAILABLE:
+            logger.info("PyAudio not installed; speech is synthesized every time")
+            return None
+
+        import pyaudio
+
         try:
-            logger.info(f"Speaking: {text}")
-            print(f"🔊 {Settings.ASSISTANT_NAME}: {text}")
-            self.engine.say(text)
-            self.engine.runAndWait()
-            return True
+            self._audio = pyaudio.PyAudio()
+            self._voice = tuple(self.engine.getProperty(name) for name in ('voice', 'rate', 'volume'))
+            return SpeechCache(Settings.SPEECH_CACHE_DIR, Settings.SPEECH_CACHE_MAX_MB * 1024 * 1024)
+        except Exception as e:
+            logger.warning(f"Speech cache unavailable ({e}); speech is synthesized every time")
+            return None
+
+    def _play(self, utterance):
+        """Speak one utterance unless it has gone stale"""
+        if utterance.text is None:
+            return   # flush() marker
+        if utterance.render_only:
+            if self.cache:
+                self._render(utterance)
+            return
+
+        with self._lock:
+            if utterance.seq <= self._cutoff:
+                return
+            if self._latest.get(utterance.key) != utterance.seq:
+                self.stats["coalesced"] += 1
+                logger.debug(f"Skipping superseded speech: {utterance.text}")
+                return
+            del self._latest[utterance.key]
+            if utterance.deadline and time.monotonic() > utterance.deadline:
+                self.stats["expired"] += 1
+                logger.debug(f"Skipping stale speech: {utterance.text}")
+                return
+
+        # A miss is spoken live rather than rendered first, which would delay it
+        clip = self.cache.get(cache_key(utterance.text, *self._voice)) if self.cache else None
+
+        with self._lock:
+            if utterance.seq <= self._cutoff:
+                return
+            self._current = utterance
+
+        try:
+            if clip:
+                self._play_clip(clip, utterance)
+            else:
+                self.engine.say(utterance.text)
+                self.engine.runAndWait()
+                if self.cache:
+                    # Render it for next time once nothing is waiting to be said
+                    self._queue.put(Utterance(utterance.text, PRIORITY_BACKGROUND, next(self._seq), None, None, render_only=True))
+            if utterance.seq <= self._cutoff:
+                self.stats["interrupted"] += 1
+                logger.debug(f"Speech interrupted: {utterance.text}")
+            else:
+                self.stats["spoken"] += 1
         except Exception as e:
             logger.error(f"TTS error: {e}")
-            print(f"[TTS Error] {text}")
-            return False
-    
-    def speak_async(self, text):
-        """Speak without blocking (experimental)"""
+            print(f"[TTS Error] {utterance.text}")
+        finally:
+            self._current = None
+
+    def _render(self, utterance):
+        """
+        Render-only job: synthesize the phrase into the cache unless it is there already
+
+        The lookup doesn't count as a hit or miss - that was counted when the
+        phrase was spoken, and pre-rendering isn't a use of the cache.
+        """
+        key = cache_key(utterance.text, *self._voice)
+        if self.cache.load(key, pin=utterance.pin):
+            return
+
+        path = self.cache.render_path(key)
+        try:
+            self.engine.save_to_file(utterance.text, path)
+            self.engine.runAndWait()
+            self.cache.put(key, utterance.text, path, pin=utterance.pin)
+            return
+        except wave.Error as e:
+            logger.warning(f"TTS engine doesn't render WAV files ({e}); speech cache disabled")
+            self.cache = None
+        except Exception as e:
+            logger.error(f"Could not render speech for '{utterance.text}': {e}")
+
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _play_clip(self, clip, utterance):
+        """Play a cached clip from memory, stopping early if interrupted"""
+        stream = self._audio.open(
+            format=self._audio.get_format_from_width(clip.sample_width),
+            channels=clip.channels,
+            rate=clip.sample_rate,
+            output=True
+        )
+        block = int(clip.sample_rate * PLAYBACK_BLOCK_SECONDS) * clip.sample_width * clip.channels
+        try:
+            for start in range(0, len(clip.frames), block):
+                if utterance.seq <= self._cutoff:
+                    break
+                stream.write(clip.frames[start:start + block])
+        finally:
+            stream.stop_stream()
+            stream.close()
+
+    def _on_word(self, name, location, length):
+        """Engine callback (worker thread): stop if the current utterance was interrupted"""
+        current = self._current
+        if current and current.seq <= self._cutoff:
+            self.engine.stop()
+
+    def speak(self, text, priority=PRIORITY_NORMAL, wait=False, key=None, max_age=None):
+        """
+        Convert text to speech
+
+        Args:
+            text: What to say
+            priority: PRIORITY_URGENT or PRIORITY_NORMAL
+            wait: Block until it has been spoken (or skipped)
+            key: Messages sharing a key coalesce - only the newest still queued
+                is spoken (default: the text itself)
+            max_age: Seconds after which it is no longer worth saying
+                (default: Settings.TTS_MAX_AGE)
+
+        Returns:
+            bool: True if the message was queued (or printed)
+        """
+        if not Settings.ENABLE_TTS:
+            logger.info(f"Reply: {text}")
+            print(f"💬 {Settings.ASSISTANT_NAME}: {text}")
+            return True
+
         if not self.engine:
             print(f"[TTS Error] Cannot speak: {text}")
             return False
-        
-        try:
-            logger.info(f"Speaking (async): {text}")
-            print(f"🔊 {Settings.ASSISTANT_NAME}: {text}")
-            self.engine.say(text)
-            self.engine.startLoop(False)
-            self.engine.iterate()
-            self.engine.endLoop()
+
+        logger.info(f"Speaking: {text}")
+        print(f"🔊 {Settings.ASSISTANT_NAME}: {text}")
+
+        with self._lock:
+            utterance = Utterance(
+                text, priority, next(self._seq), key or text,
+                Settings.TTS_MAX_AGE if max_age is None else max_age
+            )
+            self._latest[utterance.key] = utterance.seq
+        self._queue.put(utterance)
+
+        if wait:
+            utterance.done.wait()
+        return True
+
+    def speak_async(self, text):
+        """Speak without blocking (speak() no longer blocks either)"""
+        return self.speak(text)
+
+    def interrupt(self):
+        """Barge-in: cut off the current utterance and drop everything queued"""
+        with self._lock:
+            self._cutoff = next(self._seq)
+            self._latest.clear()
+
+    def prerender(self, phrases):
+        """
+        Render fixed phrases into the cache in the background and keep them in memory
+
+        Args:
+            phrases: Texts said often enough to always have ready
+        """
+        if not self.cache:
+            return
+        for text in phrases:
+            self._queue.put(Utterance(text, PRIORITY_BACKGROUND, next(self._seq), None, None, render_only=True, pin=True))
+
+    def flush(self, timeout=None):
+        """
+        Wait until everything queued so far has been spoken
+
+        Returns:
+            bool: False if the timeout ran out first
+        """
+        if not self.engine:
             return True
-        except Exception as e:
-            logger.error(f"TTS async error: {e}")
-            return False
-    
+        marker = Utterance(None, PRIORITY_BACKGROUND, next(self._seq), None, None)
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
     def stop(self):
         """Stop current speech"""
         if self.engine:
-            try:
-                self.engine.stop()
-            except:
-                pass
+            self.interrupt()
+
+    def get_statistics(self):
+        """Utterances spoken, coalesced, expired and interrupted, plus speech cache counters"""
+        stats = dict(self.stats)
+        if self.cache:
+            stats["cache"] = self.cache.get_statistics()
+        return stats
 
 # Global TTS instance
-tts = TextToSpeech()
\ No newline at end of file
+tts = registry.register("tts", TextToSpeech)
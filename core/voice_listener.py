@@ -2,32 +2,164 @@
 Voice Listener - Speech Recognition
 Converts voice input to text
 """
+import math
+import time
+import threading
+import collections
 import speech_recognition as sr
 from config.settings import Settings
+from core import pcm
+from core.audio_capture import AudioCapture, NoiseFloorTracker
+from core.asr_backends import create_asr_backend
+from utils.helpers import load_json, save_json, get_timestamp
 from utils.logger import logger
+from utils.service_registry import registry
+
+# Energy threshold never drops below this, even in a digitally silent room
+MIN_ENERGY_THRESHOLD = 50
 
 class VoiceListener:
     """Handle voice input and speech recognition"""
     
-    def __init__(self):
-        """Initialize speech recognizer"""
+    captures_audio = True
+    
+    def __init__(self, device=None):
+        """
+        Initialize speech recognizer
+        
+        Args:
+            device: AudioSource to listen to (default: the system microphone;
+                see core.input_sources.WavFileDevice for recordings)
+        """
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        self.microphone = device or sr.Microphone()
+        self.asr = create_asr_backend(self.recognizer)
         
-        # Adjust for ambient noise
-        with self.microphone as source:
-            logger.info("Adjusting for ambient noise... Please wait.")
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
+        # One stream stays open for the assistant's lifetime; every listen reads
+        # from its ring buffer, so nothing said between listens is lost
+        lossless = getattr(self.microphone, "lossless", False)
+        self.capture = AudioCapture(self.microphone, lossless=lossless)
+        self.capture.start()
+        # A recording is heard from its first byte; a live microphone from now
+        self.source = self.capture.source(position=0 if lossless else None)
+        
+        self.device_key = None
+        self.noise_floor = None
+        self._calibration_saved_at = 0.0
+        self._calibrate()
         
         logger.info("Voice listener initialized successfully")
     
-    def listen(self, timeout=None, phrase_time_limit=None):
+    def _device_key(self):
+        """Input device name and rate, so each microphone keeps its own calibration"""
+        index = self.microphone.device_index
+        try:
+            audio = self.microphone.pyaudio_module.PyAudio()
+            try:
+                info = audio.get_device_info_by_index(index) if index is not None else audio.get_default_input_device_info()
+            finally:
+                audio.terminate()
+            name = info.get("name") or "default"
+        except Exception:
+            name = "default" if index is None else f"device-{index}"
+        return f"{name}@{self.microphone.SAMPLE_RATE}"
+    
+    def _calibrate(self):
+        """
+        Set the energy threshold from the cached calibration, or measure it
+        
+        Only the first start on a device waits a second for
+        adjust_for_ambient_noise. Afterwards the noise floor is tracked from
+        every captured chunk and the threshold follows it. Recordings bring
+        their own measured noise floor and are never calibrated.
+        """
+        recorded_floor = getattr(self.microphone, "noise_floor", None)
+        if recorded_floor is not None:
+            self.recognizer.energy_threshold = max(MIN_ENERGY_THRESHOLD, recorded_floor * self.recognizer.dynamic_energy_ratio)
+            self.recognizer.dynamic_energy_threshold = False
+            return
+        
+        self.device_key = self._device_key()
+        cached = load_json(Settings.AUDIO_CALIBRATION_FILE, default={}).get(self.device_key)
+        
+        if cached and not Settings.RECALIBRATE_AUDIO:
+            self.recognizer.energy_threshold = cached["energy_threshold"]
+            floor = cached.get("noise_floor")
+            logger.info(f"Using cached noise calibration for '{self.device_key}' "
+                        f"(threshold {self.recognizer.energy_threshold:.0f})")
+        else:
+            with self._source() as source:
+                logger.info("Adjusting for ambient noise... Please wait.")
+                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+            floor = self.recognizer.energy_threshold / self.recognizer.dynamic_energy_ratio
+        
+        if Settings.ADAPTIVE_NOISE_FLOOR:
+            # The tracker sees every chunk, not just the ones read while listening,
+            # so it replaces the recognizer's own in-listen adjustment
+            self.noise_floor = NoiseFloorTracker(
+                self.capture.CHUNK / self.capture.SAMPLE_RATE,
+                self.capture.SAMPLE_WIDTH,
+                floor=floor
+            )
+            self.capture.observers.append(self.noise_floor.observe)
+            self.recognizer.dynamic_energy_threshold = False
+        
+        if not cached or Settings.RECALIBRATE_AUDIO:
+            self._save_calibration()
+    
+    def _save_calibration(self):
+        """Persist the current threshold and noise floor for this device"""
+        calibrations = load_json(Settings.AUDIO_CALIBRATION_FILE, default={})
+        calibrations[self.device_key] = {
+            "energy_threshold": round(self.recognizer.energy_threshold, 1),
+            "noise_floor": round(self.noise_floor.floor, 1) if self.noise_floor and self.noise_floor.floor is not None else None,
+            "updated_at": get_timestamp()
+        }
+        save_json(Settings.AUDIO_CALIBRATION_FILE, calibrations)
+        self._calibration_saved_at = time.monotonic()
+    
+    def _update_threshold(self):
+        """Follow the tracked noise floor, saving it now and then"""
+        if not self.noise_floor or self.noise_floor.floor is None:
+            return
+        
+        self.recognizer.energy_threshold = max(
+            MIN_ENERGY_THRESHOLD,
+            self.noise_floor.floor * self.recognizer.dynamic_energy_ratio
+        )
+        if time.monotonic() - self._calibration_saved_at >= Settings.AUDIO_CALIBRATION_SAVE_INTERVAL:
+            self._save_calibration()
+    
+    def _source(self):
+        """
+        Audio source continuing where the previous listen stopped
+        
+        At most Settings.AUDIO_MAX_BACKLOG seconds of unread audio are
+        replayed, so speech that began during recognition is still heard.
+        The energy threshold is refreshed from the noise floor first.
+        """
+        self._update_threshold()
+        self.source.limit_backlog(Settings.AUDIO_MAX_BACKLOG)
+        return self.source
+    
+    @property
+    def exhausted(self):
+        """True once a finite input (e.g. WAV files) has been read to the end"""
+        return self.capture.ring.closed and self.source.position >= self.capture.ring.written
+    
+    def discard_pending(self):
+        """Skip audio captured so far (e.g. our own spoken prompt)"""
+        self.source.skip_to_now()
+    
+    def listen(self, timeout=None, phrase_time_limit=None, on_partial=None):
         """
         Listen for voice input and convert to text
         
         Args:
             timeout: Time to wait for speech to start
             phrase_time_limit: Maximum time for phrase
+            on_partial: Called with interim transcripts while the phrase is
+                still being spoken
             
         Returns:
             str: Recognized text or None if failed
@@ -38,23 +170,85 @@ class VoiceListener:
             phrase_time_limit = Settings.PHRASE_TIME_LIMIT
         
         try:
-            with self.microphone as source:
-                logger.debug("Listening for voice input...")
-                audio = self.recognizer.listen(
+            logger.debug("Listening for voice input...")
+            audio = self.record(timeout, phrase_time_limit, on_partial)
+        except Exception as e:
+            logger.error(f"Error during speech recognition: {e}")
+            return None
+        
+        if audio is None:
+            logger.warning("Listening timed out - no speech detected")
+            return None
+        
+        return self.recognize(audio)
+    
+    def record(self, timeout=None, phrase_time_limit=None, on_partial=None):
+        """
+        Record one phrase from the local stream without recognizing it
+        
+        Nothing leaves the machine (unless on_partial asks for interim
+        transcripts); used by the on-device wake-word spotter and by the
+        pipeline, which recognizes on a separate stage.
+        
+        Returns:
+            sr.AudioData: The phrase, or None if no speech started in time
+        """
+        timeout = timeout or Settings.TIMEOUT
+        phrase_time_limit = phrase_time_limit or Settings.PHRASE_TIME_LIMIT
+        try:
+            with self._source() as source:
+                if on_partial:
+                    return self._listen_with_partials(source, timeout, phrase_time_limit, on_partial)
+                return self.recognizer.listen(
                     source,
                     timeout=timeout,
                     phrase_time_limit=phrase_time_limit
                 )
-            
-            # Recognize speech using Google Speech Recognition
-            logger.debug("Recognizing speech...")
-            text = self.recognizer.recognize_google(audio)
-            logger.info(f"Recognized: {text}")
-            return text.lower()
-            
         except sr.WaitTimeoutError:
-            logger.warning("Listening timed out - no speech detected")
             return None
+    
+    def capture_command(self, on_partial=None):
+        """
+        Record the command after the wake word, for recognize() to transcribe later
+        
+        Returns:
+            sr.AudioData: The command audio or None
+        """
+        logger.info("Waiting for command...")
+        return self.record(timeout=5, phrase_time_limit=10, on_partial=on_partial)
+    
+    def has_speech(self, audio, min_seconds=0.3):
+        """
+        Check whether recorded audio holds at least min_seconds above the energy threshold
+        
+        Args:
+            audio: sr.AudioData
+            min_seconds: Voiced audio required
+        
+        Returns:
+            bool: True if there is enough speech to be worth recognizing
+        """
+        window = int(audio.sample_rate * 0.1) * audio.sample_width
+        data = audio.frame_data
+        voiced = sum(
+            1 for start in range(0, len(data) - window + 1, window)
+            if pcm.rms(data[start:start + window], audio.sample_width) > self.recognizer.energy_threshold
+        )
+        return voiced * 0.1 >= min_seconds
+    
+    def recognize(self, audio):
+        """
+        Convert recorded audio to text
+        
+        Returns:
+            str: Recognized text (lowercase) or None if failed
+        """
+        try:
+            logger.debug("Recognizing speech...")
+            transcript = self.asr.recognize(audio)
+            logger.info(f"Recognized: {transcript.text} ({transcript.backend}, {transcript.latency * 1000:.0f}ms)")
+            return transcript.text.lower()
+            
         except sr.UnknownValueError:
             logger.warning("Could not understand audio")
             return None
@@ -65,6 +259,106 @@ class VoiceListener:
             logger.error(f"Error during speech recognition: {e}")
             return None
     
+    def _listen_with_partials(self, source, timeout, phrase_time_limit, on_partial):
+        """
+        Record one phrase like Recognizer.listen, recognizing the audio
+        captured so far every Settings.PARTIAL_TRANSCRIPT_INTERVAL seconds
+        
+        Interim recognition runs on a background thread (one request at a
+        time) so capture never stalls waiting for the network.
+        
+        Returns:
+            sr.AudioData: The complete phrase
+        """
+        recognizer = self.recognizer
+        seconds_per_buffer = float(source.CHUNK) / source.SAMPLE_RATE
+        pause_buffer_count = int(math.ceil(recognizer.pause_threshold / seconds_per_buffer))
+        phrase_buffer_count = int(math.ceil(recognizer.phrase_threshold / seconds_per_buffer))
+        non_speaking_buffer_count = int(math.ceil(recognizer.non_speaking_duration / seconds_per_buffer))
+        partial_buffer_count = max(1, int(math.ceil(Settings.PARTIAL_TRANSCRIPT_INTERVAL / seconds_per_buffer)))
+        
+        in_flight = threading.Event()
+        elapsed_time = 0
+        
+        while True:
+            frames = collections.deque()
+            
+            # Wait for speech to start
+            while True:
+                elapsed_time += seconds_per_buffer
+                if timeout and elapsed_time > timeout:
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                
+                buffer = source.stream.read(source.CHUNK)
+                if len(buffer) == 0:
+                    break
+                frames.append(buffer)
+                if len(frames) > non_speaking_buffer_count:
+                    frames.popleft()
+                
+                energy = pcm.rms(buffer, source.SAMPLE_WIDTH)
+                if energy > recognizer.energy_threshold:
+                    break
+                
+                if recognizer.dynamic_energy_threshold:
+                    damping = recognizer.dynamic_energy_adjustment_damping ** seconds_per_buffer
+                    target_energy = energy * recognizer.dynamic_energy_ratio
+                    recognizer.energy_threshold = recognizer.energy_threshold * damping + target_energy * (1 - damping)
+            
+            # Record the phrase, recognizing what we have so far at each interval
+            pause_count, phrase_count = 0, 0
+            phrase_start_time = elapsed_time
+            while True:
+                elapsed_time += seconds_per_buffer
+                if phrase_time_limit and elapsed_time - phrase_start_time > phrase_time_limit:
+                    break
+                
+                buffer = source.stream.read(source.CHUNK)
+                if len(buffer) == 0:
+                    break
+                frames.append(buffer)
+                phrase_count += 1
+                
+                energy = pcm.rms(buffer, source.SAMPLE_WIDTH)
+                if energy > recognizer.energy_threshold:
+                    pause_count = 0
+                else:
+                    pause_count += 1
+                if pause_count > pause_buffer_count:
+                    break
+                
+                if phrase_count % partial_buffer_count == 0 and not in_flight.is_set():
+                    in_flight.set()
+                    audio = sr.AudioData(b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+                    threading.Thread(
+                        target=self._recognize_partial,
+                        args=(audio, on_partial, in_flight),
+                        daemon=True,
+                        name="partial-transcript"
+                    ).start()
+            
+            phrase_count -= pause_count
+            if phrase_count >= phrase_buffer_count or len(buffer) == 0:
+                break
+        
+        # Drop the trailing silence, keeping non_speaking_duration of it
+        for _ in range(pause_count - non_speaking_buffer_count):
+            frames.pop()
+        return sr.AudioData(b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+    
+    def _recognize_partial(self, audio, on_partial, in_flight):
+        """Recognize an interim slice of audio and report it"""
+        try:
+            text = self.asr.recognize(audio).text
+            logger.debug(f"Partial transcript: {text}")
+            on_partial(text.lower())
+        except sr.UnknownValueError:
+            pass
+        except Exception as e:
+            logger.debug(f"Partial recognition failed: {e}")
+        finally:
+            in_flight.clear()
+    
     def listen_for_wake_word(self):
         """
         Listen specifically for wake word
@@ -80,16 +374,35 @@ class VoiceListener:
         
         return False
     
-    def get_command(self):
+    def get_command(self, on_partial=None):
         """
         Get command after wake word is detected
         
+        Args:
+            on_partial: Called with interim transcripts of the command
+        
         Returns:
             str: Command text or None
         """
         logger.info("Waiting for command...")
-        text = self.listen(timeout=5, phrase_time_limit=10)
+        text = self.listen(timeout=5, phrase_time_limit=10, on_partial=on_partial)
         return text
 
+def create_listener():
+    """
+    Build the listener for Settings.INPUT_MODE
+    
+    "microphone" listens live; "wav" plays Settings.INPUT_PATHS (files or
+    directories) through the same capture and recognition path; "text"
+    reads one transcript per line from the file in INPUT_PATHS or stdin.
+    """
+    from core.input_sources import WavFileDevice, TextListener
+    
+    if Settings.INPUT_MODE == "text":
+        return TextListener()
+    if Settings.INPUT_MODE == "wav":
+        return VoiceListener(device=WavFileDevice(Settings.INPUT_PATHS))
+    return VoiceListener()
+
 # Global listener instance
-listener = VoiceListener()
\ No newline at end of file
+listener = registry.register("listener", create_listener)
\ No newline at end of file
@@ -3,9 +3,17 @@ Wake Word Detector
 Listens for "Hey Zeeshan" activation phrase
 """
 from core.voice_listener import listener
-from core.text_to_speech import tts
+from core.keyword_spotter import keyword_spotter
+from core.text_to_speech import tts, PRIORITY_URGENT
 from config.settings import Settings
 from utils.logger import logger
+from utils.service_registry import registry
+
+# Long enough for the wake word and a command in one breath
+WAKE_PHRASE_TIME_LIMIT = 8
+
+ACTIVATION_PROMPT = "Yes, I'm listening. How can I help you?"
+REPEAT_PROMPT = "I didn't catch that. Could you please repeat?"
 
 class WakeWordDetector:
     """Detect wake word to activate assistant"""
@@ -14,6 +22,14 @@ class WakeWordDetector:
         """Initialize wake word detector"""
         self.wake_word = Settings.WAKE_WORD
         self.is_active = False
+        # Command spoken in the same breath as the wake word ("hey zeeshan, open notepad")
+        self.pending_command = None
+        
+        if keyword_spotter.enrolled:
+            logger.info("Wake word is spotted on-device; audio goes to the cloud only after it fires")
+        else:
+            logger.info("No wake word enrolled - recognizing every phrase in the cloud "
+                        "(run `python -m tools.enroll_wake_word` to spot it on-device)")
         logger.info(f"Wake word detector initialized with: '{self.wake_word}'")
     
     def listen_for_activation(self):
@@ -21,21 +37,27 @@ class WakeWordDetector:
         Continuously listen for wake word
         
         Returns:
-            bool: True if wake word detected
+            bool: True if wake word detected, False if interrupted or the
+                input (WAV files, text) ran out
         """
         logger.info(f"Listening for wake word: '{self.wake_word}'")
         print(f"\n🎤 Say '{self.wake_word}' to activate the assistant...")
         
-        while True:
+        if keyword_spotter.enrolled and listener.captures_audio:
+            return self._spot_activation()
+        
+        while not listener.exhausted:
             try:
-                text = listener.listen(timeout=10, phrase_time_limit=5)
+                text = listener.listen(timeout=10, phrase_time_limit=WAKE_PHRASE_TIME_LIMIT)
                 
                 if text:
                     logger.debug(f"Heard: {text}")
                     
                     # Check if wake word is in the text
-                    if self.wake_word in text.lower():
+                    remainder = self.split_wake_word(text)
+                    if remainder is not None:
                         self.is_active = True
+                        self.pending_command = remainder or None
                         logger.info("Wake word detected! Assistant activated.")
                         return True
                 
@@ -45,22 +67,110 @@ class WakeWordDetector:
             except Exception as e:
                 logger.error(f"Error in wake word detection: {e}")
                 continue
+        
+        logger.info("End of input reached")
+        return False
+    
+    def _spot_activation(self):
+        """
+        Wait for the wake word using only local audio
+        
+        Every phrase the energy gate lets through is matched against the
+        enrolled templates on this machine; nothing is sent to the cloud.
+        
+        Returns:
+            bool: True if wake word detected
+        """
+        while not listener.exhausted:
+            try:
+                audio = listener.record(timeout=10, phrase_time_limit=WAKE_PHRASE_TIME_LIMIT)
+                if audio is None:
+                    continue
+                
+                match = keyword_spotter.spot(audio)
+                logger.debug(f"Spotter: {match}")
+                if match.detected:
+                    self.is_active = True
+                    logger.info(f"Wake word spotted on-device (distance {match.distance:.2f}). Assistant activated.")
+                    self.pending_command = self._command_after(audio, match)
+                    return True
+                
+            except KeyboardInterrupt:
+                logger.info("Wake word detection interrupted by user")
+                return False
+            except Exception as e:
+                logger.error(f"Error in wake word detection: {e}")
+                continue
+        
+        logger.info("End of input reached")
+        return False
+    
+    def split_wake_word(self, text):
+        """
+        Split a transcript at the wake word
+        
+        Args:
+            text: Recognized text
+        
+        Returns:
+            str: What was said after the wake word ("" if nothing), or None
+                if the wake word isn't in the text
+        """
+        text = text.lower()
+        index = text.find(self.wake_word)
+        if index < 0:
+            return None
+        return text[index + len(self.wake_word):].strip(" ,.!?")
+    
+    def _command_after(self, audio, match):
+        """
+        Recognize whatever followed the spotted wake word in the same phrase
+        
+        Only the audio after the wake word goes to the recognizer, and only
+        if it holds speech.
+        
+        Returns:
+            str: The command, or None if the phrase was just the wake word
+        """
+        tail = audio.get_segment(start_ms=match.end_time * 1000)
+        if not listener.has_speech(tail):
+            return None
+        
+        text = listener.recognize(tail)
+        if not text:
+            return None
+        # The spotter's boundary is approximate; drop the wake word if the recognizer heard it too
+        remainder = self.split_wake_word(text)
+        return (text if remainder is None else remainder) or None
     
     def activate(self):
         """Activate the assistant"""
         self.is_active = True
-        tts.speak("Yes, I'm listening. How can I help you?")
+        # Barge-in: the user is starting a new command, so stop talking over them
+        tts.interrupt()
+        if self.pending_command:
+            # The command came with the wake word - no prompt, no second listen
+            logger.info(f"Assistant activated with command: {self.pending_command}")
+            return
+        
+        tts.speak(ACTIVATION_PROMPT, priority=PRIORITY_URGENT, wait=True)
+        # The microphone kept recording while we spoke - don't hear ourselves
+        listener.discard_pending()
         logger.info("Assistant activated")
     
     def deactivate(self):
         """Deactivate the assistant"""
         self.is_active = False
+        self.pending_command = None
         logger.info("Assistant deactivated")
     
-    def wait_for_command(self):
+    def wait_for_command(self, on_partial=None):
         """
         Wait for user command after activation
         
+        Args:
+            on_partial: Called with interim transcripts of the command
+        
         Returns:
             str: User command or None
         """
@@ -68,16 +178,45 @@ class WakeWordDetector:
             logger.warning("Assistant not activated")
             return None
         
+        if self.pending_command:
+            command, self.pending_command = self.pending_command, None
+            logger.info(f"Command received with wake word: {command}")
+            return command
+        
         logger.info("Waiting for user command...")
-        command = listener.get_command()
+        command = listener.get_command(on_partial=on_partial)
         
         if command:
             logger.info(f"Command received: {command}")
         else:
             logger.warning("No command received")
-            tts.speak("I didn't catch that. Could you please repeat?")
+            tts.speak(REPEAT_PROMPT, priority=PRIORITY_URGENT)
         
         return command
 
+    def capture_command(self, on_partial=None):
+        """
+        Capture the command after activation without waiting for recognition
+        
+        Args:
+            on_partial: Called with interim transcripts of the command
+        
+        Returns:
+            dict: {"text": ...} for a command that came with the wake word,
+                {"utterance": ...} for listener.recognize() to transcribe,
+                or None if nothing was said
+        """
+        if self.pending_command:
+            command, self.pending_command = self.pending_command, None
+            logger.info(f"Command received with wake word: {command}")
+            return {"text": command}
+        
+        utterance = listener.capture_command(on_partial=on_partial)
+        if utterance is None:
+            logger.warning("No command received")
+            tts.speak(REPEAT_PROMPT, priority=PRIORITY_URGENT)
+            return None
+        return {"utterance": utterance}
+
 # Global wake word detector instance
-wake_detector = WakeWordDetector()
\ No newline at end of file
+wake_detector = registry.register("wake_detector", WakeWordDetector)
\ No newline at end of file
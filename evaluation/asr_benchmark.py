@@ -0,0 +1,261 @@
+"""
+Speech Recognition Benchmark
+Word error rate and latency of every ASR backend over recorded WAV fixtures
+
+Fixtures live in evaluation/asr_fixtures/ as WAV files plus transcripts.json
+mapping each file name to what was said. Record your own with --record
+(prompts come from the classification corpus). With --offline the cloud
+backend is replaced by a stand-in that answers the reference transcript
+after --cloud-latency seconds, so local and race modes can be measured
+without a network.
+
+Usage:
+    python -m evaluation.asr_benchmark --record 10
+    python -m evaluation.asr_benchmark --backends vosk race --offline --cloud-latency 0.8
+    python -m evaluation.asr_benchmark --compare evaluation/results/asr-<commit>.json
+"""
+import os
+import sys
+import time
+import zlib
+import random
+import logging
+import argparse
+import speech_recognition as sr
+from config.settings import Settings
+from core.phonetic_index import edit_distance
+from evaluation.corpus import EVALUATION_DIR, CORPUS_FILE, load_corpus, write_json
+from evaluation.benchmark import RESULTS_DIR, percentile, _current_commit
+from utils.helpers import load_json
+
+FIXTURES_DIR = os.path.join(EVALUATION_DIR, "asr_fixtures")
+MANIFEST_NAME = "transcripts.json"
+BACKENDS = ["google", "vosk", "race"]
+
+def normalize_transcript(text):
+    """Lowercase words without punctuation, for scoring"""
+    return "".join(char if char.isalnum() or char.isspace() else " " for char in text.lower()).split()
+
+def load_fixtures(directory=None):
+    """
+    Read the WAV fixtures listed in the manifest
+
+    Returns:
+        list: (file name, reference transcript, sr.AudioData) tuples
+    """
+    directory = directory or FIXTURES_DIR
+    manifest = load_json(os.path.join(directory, MANIFEST_NAME), default={})
+    recognizer = sr.Recognizer()
+
+    fixtures = []
+    for name, reference in sorted(manifest.items()):
+        path = os.path.join(directory, name)
+        if not os.path.exists(path):
+            print(f"⚠️  Missing fixture {path}")
+            continue
+        with sr.AudioFile(path) as source:
+            fixtures.append((name, reference, recognizer.record(source)))
+    return fixtures
+
+class RecordedBackend:
+    """Stand-in for the cloud recognizer: answers the reference transcript after a delay"""
+
+    def __init__(self, fixtures, latency=0.0, name="google"):
+        from core.asr_backends import Transcript
+
+        self._transcript = Transcript
+        self.name = name
+        self.latency = latency
+        self.references = {zlib.crc32(audio.frame_data): reference for _, reference, audio in fixtures}
+
+    def recognize(self, audio):
+        time.sleep(self.latency)
+        reference = self.references.get(zlib.crc32(audio.frame_data))
+        if reference is None:
+            raise sr.UnknownValueError()
+        return self._transcript(reference, 0.9, self.name, self.latency)
+
+def build_backends(names, fixtures, offline, cloud_latency):
+    """
+    Build the requested backends, skipping ones that can't run here
+
+    Returns:
+        dict: name -> backend
+    """
+    from core.asr_backends import GoogleBackend, VoskBackend, RaceBackend
+
+    cloud = RecordedBackend(fixtures, cloud_latency) if offline else GoogleBackend(sr.Recognizer())
+    local = None
+    if "vosk" in names or "race" in names:
+        try:
+            local = VoskBackend()
+        except Exception as e:
+            print(f"⚠️  Skipping local recognition: {e}")
+
+    backends = {}
+    for name in names:
+        if name == "google":
+            backends[name] = cloud
+        elif name == "vosk" and local:
+            backends[name] = local
+        elif name == "race" and local:
+            backends[name] = RaceBackend([local, cloud])
+    return backends
+
+def evaluate_backend(backend, fixtures):
+    """
+    Run one backend over the fixtures
+
+    Returns:
+        dict: Word error rate, exact matches, failures, latency percentiles and transcripts
+    """
+    latencies = []
+    transcripts = {}
+    winners = {}
+    errors = words = exact = failures = 0
+
+    for name, reference, audio in fixtures:
+        expected = normalize_transcript(reference)
+        started = time.perf_counter()
+        try:
+            transcript = backend.recognize(audio)
+            heard = normalize_transcript(transcript.text)
+            winners[transcript.backend] = winners.get(transcript.backend, 0) + 1
+        except (sr.UnknownValueError, sr.RequestError):
+            heard = []
+            failures += 1
+        latencies.append((time.perf_counter() - started) * 1000)
+
+        transcripts[name] = " ".join(heard)
+        errors += edit_distance(expected, heard)
+        words += len(expected)
+        exact += heard == expected
+
+    total = len(fixtures)
+    return {
+        "wer": round(errors / words, 4) if words else None,
+        "exact_match": round(exact / total, 4) if total else None,
+        "failures": failures,
+        "answered_by": winners,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "mean": round(sum(latencies) / len(latencies), 1)
+        } if latencies else None,
+        "transcripts": transcripts
+    }
+
+def run_benchmark(backends=None, fixtures_dir=None, offline=False, cloud_latency=0.8):
+    """
+    Benchmark the selected backends
+
+    Returns:
+        dict: Diffable results
+    """
+    fixtures = load_fixtures(fixtures_dir)
+    built = build_backends(backends or BACKENDS, fixtures, offline, cloud_latency)
+
+    app_logger = logging.getLogger("VoiceAssistant")
+    level = app_logger.level
+    app_logger.setLevel(logging.ERROR)
+    try:
+        results = {}
+        for name, backend in built.items():
+            print(f"⏱️  {name}...")
+            results[name] = evaluate_backend(backend, fixtures)
+    finally:
+        app_logger.setLevel(level)
+
+    return {
+        "commit": _current_commit(),
+        "fixtures": len(fixtures),
+        "offline": offline,
+        "cloud_stub_latency_s": cloud_latency if offline else None,
+        "min_confidence": Settings.ASR_MIN_CONFIDENCE,
+        "backends": results
+    }
+
+def format_summary(results):
+    """Human-readable table of a results dict"""
+    lines = [f"{'backend':<8} {'WER':>7} {'exact':>7} {'fail':>5} {'p50 ms':>9} {'p95 ms':>9}"]
+    for name, stats in results["backends"].items():
+        latency = stats["latency_ms"] or {}
+        lines.append(
+            f"{name:<8} {stats['wer'] or 0:>7.2%} {stats['exact_match'] or 0:>7.2%} {stats['failures']:>5} "
+            f"{latency.get('p50', 0):>9.1f} {latency.get('p95', 0):>9.1f}"
+        )
+    return "\n".join(lines)
+
+def compare(baseline, current):
+    """Describe WER/latency deltas between two runs"""
+    lines = [f"Comparing {baseline.get('commit')} → {current.get('commit')}"]
+    for name, stats in current["backends"].items():
+        before = baseline.get("backends", {}).get(name)
+        if not before:
+            lines.append(f"  {name}: new backend")
+            continue
+        wer_delta = (stats["wer"] or 0) - (before["wer"] or 0)
+        p50_before = (before.get("latency_ms") or {}).get("p50") or 0
+        p50_after = (stats.get("latency_ms") or {}).get("p50") or 0
+        lines.append(f"  {name}: WER {wer_delta:+.2%}, p50 {p50_before:.1f} → {p50_after:.1f} ms")
+    return "\n".join(lines)
+
+def record_fixtures(count, fixtures_dir=None):
+    """Record count corpus commands from the microphone into the fixtures directory"""
+    from core.voice_listener import listener
+
+    directory = fixtures_dir or FIXTURES_DIR
+    manifest_file = os.path.join(directory, MANIFEST_NAME)
+    manifest = load_json(manifest_file, default={})
+    pending = [entry["text"] for entry in load_corpus(CORPUS_FILE) if entry["text"] not in manifest.values()]
+    os.makedirs(directory, exist_ok=True)
+
+    for text in random.sample(pending, min(count, len(pending))):
+        input(f"Press Enter, then say: \"{text}\"")
+        listener.discard_pending()
+        audio = listener.record(timeout=5)
+        if audio is None:
+            print("⚠️  Didn't hear anything - skipped")
+            continue
+
+        name = f"{len(manifest) + 1:03d}.wav"
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(audio.get_wav_data())
+        manifest[name] = text
+        write_json(manifest_file, manifest)
+        print(f"✓ Saved {name}")
+
+def main(argv=None):
+    """Run the benchmark and write results"""
+    parser = argparse.ArgumentParser(description="Benchmark speech recognition backends")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Directory with WAV files and transcripts.json")
+    parser.add_argument("--offline", action="store_true", help="Replace the cloud recognizer with a local stand-in")
+    parser.add_argument("--cloud-latency", type=float, default=0.8, help="Seconds the cloud stand-in takes")
+    parser.add_argument("--record", type=int, metavar="N", help="Record N new fixtures from the microphone and exit")
+    parser.add_argument("--output", help="Results file (default: evaluation/results/asr-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record_fixtures(args.record, args.fixtures)
+        return 0
+
+    results = run_benchmark(args.backends, args.fixtures, args.offline, args.cloud_latency)
+    if not results["fixtures"]:
+        print(f"❌ No fixtures in {args.fixtures} - record some with --record")
+        return 1
+
+    output = args.output or os.path.join(RESULTS_DIR, f"asr-{results['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    write_json(output, results)
+
+    print(format_summary(results))
+    print(f"📊 Results written to {output}")
+
+    if args.compare:
+        print(compare(load_json(args.compare, default={"backends": {}}), results))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+Classifier Benchmark
+Accuracy, confusion by intent and latency percentiles for every classification tier
+
+The LLM tier runs against the stand-in server replaying recorded responses,
+so the benchmark needs no network and no API key. Results are written as
+stable JSON so runs on two commits can be diffed or compared with --compare.
+
+Usage:
+    python -m evaluation.benchmark
+    python -m evaluation.benchmark --tiers rules phonetic --repeat 20
+    python -m evaluation.benchmark --compare evaluation/results/<commit>.json
+"""
+import io
+import os
+import sys
+import time
+import logging
+import tempfile
+import argparse
+import subprocess
+import contextlib
+from config.settings import Settings
+from evaluation.corpus import EVALUATION_DIR, CORPUS_FILE, RECORDED_RESPONSES_FILE, load_corpus, write_json
+from utils.helpers import load_json
+
+RESULTS_DIR = os.path.join(EVALUATION_DIR, "results")
+TIERS = ["rules", "phonetic", "embedding", "local", "llm", "cascade"]
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(percent / 100 * len(ordered) + 0.5 - 1e-9)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def _label(result):
+    """Comparable (intent, action) of a classification"""
+    intent = result.get("intent") or "unknown"
+    return intent, (result.get("action") or None) if intent != "unknown" else None
+
+def _format_label(label):
+    intent, action = label
+    return f"{intent}/{action}" if action else intent
+
+def _current_commit():
+    """Short hash of HEAD, or "latest" outside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Settings.BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "latest"
+
+def build_classifier(llm_base_url):
+    """
+    Build a classifier isolated from the user's setup
+
+    Real providers are disabled, the LLM is the stand-in at llm_base_url and
+    the cache is a throwaway that never hits, so every tier does real work.
+    """
+    from core.command_classifier import CommandClassifier
+    from core.classification_cache import ClassificationCache
+    from core.llm_transport import AsyncLLMTransport, OpenAICompatibleChat
+    from core.llm_providers import LLMProvider, LLMRouter
+
+    Settings.USE_GROQ = Settings.USE_OPENAI = Settings.USE_ANTHROPIC = False
+    classifier = CommandClassifier()
+
+    cache_file = os.path.join(tempfile.mkdtemp(prefix="benchmark-cache-"), "cache.json")
+    classifier.cache = ClassificationCache(cache_file, max_entries=0)
+
+    transport = AsyncLLMTransport(llm_base_url, name="recorded", max_retries=0)
+    provider = LLMProvider("recorded", OpenAICompatibleChat(transport, "recorded"))
+    classifier.llm_client = LLMRouter([provider], race=False)
+    return classifier
+
+def tier_functions(classifier):
+    """Callable per tier: command text -> classification dict"""
+    return {
+        "rules": classifier._classify_rule_based,
+        "phonetic": classifier._classify_phonetic,
+        "embedding": classifier._classify_embedding,
+        "local": lambda text: classifier._classify_locally(text)[1],
+        "llm": lambda text: classifier._classify_with_groq(text, streaming=False),
+        "cascade": classifier.classify,
+    }
+
+def evaluate_tier(classify, corpus, repeat):
+    """
+    Run one tier over the corpus
+
+    Args:
+        classify: Callable returning a classification dict
+        corpus: Labeled corpus entries
+        repeat: Timed runs per command (predictions come from the first)
+
+    Returns:
+        dict: Accuracy, confusion, latency percentiles and predictions
+    """
+    latencies = []
+    predictions = {}
+    confusion = {}
+    correct = intent_correct = weighted_correct = weighted_total = 0
+
+    for entry in corpus:
+        expected = (entry["intent"], entry.get("action"))
+        result = None
+        for run in range(repeat):
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                output = classify(entry["text"])
+                latencies.append((time.perf_counter() - started) * 1000)
+            if run == 0:
+                result = output
+
+        predicted = _label(result)
+        predictions[entry["text"]] = _format_label(predicted)
+
+        row = confusion.setdefault(expected[0], {})
+        row[predicted[0]] = row.get(predicted[0], 0) + 1
+
+        weight = entry.get("count", 1) or 1
+        weighted_total += weight
+        if predicted == expected:
+            correct += 1
+            weighted_correct += weight
+        if predicted[0] == expected[0]:
+            intent_correct += 1
+
+    total = len(corpus)
+    return {
+        "accuracy": round(correct / total, 4) if total else None,
+        "intent_accuracy": round(intent_correct / total, 4) if total else None,
+        "weighted_accuracy": round(weighted_correct / weighted_total, 4) if weighted_total else None,
+        "confusion": confusion,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "mean": round(sum(latencies) / len(latencies), 3)
+        } if latencies else None,
+        "predictions": predictions
+    }
+
+def run_benchmark(tiers=None, repeat=5, corpus_file=None, responses_file=None, llm_latency=0.0):
+    """
+    Benchmark the selected tiers
+
+    Returns:
+        dict: Diffable results
+    """
+    from tools.llm_standin_server import start_standin_server
+    from utils.service_registry import registry
+
+    corpus = [entry for entry in load_corpus(corpus_file or CORPUS_FILE) if entry.get("intent")]
+    responses = load_json(responses_file or RECORDED_RESPONSES_FILE, default={})
+    tiers = tiers or TIERS
+
+    server, base_url = start_standin_server(responses=responses, latency=llm_latency)
+    app_logger = logging.getLogger("VoiceAssistant")
+    level = app_logger.level
+    app_logger.setLevel(logging.WARNING)
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            classifier = build_classifier(base_url)
+            encoder = type(registry.get("intent_encoder")).__name__
+        functions = tier_functions(classifier)
+
+        results = {}
+        for tier in tiers:
+            print(f"⏱️  {tier}...")
+            results[tier] = evaluate_tier(functions[tier], corpus, repeat)
+    finally:
+        app_logger.setLevel(level)
+        server.shutdown()
+
+    return {
+        "commit": _current_commit(),
+        "corpus_size": len(corpus),
+        "repeat": repeat,
+        "llm_stub_latency_s": llm_latency,
+        "recorded_responses": len(responses),
+        "embedding_encoder": encoder,
+        "tiers": results
+    }
+
+def format_summary(results):
+    """Human-readable table of a results dict"""
+    lines = [f"{'tier':<10} {'acc':>6} {'intent':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+    for tier, stats in results["tiers"].items():
+        latency = stats["latency_ms"] or {}
+        lines.append(
+            f"{tier:<10} {stats['accuracy']:>6.2%} {stats['intent_accuracy']:>7.2%} "
+            f"{latency.get('p50', 0):>9.3f} {latency.get('p95', 0):>9.3f} {latency.get('p99', 0):>9.3f}"
+        )
+    return "\n".join(lines)
+
+def compare(baseline, current):
+    """Describe accuracy/latency deltas and changed predictions between two runs"""
+    lines = [f"Comparing {baseline.get('commit')} → {current.get('commit')}"]
+    for tier, stats in current["tiers"].items():
+        before = baseline.get("tiers", {}).get(tier)
+        if not before:
+            lines.append(f"  {tier}: new tier")
+            continue
+
+        accuracy_delta = (stats["accuracy"] or 0) - (before["accuracy"] or 0)
+        p95_before = (before.get("latency_ms") or {}).get("p95") or 0
+        p95_after = (stats.get("latency_ms") or {}).get("p95") or 0
+        lines.append(f"  {tier}: accuracy {accuracy_delta:+.2%}, p95 {p95_before:.3f} → {p95_after:.3f} ms")
+
+        for text, predicted in sorted(stats["predictions"].items()):
+            previous = before["predictions"].get(text)
+            if previous is not None and previous != predicted:
+                lines.append(f"      '{text}': {previous} → {predicted}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    """Run the benchmark and write results"""
+    parser = argparse.ArgumentParser(description="Benchmark classifier accuracy and latency")
+    parser.add_argument("--tiers", nargs="+", choices=TIERS, default=TIERS)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per command")
+    parser.add_argument("--corpus", default=CORPUS_FILE)
+    parser.add_argument("--responses", default=RECORDED_RESPONSES_FILE)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds the LLM stub waits per request")
+    parser.add_argument("--output", help="Results file (default: evaluation/results/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.tiers, args.repeat, args.corpus, args.responses, args.llm_latency)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    write_json(output, results)
+
+    print(format_summary(results))
+    print(f"📊 Results written to {output}")
+
+    if args.compare:
+        print(compare(load_json(args.compare, default={"tiers": {}}), results))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
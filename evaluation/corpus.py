@@ -0,0 +1,183 @@
+"""
+Evaluation Corpus
+Labeled commands seeded from memory.json command history and assistant logs
+
+Usage:
+    python -m evaluation.corpus            # merge new commands into evaluation/corpus.json
+"""
+import os
+import re
+import ast
+import sys
+import glob
+import json
+import argparse
+from config.settings import Settings
+from core.classification_cache import normalize_command
+from utils.helpers import load_json
+
+EVALUATION_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_FILE = os.path.join(EVALUATION_DIR, "corpus.json")
+RECORDED_RESPONSES_FILE = os.path.join(EVALUATION_DIR, "recorded_responses.json")
+LOG_PATTERN = os.path.join(Settings.BASE_DIR, "logs", "assistant_*.log")
+
+_PROCESSING = re.compile(r" - INFO - Processing command: (.*)$")
+_DECISION = re.compile(r" - INFO - Intent: (\w*), Action: (\w*), Confidence:")
+_LLM_RESULT = re.compile(r" - INFO - Groq Classification: (\{.*\})$")
+
+def _label(intent, action):
+    """Normalize an (intent, action) label; unknown has no action"""
+    if not intent or intent == "unknown":
+        return "unknown", None
+    return intent, action or None
+
+def read_command_history(memory_file=None):
+    """
+    Read successfully executed commands from memory.json
+
+    Returns:
+        list: Dicts with text, intent, action, source
+    """
+    memory = load_json(memory_file or Settings.MEMORY_FILE, default={})
+    samples = []
+    for item in memory.get("command_history", []):
+        if not item.get("success") or not item.get("command"):
+            continue
+        intent, action = _label(item.get("action_type"), item.get("action_name"))
+        samples.append({"text": item["command"], "intent": intent, "action": action, "source": "history"})
+    return samples
+
+def read_logs(pattern=None):
+    """
+    Read processed commands from assistant logs
+
+    Each "Processing command:" line is paired with the decision logged after
+    it and, when the LLM answered, its raw classification.
+
+    Returns:
+        list: Dicts with text, intent, action, source and llm_response (or None)
+    """
+    samples = []
+    for path in sorted(glob.glob(pattern or LOG_PATTERN)):
+        current = None
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                match = _PROCESSING.search(line)
+                if match:
+                    current = {"text": match.group(1).strip(), "llm_response": None, "source": "log"}
+                    continue
+                if current is None:
+                    continue
+
+                match = _LLM_RESULT.search(line)
+                if match:
+                    try:
+                        current["llm_response"] = ast.literal_eval(match.group(1))
+                    except (ValueError, SyntaxError):
+                        pass
+                    continue
+
+                match = _DECISION.search(line)
+                if match:
+                    current["intent"], current["action"] = _label(match.group(1), match.group(2))
+                    samples.append(current)
+                    current = None
+    return samples
+
+def load_corpus(path=None):
+    """
+    Load the labeled corpus
+
+    Returns:
+        list: Corpus entries (text, intent, action, count, sources, reviewed)
+    """
+    return load_json(path or CORPUS_FILE, default={}).get("commands", [])
+
+def build_corpus(existing, samples):
+    """
+    Merge samples into the corpus
+
+    Reviewed entries keep their labels. Otherwise a successfully executed
+    command (history) outranks a logged decision, and a logged "unknown"
+    never overrides a known label - it's usually the classifier's miss.
+    Unknown-only commands stay unlabeled (intent null) until reviewed.
+
+    Args:
+        existing: Current corpus entries
+        samples: Dicts from read_command_history() / read_logs()
+
+    Returns:
+        list: Corpus entries sorted by text
+    """
+    # Counts and sources are recomputed from the samples; hand-added
+    # ("manual") entries keep theirs
+    priority = {"history": 2, "log": 1}
+    corpus = {}
+    for entry in existing:
+        manual = [source for source in entry.get("sources", []) if source not in priority]
+        entry = dict(entry, count=entry.get("count", 1) if manual else 0, sources=manual)
+        corpus[normalize_command(entry["text"])] = entry
+
+    for sample in samples:
+        key = normalize_command(sample["text"])
+        if not key:
+            continue
+
+        entry = corpus.setdefault(key, {
+            "text": key, "intent": None, "action": None,
+            "count": 0, "sources": [], "reviewed": False, "_priority": 0
+        })
+        entry["count"] += 1
+        if sample["source"] not in entry["sources"]:
+            entry["sources"].append(sample["source"])
+
+        if entry.get("reviewed") or sample["intent"] == "unknown":
+            continue
+        if priority[sample["source"]] >= entry.get("_priority", 0):
+            entry["intent"], entry["action"] = sample["intent"], sample["action"]
+            entry["_priority"] = priority[sample["source"]]
+
+    entries = []
+    for entry in corpus.values():
+        entry.pop("_priority", None)
+        entry["sources"] = sorted(entry["sources"])
+        entries.append(entry)
+    return sorted(entries, key=lambda e: e["text"])
+
+def build_recorded_responses(existing, samples):
+    """Map command text -> the LLM's recorded JSON answer (latest wins)"""
+    responses = dict(existing)
+    for sample in samples:
+        if sample.get("llm_response"):
+            responses[normalize_command(sample["text"])] = json.dumps(sample["llm_response"])
+    return dict(sorted(responses.items()))
+
+def write_json(path, data):
+    """Write stable, diff-friendly JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
+
+def main(argv=None):
+    """Refresh the corpus and recorded responses from history and logs"""
+    parser = argparse.ArgumentParser(description="Build the classifier evaluation corpus")
+    parser.add_argument("--memory", default=Settings.MEMORY_FILE, help="memory.json with command_history")
+    parser.add_argument("--logs", default=LOG_PATTERN, help="Glob of assistant log files")
+    parser.add_argument("--corpus", default=CORPUS_FILE)
+    parser.add_argument("--responses", default=RECORDED_RESPONSES_FILE)
+    args = parser.parse_args(argv)
+
+    samples = read_command_history(args.memory) + read_logs(args.logs)
+    corpus = build_corpus(load_corpus(args.corpus), samples)
+    responses = build_recorded_responses(load_json(args.responses, default={}), samples)
+
+    write_json(args.corpus, {"commands": corpus})
+    write_json(args.responses, responses)
+
+    unlabeled = sum(1 for entry in corpus if entry["intent"] is None)
+    print(f"📚 {len(corpus)} commands ({unlabeled} need a label) from {len(samples)} samples")
+    print(f"📼 {len(responses)} recorded LLM responses")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,19 +5,35 @@ Main Entry Point
 A modular, intelligent voice-controlled assistant with Groq API
 """
 import sys
+import time
 import signal
+import argparse
 from datetime import datetime
+
+# The profiler has to be installed before any project module is imported
+from utils.startup_profiler import startup_profiler
+if "--profile-startup" in sys.argv:
+    startup_profiler.install()
+
 from config.settings import Settings
+from config.command_catalog import command_catalog
 from utils.logger import logger
-from core.wake_word_detector import wake_detector
-from core.text_to_speech import tts
+from core.wake_word_detector import wake_detector, ACTIVATION_PROMPT, REPEAT_PROMPT
+from core.voice_listener import listener
+from core.text_to_speech import tts, PRIORITY_URGENT
 from core.command_classifier import classifier
+from core.speculative import SpeculativeClassifier
+from core.pipeline import Pipeline
 from memory.memory_manager import memory
 from actions.app_launcher import app_launcher
 from actions.web_opener import web_opener
 from actions.system_info import system_info
 from actions.file_manager import file_manager
 from actions.workflow_executor import workflow_executor
+from utils.warmup import WarmupScheduler
+
+# Commands that end the session instead of being classified
+EXIT_COMMANDS = ["exit", "quit", "goodbye", "bye", "stop"]
 
 class VoiceAssistant:
     """Main Voice Assistant Class"""
@@ -34,78 +50,203 @@ class VoiceAssistant:
         # Ensure data directory exists
         Settings.ensure_data_dir()
         
+        # Subsystems that don't depend on each other are built in parallel
+        self.warmup = WarmupScheduler()
+        self.warmup.add("listener")
+        self.warmup.add("tts")
+        self.warmup.add("keyword_spotter")
+        self.warmup.add("wake_detector", depends_on=["listener", "tts", "keyword_spotter"])
+        self.warmup.add("classifier")
+        self.warmup.add("embedding_classifier")
+        self.warmup.add("vector_store")
+        self.warmup.add("memory")
+        
+        # Commands handled and time spent on them (reported when a headless input ends)
+        self.stats = {"commands": 0, "command_seconds": 0.0}
+        self.pipeline = None
+        
+        # Classify interim transcripts while the command is still being spoken
+        self.speculator = SpeculativeClassifier(classifier) if Settings.SPECULATIVE_CLASSIFICATION else None
+        
         logger.info("Voice Assistant initialized successfully")
     
     def start(self):
         """Start the voice assistant"""
         self.running = True
         
+        # Only the wake-word loop's dependencies are waited for; the LLM client
+        # and vector store keep warming up in the background
+        self.warmup.start()
+        if not self.warmup.wait(["listener", "tts", "wake_detector"]):
+            logger.warning("Wake-word subsystems failed to warm up; they will be retried on first use")
+        
         # Welcome message
         welcome_msg = f"Hello! I am {self.assistant_name}, your voice assistant. Say 'Hey {self.assistant_name}' to activate me."
         tts.speak(welcome_msg)
+        tts.prerender(self.fixed_phrases(welcome_msg))
         
         logger.info("Voice Assistant started")
         print("\n" + "="*60)
         print(f"🤖 {self.assistant_name} Voice Assistant")
         print("="*60)
         print(f"💡 Say 'Hey {self.assistant_name}' to activate")
+        print(f"💡 Or say it all at once: 'Hey {self.assistant_name}, open notepad'")
         print("💡 Say 'exit' or 'quit' to stop")
         print("="*60 + "\n")
         
         # Main loop
+        started = time.monotonic()
         try:
-            while self.running:
-                # Listen for wake word
-                if wake_detector.listen_for_activation():
-                    wake_detector.activate()
-                    self.handle_command_session()
-        
+            if Settings.ENABLE_PIPELINE:
+                self.run_pipeline()
+            else:
+                self.run_serial()
         except KeyboardInterrupt:
-            self.stop()
+            pass
+        
+        if listener.exhausted:
+            self.report_throughput(time.monotonic() - started)
+        self.stop()
+    
+    def fixed_phrases(self, welcome_msg):
+        """Replies said often enough to keep rendered in the speech cache"""
+        catalog = command_catalog.snapshot()
+        phrases = [
+            welcome_msg,
+            ACTIVATION_PROMPT,
+            REPEAT_PROMPT,
+            "Goodbye! Have a great day!",
+            "Sorry, I encountered an error.",
+            "I'm not sure what you want me to do. Could you please rephrase?",
+        ]
+        phrases += [f"Opening {name}" for name in list(catalog.applications) + list(catalog.websites)]
+        return phrases
+    
+    def run_serial(self):
+        """Listen, recognize, classify and execute one command at a time"""
+        while self.running:
+            # Listen for wake word
+            if wake_detector.listen_for_activation():
+                wake_detector.activate()
+                self.handle_command_session()
+            elif listener.exhausted:
+                break
+    
+    def run_pipeline(self):
+        """
+        Listen, recognize, classify and execute on separate stages
+        
+        Audio capture has its own thread already; here listening for the
+        next command carries on while earlier ones are still being
+        recognized, classified or executed. Actions run on this thread.
+        """
+        self.pipeline = Pipeline(
+            source=("listen", self._listen_stage),
+            stages=[
+                ("recognize", self._recognize_stage),
+                ("classify", self._classify_stage),
+            ],
+            sink=("execute", self._execute_stage)
+        )
+        self.pipeline.run()
+    
+    def _listen_stage(self, emit):
+        """Wake word and command capture; emits commands not yet recognized"""
+        while self.running:
+            if not wake_detector.listen_for_activation():
+                if listener.exhausted:
+                    return
+                continue
+            
+            wake_detector.activate()
+            on_partial = None
+            if self.speculator:
+                self.speculator.reset()
+                on_partial = self.speculator.feed_partial
+            
+            item = wake_detector.capture_command(on_partial=on_partial)
+            speculation = self.speculator.detach() if self.speculator else None
+            wake_detector.deactivate()
+            
+            if item:
+                item["speculation"] = speculation
+                emit(item)
+    
+    def _recognize_stage(self, item):
+        """Transcribe the captured command"""
+        command = item.get("text") or listener.recognize(item["utterance"])
+        if not command:
+            tts.speak(REPEAT_PROMPT, priority=PRIORITY_URGENT)
+            return None
+        
+        logger.info(f"Command received: {command}")
+        item["text"] = command
+        item["recognized_at"] = time.monotonic()
+        return item
+    
+    def _classify_stage(self, item):
+        """Classify the command (exit commands pass straight through)"""
+        if item["text"] in EXIT_COMMANDS:
+            item["exit"] = True
+        else:
+            item["classification"] = self.classify_command(item["text"], item.get("speculation"))
+        return item
+    
+    def _execute_stage(self, item):
+        """Run the action"""
+        try:
+            if item.get("exit"):
+                tts.speak("Goodbye! Have a great day!", wait=True)
+                self.running = False
+                self.pipeline.stop()
+                return
+            self.complete_command(item["text"], item["classification"], item["recognized_at"])
+        except Exception as e:
+            logger.error(f"Error executing command: {e}")
+            print(f"❌ Error: {e}")
+            # No deactivate() here: the listen stage already did that after
+            # capturing this command and may be in the next session by now
+            tts.speak("Sorry, I encountered an error.")
+    
+    def report_throughput(self, elapsed):
+        """Summarize a headless run (WAV or text input played to the end)"""
+        commands = self.stats["commands"]
+        print("\n" + "="*60)
+        print(f"📊 Input finished: {commands} command(s) in {elapsed:.2f}s")
+        if commands:
+            print(f"📊 {commands / elapsed:.2f} commands/s end to end, "
+                  f"{self.stats['command_seconds'] / commands * 1000:.0f}ms per command after recognition")
+        if self.pipeline:
+            for name, stats in self.pipeline.get_statistics().items():
+                print(f"📊   {name:<10} {stats['processed']:>4} items, busy {stats['busy_s']:.2f}s, "
+                      f"blocked {stats['blocked_s']:.2f}s, max backlog {stats['max_backlog']}")
+        print("="*60)
+        logger.info(f"Headless run: {commands} commands in {elapsed:.2f}s")
     
     def handle_command_session(self):
         """Handle a command session after wake word is detected"""
         try:
             # Get command from user
-            command = wake_detector.wait_for_command()
+            on_partial = None
+            if self.speculator:
+                self.speculator.reset()
+                on_partial = self.speculator.feed_partial
+            command = wake_detector.wait_for_command(on_partial=on_partial)
+            speculation = self.speculator.detach() if self.speculator else None
             
             if not command:
                 wake_detector.deactivate()
                 return
             
             # Check for exit commands
-            if command in ["exit", "quit", "goodbye", "bye", "stop"]:
-                tts.speak("Goodbye! Have a great day!")
+            if command in EXIT_COMMANDS:
+                tts.speak("Goodbye! Have a great day!", wait=True)
                 self.stop()
                 return
             
-            # Classify command using Groq
-            logger.info(f"Processing command: {command}")
-            print(f"\n{'='*60}")
-            print(f"🎯 Processing: {command}")
-            print(f"{'='*60}")
-            
-            classification = classifier.classify(command)
-            
-            print(f"📋 Intent: {classification.get('intent')}")
-            print(f"📋 Action: {classification.get('action')}")
-            print(f"📋 Confidence: {classification.get('confidence')}")
-            print(f"{'='*60}\n")
-            
-            # Execute action based on classification
-            success = self.execute_action(classification, command)
-            
-            # Record in memory
-            if success and Settings.ENABLE_MEMORY:
-                try:
-                    memory.record_command(
-                        command=command,
-                        action_type=classification.get("intent"),
-                        action_name=classification.get("action"),
-                        success=True
-                    )
-                except Exception as e:
-                    logger.warning(f"Could not record in memory: {e}")
+            command_started = time.monotonic()
+            classification = self.classify_command(command, speculation)
+            self.complete_command(command, classification, command_started)
             
             # Deactivate after command
             wake_detector.deactivate()
@@ -116,6 +257,61 @@ class VoiceAssistant:
             tts.speak("Sorry, I encountered an error.")
             wake_detector.deactivate()
     
+    def classify_command(self, command, speculation=None):
+        """
+        Classify a recognized command
+        
+        Args:
+            command: Command text
+            speculation: The command's speculation from SpeculativeClassifier.detach()
+        
+        Returns:
+            dict: Classification result
+        """
+        # Classify command using Groq
+        logger.info(f"Processing command: {command}")
+        print(f"\n{'='*60}")
+        print(f"🎯 Processing: {command}")
+        print(f"{'='*60}")
+        
+        if self.speculator:
+            classification = self.speculator.resolve_detached(speculation, command)
+        else:
+            classification = classifier.classify(command)
+        
+        print(f"📋 Intent: {classification.get('intent')}")
+        print(f"📋 Action: {classification.get('action')}")
+        print(f"📋 Confidence: {classification.get('confidence')}")
+        print(f"📋 Tier: {classification.get('tier')}")
+        print(f"{'='*60}\n")
+        return classification
+    
+    def complete_command(self, command, classification, started):
+        """
+        Execute a classified command and record it
+        
+        Args:
+            command: Command text
+            classification: Classification result
+            started: time.monotonic() when the command was recognized
+        """
+        # Execute action based on classification
+        success = self.execute_action(classification, command)
+        self.stats["commands"] += 1
+        self.stats["command_seconds"] += time.monotonic() - started
+        
+        # Record in memory
+        if success and Settings.ENABLE_MEMORY:
+            try:
+                memory.record_command(
+                    command=command,
+                    action_type=classification.get("intent"),
+                    action_name=classification.get("action"),
+                    success=True
+                )
+            except Exception as e:
+                logger.warning(f"Could not record in memory: {e}")
+    
     def execute_action(self, classification, original_command):
         """
         Execute action based on classification
@@ -174,32 +370,33 @@ class VoiceAssistant:
     def handle_open_app(self, app_name):
         """Handle opening an application"""
         print(f"  → Launching: {app_name}")
-        tts.speak(f"Opening {app_name}")
+        # Keyed with the outcome, so "Opening" is skipped if the app is up before it is spoken
+        tts.speak(f"Opening {app_name}", key=f"open:{app_name}")
         
         success = app_launcher.launch(app_name)
         
         if success:
             print(f"  ✅ {app_name} opened successfully")
-            tts.speak(f"{app_name} opened successfully")
+            tts.speak(f"{app_name} opened successfully", key=f"open:{app_name}")
         else:
             print(f"  ❌ Failed to open {app_name}")
-            tts.speak(f"Sorry, I couldn't open {app_name}")
+            tts.speak(f"Sorry, I couldn't open {app_name}", key=f"open:{app_name}")
         
         return success
     
     def handle_open_website(self, site_name):
         """Handle opening a website"""
         print(f"  → Opening website: {site_name}")
-        tts.speak(f"Opening {site_name}")
+        tts.speak(f"Opening {site_name}", key=f"open:{site_name}")
         
         success = web_opener.open_website(site_name)
         
         if success:
             print(f"  ✅ {site_name} opened successfully")
-            tts.speak(f"{site_name} opened in browser")
+            tts.speak(f"{site_name} opened in browser", key=f"open:{site_name}")
         else:
             print(f"  ❌ Failed to open {site_name}")
-            tts.speak(f"Sorry, I couldn't open {site_name}")
+            tts.speak(f"Sorry, I couldn't open {site_name}", key=f"open:{site_name}")
         
         return success
     
@@ -240,22 +437,22 @@ class VoiceAssistant:
             # Extract folder name from command (simplified)
             folder_name = f"Folder_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
             print(f"  → Creating folder: {folder_name}")
-            tts.speak(f"Creating folder")
+            tts.speak(f"Creating folder", key="create_folder")
             
             success = file_manager.create_folder(folder_name)
             
             if success:
                 print(f"  ✅ Folder created: {folder_name}")
-                tts.speak("Folder created successfully")
+                tts.speak("Folder created successfully", key="create_folder")
             else:
                 print(f"  ❌ Failed to create folder")
-                tts.speak("Sorry, I couldn't create the folder")
+                tts.speak("Sorry, I couldn't create the folder", key="create_folder")
             
             return success
         
         elif operation == "clean_downloads":
             print(f"  → Cleaning downloads folder")
-            tts.speak("Cleaning your downloads folder")
+            tts.speak("Cleaning your downloads folder", key="clean_downloads")
             
             stats = file_manager.clean_downloads()
             
@@ -267,11 +464,11 @@ class VoiceAssistant:
                 print(f"     Videos: {stats['videos']}")
                 print(f"     Archives: {stats['archives']}")
                 print(f"     Others: {stats['others']}")
-                tts.speak(f"Organized {total} files in your downloads folder")
+                tts.speak(f"Organized {total} files in your downloads folder", key="clean_downloads")
                 return True
             else:
                 print(f"  ❌ Failed to clean downloads")
-                tts.speak("Sorry, I couldn't clean the downloads folder")
+                tts.speak("Sorry, I couldn't clean the downloads folder", key="clean_downloads")
                 return False
         
         print(f"  ❌ Unknown file operation: {operation}")
@@ -295,6 +492,8 @@ class VoiceAssistant:
         """Stop the voice assistant"""
         self.running = False
         logger.info("Voice Assistant stopping...")
+        # Let the last replies finish (speech runs on its own thread)
+        tts.flush(timeout=Settings.TTS_MAX_AGE)
         print("\n" + "="*60)
         print("👋 Thank you for using Zeeshan Voice Assistant!")
         print("="*60 + "\n")
@@ -305,8 +504,78 @@ def signal_handler(sig, frame):
     print("\n\n⚠️  Interrupt received. Shutting down...")
     sys.exit(0)
 
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description=f"{Settings.ASSISTANT_NAME} Voice Assistant")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Build every subsystem, print a startup waterfall and exit"
+    )
+    parser.add_argument(
+        "--wav",
+        nargs="+",
+        metavar="PATH",
+        help="Play WAV files (or directories of them) instead of listening to the microphone"
+    )
+    parser.add_argument(
+        "--text",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help="Read one transcript per line from FILE (or stdin) instead of listening"
+    )
+    parser.add_argument(
+        "--no-tts",
+        action="store_true",
+        help="Print replies instead of speaking them"
+    )
+    parser.add_argument(
+        "--recalibrate",
+        action="store_true",
+        help="Measure ambient noise again instead of using the cached calibration"
+    )
+    parser.add_argument(
+        "--profile-output",
+        default=Settings.STARTUP_PROFILE_FILE,
+        help="Where to write the startup profile JSON"
+    )
+    return parser.parse_args(argv)
+
+def profile_startup(output_file):
+    """Construct every singleton under the profiler and report the timeline"""
+    from utils.service_registry import registry
+    
+    with startup_profiler.measure("VoiceAssistant()", kind="step"):
+        VoiceAssistant()
+    
+    for name in registry.names():
+        try:
+            registry.get(name)
+        except Exception as e:
+            logger.error(f"Failed to build {name} while profiling: {e}")
+    
+    startup_profiler.uninstall()
+    print(startup_profiler.format_waterfall())
+    startup_profiler.save(output_file)
+    print(f"📊 Startup profile written to {output_file}")
+
 def main():
     """Main function"""
+    args = parse_args()
+    if args.recalibrate:
+        Settings.RECALIBRATE_AUDIO = True
+    if args.wav:
+        Settings.INPUT_MODE, Settings.INPUT_PATHS = "wav", args.wav
+    elif args.text:
+        Settings.INPUT_MODE, Settings.INPUT_PATHS = "text", [args.text]
+    if args.no_tts:
+        Settings.ENABLE_TTS = False
+    
+    if args.profile_startup:
+        profile_startup(args.profile_output)
+        return
+    
     # Register signal handler for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     
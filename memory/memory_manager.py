@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from collections import Counter
 from config.settings import Settings
 from utils.logger import logger
+from utils.service_registry import registry
 from utils.helpers import load_json, save_json, get_timestamp
 from memory.vector_store import vector_store
 
@@ -231,4 +232,4 @@ class MemoryManager:
         }
 
 # Global memory manager instance
-memory = MemoryManager()
\ No newline at end of file
+memory = registry.register("memory", MemoryManager)
\ No newline at end of file
@@ -4,17 +4,19 @@ Stores and retrieves user behavior patterns
 """
 import os
 import json
+import importlib.util
 from datetime import datetime, timedelta
 from config.settings import Settings
 from utils.logger import logger
+from utils.service_registry import registry
 
-try:
-    import chromadb
-    from chromadb.config import Settings as ChromaSettings
-    from sentence_transformers import SentenceTransformer
-    VECTOR_STORE_AVAILABLE = True
-except ImportError:
-    VECTOR_STORE_AVAILABLE = False
+# Only check that the packages exist here - importing them takes ~25 seconds,
+# so the actual import is deferred until the vector store is first used
+VECTOR_STORE_AVAILABLE = all(
+    importlib.util.find_spec(module) is not None
+    for module in ("chromadb", "sentence_transformers")
+)
+if not VECTOR_STORE_AVAILABLE:
     logger.warning("ChromaDB or SentenceTransformers not available. Memory features limited.")
 
 class VectorStore:
@@ -37,8 +39,10 @@ class VectorStore:
     
     def _initialize_store(self):
         """Initialize ChromaDB and sentence transformer"""
-        # Initialize sentence transformer for embeddings
-        self.encoder = SentenceTransformer('all-MiniLM-L6-v2')
+        import chromadb
+        
+        # Sentence transformer shared with the embedding classifier
+        self.encoder = registry.get("sentence_model")
         
         # Initialize ChromaDB
         db_path = os.path.join(Settings.DATA_DIR, "chroma_db")
@@ -179,4 +183,4 @@ class VectorStore:
             return []
 
 # Global vector store instance
-vector_store = VectorStore()
\ No newline at end of file
+vector_store = registry.register("vector_store", VectorStore)
\ No newline at end of file
@@ -0,0 +1,16 @@
+import os
+import sys
+import pytest
+
+# Run from anywhere: the packages live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Settings
+
+@pytest.fixture
+def classifier(tmp_path, monkeypatch):
+    """CommandClassifier with no LLM configured and a throwaway cache"""
+    monkeypatch.setattr(Settings, "USE_GROQ", False)
+    monkeypatch.setattr(Settings, "CLASSIFICATION_CACHE_FILE", str(tmp_path / "cache.json"))
+    from core.command_classifier import CommandClassifier
+    return CommandClassifier()
@@ -0,0 +1,76 @@
+"""Tests for the ASR backends and their race"""
+import time
+import pytest
+import speech_recognition as sr
+from core.asr_backends import ASRBackend, GoogleBackend, RaceBackend, Transcript, GOOGLE_DEFAULT_CONFIDENCE
+
+class FakeRecognizer:
+    """Stands in for sr.Recognizer with a canned Google response"""
+
+    def __init__(self, result):
+        self.result = result
+
+    def recognize_google(self, audio, show_all=False):
+        return self.result
+
+class FixedBackend(ASRBackend):
+    """Answers with a fixed transcript after a delay"""
+
+    def __init__(self, name, text, confidence, delay=0.0):
+        self.name = name
+        self.text = text
+        self.confidence = confidence
+        self.delay = delay
+
+    def _recognize(self, audio):
+        time.sleep(self.delay)
+        return Transcript(self.text, self.confidence, self.name)
+
+def google_without_confidence(text):
+    return GoogleBackend(FakeRecognizer({"alternative": [{"transcript": text}]}))
+
+def test_backend_without_recognize_cannot_be_built():
+    class Incomplete(ASRBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_google_confidence_defaults_below_race_threshold():
+    transcript = google_without_confidence("open notepad").recognize(None)
+
+    assert transcript.confidence == GOOGLE_DEFAULT_CONFIDENCE
+    assert transcript.confidence < RaceBackend([]).min_confidence
+
+def test_google_without_result_is_unknown_value():
+    with pytest.raises(sr.UnknownValueError):
+        GoogleBackend(FakeRecognizer([])).recognize(None)
+
+def test_unscored_google_answer_does_not_beat_confident_local_result():
+    race = RaceBackend([
+        FixedBackend("vosk", "open notepad", 0.9, delay=0.1),
+        google_without_confidence("open note pad"),
+    ])
+
+    transcript = race.recognize(None)
+
+    assert transcript.backend == "vosk"
+    assert race.wins == {"vosk": 1, "google": 0}
+
+def test_unscored_google_answer_wins_over_unconfident_local_result():
+    race = RaceBackend([
+        FixedBackend("vosk", "open no pad", 0.3, delay=0.05),
+        google_without_confidence("open notepad"),
+    ])
+
+    assert race.recognize(None).text == "open notepad"
+
+def test_confident_answer_ends_race_without_waiting():
+    race = RaceBackend([
+        FixedBackend("vosk", "open notepad", 0.9),
+        FixedBackend("google", "open notepad", 0.95, delay=2.0),
+    ])
+
+    started = time.monotonic()
+    assert race.recognize(None).backend == "vosk"
+    assert time.monotonic() - started < 1.0
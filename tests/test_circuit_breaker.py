@@ -0,0 +1,88 @@
+"""Tests for the circuit breaker"""
+import time
+import threading
+from utils.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+class BlockingProbe:
+    """Probe that waits to be released, then fails or succeeds as told"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.succeed = False
+        self.threads = set()
+
+    def __call__(self):
+        self.threads.add(threading.current_thread().ident)
+        self.started.set()
+        self.release.wait(5)
+        self.release.clear()
+        if not self.succeed:
+            raise ConnectionError("still down")
+
+def tripped_breaker(probe):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.01, probe=probe, max_reset_timeout=0.01)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert probe.started.wait(1)
+    assert breaker.state == HALF_OPEN
+    return breaker
+
+def test_opens_after_consecutive_failures_only():
+    breaker = CircuitBreaker("test", failure_threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+def test_late_failure_during_probe_does_not_start_a_second_probe():
+    probe = BlockingProbe()
+    breaker = tripped_breaker(probe)
+
+    breaker.record_failure()   # A request sent before the circuit opened
+    probe.release.set()
+    time.sleep(0.1)
+    probe.succeed = True
+    probe.release.set()
+    time.sleep(0.1)
+
+    assert len(probe.threads) == 1
+    assert breaker.trips == 1
+    assert breaker.state == CLOSED
+
+def test_late_success_does_not_close_under_a_failing_probe():
+    probe = BlockingProbe()
+    breaker = tripped_breaker(probe)
+
+    breaker.record_success()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    probe.release.set()
+    time.sleep(0.05)
+    assert breaker.state in (OPEN, HALF_OPEN)
+    assert not breaker.allow()
+
+    probe.succeed = True
+    probe.release.set()
+    time.sleep(0.1)
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+def test_without_probe_one_trial_call_is_let_through():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.02)
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
@@ -0,0 +1,60 @@
+"""Tests for the persistent LRU/TTL classification cache"""
+from core.classification_cache import ClassificationCache, normalize_command
+
+RESULT = {"intent": "open_app", "action": "notepad", "confidence": 0.9}
+
+def make_cache(tmp_path, **kwargs):
+    return ClassificationCache(str(tmp_path / "cache.json"), save_interval=0, **kwargs)
+
+def test_keys_are_normalized():
+    assert normalize_command("  Open, NOTEPAD!  ") == "open notepad"
+    assert normalize_command("what's the time?") == "what's the time"
+
+def test_hit_returns_a_copy(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("Open Notepad", RESULT)
+
+    hit = cache.get("open notepad!")
+    hit["action"] = "changed"
+
+    assert cache.get("open notepad") == RESULT
+    assert cache.get_statistics()["hits"] == 2
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.put("one", RESULT)
+    cache.put("two", RESULT)
+    cache.get("one")
+    cache.put("three", RESULT)
+
+    assert cache.get("two") is None
+    assert cache.get("one") == RESULT
+    assert cache.get("three") == RESULT
+
+def test_expired_entries_are_dropped(tmp_path, monkeypatch):
+    import core.classification_cache as module
+
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    now = [1000.0]
+    monkeypatch.setattr(module.time, "time", lambda: now[0])
+    cache.put("open notepad", RESULT)
+
+    now[0] += 61
+    assert cache.get("open notepad") is None
+
+def test_entries_survive_a_restart(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("open notepad", RESULT)
+    cache.flush()
+
+    assert make_cache(tmp_path).get("open notepad") == RESULT
+
+def test_changed_fingerprint_clears_the_cache(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.validate("catalog-1")
+    cache.put("open notepad", RESULT)
+
+    cache.validate("catalog-1")
+    assert cache.get("open notepad") == RESULT
+    cache.validate("catalog-2")
+    assert cache.get("open notepad") is None
@@ -0,0 +1,51 @@
+"""Tests for batch classification"""
+import time
+from types import SimpleNamespace
+
+def slow_llm(classifier, monkeypatch, seconds=0.2):
+    """Pretend an LLM is configured and make each request take a while"""
+    calls = []
+
+    def classify_with_llm(command_text, fallback=None, streaming=None):
+        calls.append(command_text)
+        time.sleep(seconds)
+        return {"intent": "unknown", "action": command_text, "parameters": {}, "confidence": 0.9}
+
+    monkeypatch.setattr(classifier, "llm_client", SimpleNamespace(model="stand-in"))
+    monkeypatch.setattr(classifier, "_classify_with_groq", classify_with_llm)
+    return calls
+
+def test_results_come_back_in_input_order_with_duplicates(classifier):
+    commands = ["open notepad", "what time is it", "Open Notepad!", "open gmail"]
+
+    results = list(classifier.classify_many(commands, max_workers=2))
+
+    assert [command for command, _ in results] == commands
+    assert [r["action"] for _, r in results] == ["notepad", "time", "notepad", "gmail"]
+
+def test_breaking_out_early_does_not_wait_for_queued_jobs(classifier, monkeypatch):
+    calls = slow_llm(classifier, monkeypatch)
+    flushes = []
+    monkeypatch.setattr(classifier.cache, "flush", lambda: flushes.append(1))
+    commands = [f"command number {i}" for i in range(20)]
+
+    started = time.monotonic()
+    for _ in classifier.classify_many(commands, max_workers=1, requests_per_minute=60, use_local_tiers=False):
+        break
+    elapsed = time.monotonic() - started
+
+    # Twenty rate-limited requests would take about 20 s; only the first one is waited for
+    assert elapsed < 1.0
+    assert flushes == [1]
+    time.sleep(1.5)
+    assert len(calls) == 1
+
+def test_closing_the_generator_releases_the_batch(classifier, monkeypatch):
+    slow_llm(classifier, monkeypatch, seconds=0.05)
+    batch = classifier.classify_many(["a b c", "d e f", "g h i"], max_workers=1, use_local_tiers=False)
+
+    next(batch)
+    started = time.monotonic()
+    batch.close()
+
+    assert time.monotonic() - started < 0.5
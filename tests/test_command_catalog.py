@@ -0,0 +1,45 @@
+"""Tests for the shared command catalog and its hot reload"""
+import os
+import json
+from config.command_catalog import CommandCatalog
+
+def write_config(path, apps, mtime):
+    path.write_text(json.dumps({"applications": {name: {"keywords": [name], "command": name} for name in apps}}))
+    os.utime(path, (mtime, mtime))
+
+def test_reload_installs_a_new_snapshot(tmp_path):
+    config = tmp_path / "commands_config.json"
+    write_config(config, ["notepad"], 1000)
+    catalog = CommandCatalog(str(config), check_interval=0)
+    first = catalog.snapshot()
+
+    write_config(config, ["notepad", "calculator"], 2000)
+    second = catalog.snapshot()
+
+    assert second is not first
+    assert set(second.applications) == {"notepad", "calculator"}
+    assert set(first.applications) == {"notepad"}
+
+def test_touched_but_unchanged_file_leaves_snapshot_alone(tmp_path):
+    config = tmp_path / "commands_config.json"
+    write_config(config, ["notepad"], 1000)
+    catalog = CommandCatalog(str(config), check_interval=0)
+    first = catalog.snapshot()
+
+    write_config(config, ["notepad"], 2000)
+
+    assert catalog.refresh() is False
+    assert catalog.snapshot() is first
+    assert first.mtime == 1000   # Snapshots are shared; they never change after they are built
+    assert catalog.refresh() is False
+
+def test_broken_file_keeps_previous_snapshot(tmp_path):
+    config = tmp_path / "commands_config.json"
+    write_config(config, ["notepad"], 1000)
+    catalog = CommandCatalog(str(config), check_interval=0)
+    first = catalog.snapshot()
+
+    config.write_text("{ half written")
+    os.utime(config, (2000, 2000))
+
+    assert catalog.snapshot() is first
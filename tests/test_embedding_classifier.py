@@ -0,0 +1,30 @@
+"""Tests for the offline embedding classifier tier"""
+import pytest
+from core.embedding_classifier import EmbeddingClassifier
+
+# VoiceAssistant.execute_action only acts on classifications at or above this
+ACTION_THRESHOLD = 0.5
+
+@pytest.fixture(scope="module")
+def embedding():
+    classifier = EmbeddingClassifier()
+    if not classifier.available:
+        pytest.skip("embedding classifier unavailable")
+    return classifier
+
+@pytest.mark.parametrize("command", ["open downloads", "show my downloads", "open the downloads folder"])
+def test_loose_match_is_not_actionable(embedding, command):
+    result = embedding.classify(command)
+    assert result["action"] != "clean_downloads" or result["confidence"] < ACTION_THRESHOLD
+
+def test_catalog_phrase_itself_is_actionable(embedding):
+    result = embedding.classify("clean downloads")
+    assert result["action"] == "clean_downloads"
+    assert result["confidence"] >= ACTION_THRESHOLD
+
+def test_unrelated_text_is_unknown(embedding):
+    assert embedding.classify("zzzz qqqq")["intent"] == "unknown"
+
+def test_open_downloads_does_not_clean_downloads_without_llm(classifier):
+    result = classifier.classify("open downloads")
+    assert not (result["action"] == "clean_downloads" and result["confidence"] >= ACTION_THRESHOLD)
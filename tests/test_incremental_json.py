@@ -0,0 +1,64 @@
+"""Tests for the streaming JSON field parser"""
+import json
+import pytest
+from core.incremental_json import IncrementalJSONParser
+
+DOCUMENT = {
+    "intent": "open_app",
+    "action": "notepad",
+    "confidence": 0.92,
+    "params": {"path": "C:\\\\Users\\\\me", "tags": ["a", "}"]},
+    "note": "say \"hi\", then {leave}",
+    "ok": True,
+    "extra": None
+}
+TEXT = "Sure! ```json\n" + json.dumps(DOCUMENT) + "\n``` trailing {\"ignored\": 1}"
+
+def test_whole_document_in_one_chunk():
+    parser = IncrementalJSONParser()
+    completed = parser.feed(TEXT)
+
+    assert completed == DOCUMENT
+    assert parser.fields == DOCUMENT
+    assert parser.done
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 13])
+def test_any_chunk_boundaries_give_the_same_fields(size):
+    parser = IncrementalJSONParser()
+    for start in range(0, len(TEXT), size):
+        parser.feed(TEXT[start:start + size])
+
+    assert parser.fields == DOCUMENT
+    assert parser.done
+
+def test_every_single_split_point():
+    for split in range(len(TEXT) + 1):
+        parser = IncrementalJSONParser()
+        parser.feed(TEXT[:split])
+        parser.feed(TEXT[split:])
+        assert parser.fields == DOCUMENT, split
+
+def test_fields_are_reported_as_soon_as_they_complete():
+    parser = IncrementalJSONParser()
+
+    assert parser.feed('{"intent": "open_') == {}
+    assert parser.feed('app", "act') == {"intent": "open_app"}
+    assert parser.feed('ion": "notepad"') == {"action": "notepad"}
+    # A number isn't finished until the character after it arrives
+    assert parser.feed(', "confidence": 0.9') == {}
+    assert parser.feed('5}') == {"confidence": 0.95}
+    assert parser.done
+
+def test_nothing_after_the_object_is_parsed():
+    parser = IncrementalJSONParser()
+    parser.feed('{"a": 1}')
+
+    assert parser.feed('{"b": 2}') == {}
+    assert parser.fields == {"a": 1}
+
+def test_incomplete_stream_keeps_finished_fields_only():
+    parser = IncrementalJSONParser()
+    parser.feed('{"intent": "system_info", "action": "ti')
+
+    assert parser.fields == {"intent": "system_info"}
+    assert not parser.done
@@ -0,0 +1,58 @@
+"""Tests for the headless input sources"""
+import io
+import wave
+import numpy as np
+from config.settings import Settings
+from core.audio_capture import NoiseFloorTracker
+from core.input_sources import WavFileDevice, TextListener
+
+RATE = 16000
+
+def write_wav(path, samples):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(RATE)
+        f.writeframes(np.clip(samples, -32768, 32767).astype("<i2").tobytes())
+
+def noisy_recording(seed=0):
+    """Three seconds of steady noise with one near-silent chunk and a spoken-ish burst"""
+    rng = np.random.default_rng(seed)
+    samples = rng.normal(0, 400, 3 * RATE)
+    chunk = Settings.CHUNK_SIZE
+    samples[chunk * 5:chunk * 6] *= 0.02
+    t = np.arange(RATE // 2) / RATE
+    samples[RATE:RATE + RATE // 2] += 8000 * np.sin(2 * np.pi * 220 * t)
+    return samples
+
+def test_noise_floor_ignores_a_single_quiet_chunk(tmp_path):
+    path = tmp_path / "command.wav"
+    write_wav(path, noisy_recording())
+
+    device = WavFileDevice([str(path)])
+
+    assert 300 < device.noise_floor < 450
+
+def test_noise_floor_matches_the_live_tracker(tmp_path):
+    path = tmp_path / "command.wav"
+    samples = noisy_recording(seed=1)
+    write_wav(path, samples)
+    data = np.clip(samples, -32768, 32767).astype("<i2").tobytes()
+
+    chunk_bytes = Settings.CHUNK_SIZE * 2
+    tracker = NoiseFloorTracker(Settings.CHUNK_SIZE / RATE, 2, window=2.0, time_constant=2.0)
+    for start in range(0, len(data) - chunk_bytes + 1, chunk_bytes):
+        tracker.observe(data[start:start + chunk_bytes])
+
+    device = WavFileDevice([str(path)])
+
+    assert abs(device.noise_floor - tracker.floor) <= 0.05 * tracker.floor
+
+def test_text_listener_reads_lines_until_exhausted():
+    listener = TextListener(io.StringIO("Hey Zeeshan\n\n  Open Notepad \n"))
+
+    assert listener.listen() == "hey zeeshan"
+    assert listener.listen() == "open notepad"
+    assert not listener.exhausted
+    assert listener.listen() is None
+    assert listener.exhausted
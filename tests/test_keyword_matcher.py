@@ -0,0 +1,40 @@
+"""Tests for the Aho-Corasick keyword matcher"""
+from core.keyword_matcher import KeywordMatcher
+
+def matcher(*keywords):
+    return KeywordMatcher((keyword, keyword) for keyword in keywords)
+
+def test_finds_every_keyword_in_one_pass():
+    found = matcher("open", "notepad", "calculator").find_all("open notepad and calculator")
+
+    assert [m.keyword for m in found] == ["open", "notepad", "calculator"]
+    assert [(m.start, m.end) for m in found] == [(0, 4), (5, 12), (17, 27)]
+
+def test_overlapping_keywords_are_all_reported():
+    found = matcher("visual studio", "studio code", "visual studio code").find_all("open visual studio code")
+
+    assert sorted(m.keyword for m in found) == ["studio code", "visual studio", "visual studio code"]
+    assert matcher("visual studio", "studio code", "visual studio code").best_match(
+        "open visual studio code").keyword == "visual studio code"
+
+def test_matches_whole_words_only():
+    assert matcher("word").find_all("enter your password") == []
+    assert matcher("word").find_all("words") == []
+    assert [m.keyword for m in matcher("word").find_all("open word.")] == ["word"]
+
+def test_input_is_case_and_whitespace_normalized():
+    found = matcher("Visual  Studio").find_all("open   VISUAL studio")
+
+    assert [m.keyword for m in found] == ["visual studio"]
+
+def test_best_match_prefers_longer_then_earlier_keywords():
+    m = KeywordMatcher([("time", "first"), ("date", "second"), ("what time", "third")])
+
+    assert m.best_match("what time is it").payload == "third"
+    assert m.best_match("date and time").payload == "first"
+    assert m.best_match("nothing here") is None
+
+def test_empty_keywords_are_ignored():
+    m = matcher("", "   ", "open")
+
+    assert [keyword for keyword, _ in m.patterns] == ["open"]
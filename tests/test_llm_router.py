@@ -0,0 +1,68 @@
+"""Tests for the LLM router's provider race"""
+import json
+import time
+import asyncio
+import threading
+import pytest
+from core.llm_providers import LLMProvider, LLMRouter
+from core.llm_transport import AsyncLLMTransport, RequestCancelled
+
+class FakeChat:
+    """Chat client answering with fixed text after a delay"""
+
+    def __init__(self, text, delay=0.0):
+        self.model = "fake"
+        self.text = text
+        self.delay = delay
+        self.cancelled = threading.Event()
+
+    def complete(self, messages, temperature=0.2, max_tokens=150, deadline=None, cancel=None):
+        if cancel is not None and cancel.wait(self.delay):
+            self.cancelled.set()
+            raise RequestCancelled("cancelled")
+        if cancel is None:
+            time.sleep(self.delay)
+        return self.text
+
+def validate_json(text):
+    json.loads(text)
+
+def test_invalid_answer_is_recorded_as_failure():
+    provider = LLMProvider("bad", FakeChat("not json"))
+
+    with pytest.raises(ValueError):
+        provider.complete([], validate=validate_json)
+
+    assert list(provider.stats.outcomes) == [False]
+    assert provider.breaker.consecutive_failures == 1
+
+def test_race_skips_invalid_answer_and_counts_it_against_its_provider():
+    fast_bad = LLMProvider("fast", FakeChat("not json", delay=0.0))
+    slow_good = LLMProvider("slow", FakeChat('{"ok": true}', delay=0.1))
+    router = LLMRouter([fast_bad, slow_good], race=True)
+
+    assert router.complete([], validate=validate_json) == '{"ok": true}'
+    assert list(fast_bad.stats.outcomes) == [False]
+    assert list(slow_good.stats.outcomes) == [True]
+
+def test_race_cancels_the_loser():
+    winner = LLMProvider("winner", FakeChat('{"ok": true}', delay=0.0))
+    loser = LLMProvider("loser", FakeChat('{"late": true}', delay=5.0))
+    router = LLMRouter([winner, loser], race=True)
+
+    assert router.complete([], validate=validate_json) == '{"ok": true}'
+    assert loser.chat.cancelled.wait(1.0)
+    # Being cancelled is not the loser's fault
+    time.sleep(0.05)
+    assert list(loser.stats.outcomes) == []
+
+def test_transport_call_stops_waiting_when_cancelled():
+    transport = AsyncLLMTransport("http://localhost:9", name="test")
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+
+    started = time.monotonic()
+    with pytest.raises(RequestCancelled):
+        transport._call(asyncio.sleep(10), timeout=10, cancel=cancel)
+    assert time.monotonic() - started < 1.0
+    transport.close()
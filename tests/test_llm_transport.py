@@ -0,0 +1,128 @@
+"""Tests for the pooled LLM transport, run against the local stand-in server"""
+import time
+import threading
+import pytest
+from config.settings import Settings
+from core.llm_transport import AsyncLLMTransport, OpenAICompatibleChat, TransportError, RequestCancelled
+from core.llm_providers import AnthropicChat
+from tools.llm_standin_server import start_standin_server
+
+MESSAGES = [{"role": "user", "content": "Classify: open notepad"}]
+ANSWER = '{"intent": "open_app", "action": "notepad", "confidence": 0.95, "parameters": {}}'
+
+@pytest.fixture
+def standin():
+    """Start a stand-in server; yields start(**config) -> (server, transport)"""
+    started = []
+
+    def start(transport_options=None, **config):
+        server, base_url = start_standin_server(responses={"open notepad": ANSWER}, **config)
+        options = {"timeout": 5.0, "max_retries": 2, "hedge": False, "name": "test"}
+        options.update(transport_options or {})
+        transport = AsyncLLMTransport(base_url, **options)
+        started.append((server, transport))
+        return server, transport
+
+    yield start
+    for server, transport in started:
+        transport.close()
+        server.shutdown()
+
+@pytest.fixture(autouse=True)
+def quick_backoff(monkeypatch):
+    monkeypatch.setattr(Settings, "LLM_RETRY_BASE_DELAY", 0.01)
+
+def test_plain_request(standin):
+    server, transport = standin()
+    assert OpenAICompatibleChat(transport, "m").complete(MESSAGES) == ANSWER
+    assert server.config.requests == 1
+
+def test_rate_limit_waits_for_retry_after(standin):
+    server, transport = standin(plan=[{"status": 429, "retry_after": 0.3}])
+
+    started = time.monotonic()
+    text = OpenAICompatibleChat(transport, "m").complete(MESSAGES)
+
+    assert text == ANSWER
+    assert server.config.requests == 2
+    assert time.monotonic() - started >= 0.3
+
+def test_server_errors_are_retried_until_success(standin):
+    server, transport = standin(plan=[{"status": 503}, {"status": 502}])
+
+    assert OpenAICompatibleChat(transport, "m").complete(MESSAGES) == ANSWER
+    assert server.config.requests == 3
+
+def test_gives_up_after_max_retries(standin):
+    server, transport = standin(plan=[{"status": 500}] * 5)
+
+    with pytest.raises(TransportError):
+        OpenAICompatibleChat(transport, "m").complete(MESSAGES)
+    assert server.config.requests == 3
+
+def test_client_error_is_not_retried(standin):
+    server, transport = standin(plan=[{"status": 400}])
+
+    with pytest.raises(TransportError) as error:
+        OpenAICompatibleChat(transport, "m").complete(MESSAGES)
+    assert error.value.status == 400
+    assert server.config.requests == 1
+
+def test_retry_after_past_the_deadline_fails_fast(standin):
+    server, transport = standin(plan=[{"status": 429, "retry_after": 30}])
+
+    started = time.monotonic()
+    with pytest.raises(TransportError):
+        OpenAICompatibleChat(transport, "m").complete(MESSAGES, deadline=2.0)
+    assert time.monotonic() - started < 1.0
+
+def test_hedged_request_wins_over_slow_first(standin, monkeypatch):
+    monkeypatch.setattr(Settings, "LLM_HEDGE_DEFAULT_DELAY", 0.1)
+    server, transport = standin(transport_options={"hedge": True}, plan=[{"latency": 3.0}])
+
+    started = time.monotonic()
+    text = OpenAICompatibleChat(transport, "m").complete(MESSAGES)
+
+    assert text == ANSWER
+    assert transport.hedges_sent == 1
+    assert server.config.requests == 2
+    assert time.monotonic() - started < 1.5
+
+def test_fast_answer_sends_no_hedge(standin, monkeypatch):
+    monkeypatch.setattr(Settings, "LLM_HEDGE_DEFAULT_DELAY", 0.5)
+    server, transport = standin(transport_options={"hedge": True})
+
+    assert OpenAICompatibleChat(transport, "m").complete(MESSAGES) == ANSWER
+    assert transport.hedges_sent == 0
+    assert server.config.requests == 1
+
+def test_openai_stream_yields_every_delta(standin):
+    server, transport = standin(chunk_size=5)
+
+    chunks = list(OpenAICompatibleChat(transport, "m").stream(MESSAGES))
+
+    assert len(chunks) == -(-len(ANSWER) // 5)
+    assert "".join(chunks) == ANSWER
+
+def test_anthropic_stream_yields_every_delta(standin):
+    server, transport = standin(chunk_size=7)
+
+    chunks = list(AnthropicChat(transport, "m").stream(MESSAGES))
+
+    assert "".join(chunks) == ANSWER
+
+def test_stream_is_retried_before_first_event(standin):
+    server, transport = standin(plan=[{"status": 503}])
+
+    assert "".join(OpenAICompatibleChat(transport, "m").stream(MESSAGES)) == ANSWER
+    assert server.config.requests == 2
+
+def test_cancel_abandons_in_flight_request(standin):
+    server, transport = standin(latency=5.0)
+    cancel = threading.Event()
+    threading.Timer(0.1, cancel.set).start()
+
+    started = time.monotonic()
+    with pytest.raises(RequestCancelled):
+        OpenAICompatibleChat(transport, "m").complete(MESSAGES, cancel=cancel)
+    assert time.monotonic() - started < 1.0
@@ -0,0 +1,60 @@
+"""Tests for the adaptive noise floor"""
+import numpy as np
+import speech_recognition as sr
+from core.audio_capture import NoiseFloorTracker
+
+RATE = 16000
+CHUNK = 1024
+WIDTH = 2
+
+def noise(seconds, level, rng, dropout_every=10):
+    """Steady hum with a near-silent chunk every so often (a fan's lull, a mic dropout)"""
+    samples = rng.normal(0, level, int(seconds * RATE))
+    for start in range(0, len(samples), CHUNK * dropout_every):
+        samples[start:start + CHUNK] *= 0.02
+    return samples
+
+def tone(seconds, amplitude):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return amplitude * np.sin(2 * np.pi * 220 * t)
+
+def to_pcm(samples):
+    return np.clip(samples, -32768, 32767).astype("<i2").tobytes()
+
+class MemorySource(sr.AudioSource):
+    """PCM bytes read chunk by chunk, like a microphone"""
+
+    def __init__(self, data):
+        self.SAMPLE_RATE = RATE
+        self.SAMPLE_WIDTH = WIDTH
+        self.CHUNK = CHUNK
+        self.data = data
+        self.stream = self
+
+    def read(self, size):
+        wanted = size * WIDTH
+        chunk, self.data = self.data[:wanted], self.data[wanted:]
+        return chunk
+
+def tracked_floor(data):
+    tracker = NoiseFloorTracker(CHUNK / RATE, WIDTH, window=1.0, time_constant=2.0)
+    for start in range(0, len(data) - CHUNK * WIDTH + 1, CHUNK * WIDTH):
+        tracker.observe(data[start:start + CHUNK * WIDTH])
+    return tracker.floor
+
+def test_floor_ignores_occasional_quiet_chunks():
+    rng = np.random.default_rng(1)
+    floor = tracked_floor(to_pcm(noise(10, 400, rng)))
+    assert 300 < floor < 450
+
+def test_phrase_ends_in_noisy_room():
+    rng = np.random.default_rng(2)
+    recognizer = sr.Recognizer()
+    recognizer.dynamic_energy_threshold = False
+    recognizer.energy_threshold = tracked_floor(to_pcm(noise(10, 400, rng))) * recognizer.dynamic_energy_ratio
+
+    speech = np.concatenate([tone(1.5, 8000) + noise(1.5, 400, rng, dropout_every=1000), noise(6, 400, rng)])
+    audio = recognizer.listen(MemorySource(to_pcm(speech)), timeout=2, phrase_time_limit=None)
+
+    # Speech plus the pause that ends it - not everything up to the end of the stream
+    assert len(audio.frame_data) / (RATE * WIDTH) < 3.0
@@ -0,0 +1,47 @@
+"""Tests for the NumPy PCM helpers"""
+import numpy as np
+import pytest
+from core import pcm
+
+def pcm16(values):
+    return np.asarray(values, dtype="<i2").tobytes()
+
+def test_rms_in_sample_units():
+    assert pcm.rms(pcm16([1000, -1000] * 50), 2) == 1000
+    assert pcm.rms(pcm16([3, 4] * 10), 2) == 3
+    assert pcm.rms(b"", 2) == 0
+
+@pytest.mark.parametrize("width", [1, 2, 3, 4])
+def test_width_round_trip(width):
+    data = pcm16([0, 1, -1, 32767, -32768, 12345])
+    converted = pcm.convert_width(data, 2, width)
+
+    assert len(converted) == 6 * width
+    if width >= 2:
+        assert pcm.convert_width(converted, width, 2) == data
+    else:
+        # 8-bit keeps only the high byte
+        assert pcm.convert_width(converted, 1, 2) == pcm16([0, 0, -256, 32512, -32768, 12288])
+
+def test_24_bit_samples_keep_their_sign():
+    data = pcm.convert_width(pcm16([-2, 2]), 2, 3)
+
+    assert data == bytes([0x00, 0xFE, 0xFF, 0x00, 0x02, 0x00])
+
+def test_stereo_is_averaged_to_mono():
+    stereo = pcm16([100, 300, -50, -150])
+
+    assert pcm.to_mono(stereo, 2, 2) == pcm16([200, -100])
+
+def test_resample_keeps_duration_and_shape():
+    rate, new_rate = 44100, 16000
+    tone = (np.sin(2 * np.pi * 440 * np.arange(rate) / rate) * 10000).astype("<i2")
+
+    resampled = np.frombuffer(pcm.resample(tone.tobytes(), 2, rate, new_rate), dtype="<i2")
+    expected = np.sin(2 * np.pi * 440 * np.arange(new_rate) / new_rate) * 10000
+
+    assert len(resampled) == new_rate
+    assert np.max(np.abs(resampled - expected)) < 300
+
+def test_partial_trailing_sample_is_ignored():
+    assert pcm.rms(pcm16([1000, 1000]) + b"\x01", 2) == 1000
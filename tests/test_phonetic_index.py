@@ -0,0 +1,77 @@
+"""Tests for sound-alike keyword matching"""
+import pytest
+from config.command_catalog import command_catalog
+from core.phonetic_index import PhoneticIndex, phonetic_key, similarity
+
+# Ordinary speech that used to resolve to a confident, wrong action
+NEGATIVES = [
+    "data",
+    "show me the data",
+    "what day is it",
+    "call mom",
+    "calm down",
+    "world",
+    "excellent work",
+    "set a timer",
+    "open the gate",
+]
+
+# Misrecognized keywords the phonetic tier exists for
+SOUND_ALIKES = [
+    ("open note bad", "notepad"),
+    ("open ex cell", "excel"),
+    ("open get hub", "github"),
+    ("open calculater", "calculator"),
+    ("open you tube", "youtube"),
+    ("open chrom", "browser"),
+    ("start my dey", "start_my_day"),
+    ("create a foulder", "create_folder"),
+]
+
+@pytest.fixture(scope="module")
+def index():
+    return PhoneticIndex.from_catalog(command_catalog.snapshot())
+
+def test_key_ignores_word_breaks_and_voicing():
+    assert phonetic_key("note bad") == phonetic_key("notepad")
+    assert phonetic_key("ex cell") == phonetic_key("excel")
+    assert similarity("excell", "excel") == pytest.approx(5 / 6)
+
+@pytest.mark.parametrize("utterance", NEGATIVES)
+def test_everyday_speech_is_not_reinterpreted(index, utterance):
+    assert index.search(utterance) == []
+
+@pytest.mark.parametrize("utterance,action", SOUND_ALIKES)
+def test_sound_alikes_resolve(index, utterance, action):
+    assert index.search(utterance)[0].payload.name == action
+
+def test_everyday_word_still_matches_a_keyword_spelled_the_same(index):
+    assert [m.keyword for m in index.search("time")] == ["time"]
+
+def test_short_keywords_need_a_near_exact_spelling():
+    index = PhoneticIndex([("date", "date"), ("word", "word")], common_words=frozenset())
+
+    assert index.search("data") == []
+    assert index.search("world") == []
+    assert index.search("da te")[0].payload == "date"
+
+@pytest.mark.parametrize("utterance", NEGATIVES)
+def test_classifier_does_not_act_on_everyday_speech(classifier, utterance):
+    result = classifier.classify(utterance)
+
+    # Below 0.5 the assistant asks the user to rephrase instead of acting
+    assert result["confidence"] < 0.5
+
+@pytest.mark.parametrize("utterance,action", SOUND_ALIKES)
+def test_classifier_resolves_sound_alikes(classifier, utterance, action):
+    result = classifier.classify(utterance)
+
+    assert result["action"] == action
+    assert result["confidence"] >= 0.5
+
+def test_inexact_phonetic_key_stays_below_the_execute_cutoff(classifier):
+    # One letter off "notepad", with a consonant of a different class
+    result = classifier._classify_phonetic("open notepab")
+
+    assert result["action"] == "notepad"
+    assert result["confidence"] < 0.5
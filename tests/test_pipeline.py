@@ -0,0 +1,115 @@
+"""Tests for the staged command pipeline"""
+import io
+import time
+import random
+import threading
+from core.input_sources import TextListener
+from core.pipeline import Pipeline
+
+def listen_stage(listener):
+    """Source emitting every line of a TextListener, like the listen stage does"""
+    def produce(emit):
+        while True:
+            text = listener.listen()
+            if text is None:
+                return
+            emit({"text": text})
+    return produce
+
+def lines(count):
+    return TextListener(io.StringIO("".join(f"command {i}\n" for i in range(count))))
+
+def run_in_thread(pipeline):
+    thread = threading.Thread(target=pipeline.run, daemon=True)
+    thread.start()
+    return thread
+
+def test_items_keep_their_order_and_end_stops_the_run():
+    rng = random.Random(0)
+    received = []
+
+    def jitter(item):
+        time.sleep(rng.uniform(0, 0.005))
+        return item
+
+    pipeline = Pipeline(
+        source=("listen", listen_stage(lines(30))),
+        stages=[("recognize", jitter), ("classify", jitter)],
+        sink=("execute", lambda item: received.append(item["text"])),
+        queue_size=2
+    )
+    thread = run_in_thread(pipeline)
+    thread.join(5)
+
+    # END from the exhausted source reached the sink and run() returned
+    assert not thread.is_alive()
+    assert received == [f"command {i}" for i in range(30)]
+    assert pipeline.get_statistics()["execute"]["processed"] == 30
+
+def test_dropped_and_failed_items_do_not_stop_the_pipeline():
+    received = []
+
+    def recognize(item):
+        if item["text"] == "command 1":
+            return None
+        if item["text"] == "command 2":
+            raise RuntimeError("recognizer broke")
+        return item
+
+    def execute(item):
+        if item["text"] == "command 3":
+            raise RuntimeError("action broke")
+        received.append(item["text"])
+
+    pipeline = Pipeline(
+        source=("listen", listen_stage(lines(5))),
+        stages=[("recognize", recognize)],
+        sink=("execute", execute)
+    )
+    pipeline.run()
+
+    assert received == ["command 0", "command 4"]
+
+def test_slow_sink_throttles_the_source():
+    pipeline = Pipeline(
+        source=("listen", listen_stage(lines(10))),
+        stages=[("classify", lambda item: item)],
+        sink=("execute", lambda item: time.sleep(0.03)),
+        queue_size=1
+    )
+    pipeline.run()
+
+    stats = pipeline.get_statistics()
+    assert stats["listen"]["max_backlog"] <= 1
+    assert stats["classify"]["max_backlog"] <= 1
+    # The source spent most of the run waiting for room rather than queueing everything up front
+    assert stats["listen"]["blocked_s"] > 0.1
+    assert stats["execute"]["processed"] == 10
+
+def test_stop_ends_the_run_with_the_source_still_producing():
+    received = []
+
+    def endless(emit):
+        count = 0
+        while True:
+            emit({"text": f"command {count}"})
+            count += 1
+            if not pipeline.running:
+                return
+
+    def execute(item):
+        received.append(item["text"])
+        if len(received) == 3:
+            pipeline.stop()
+
+    pipeline = Pipeline(
+        source=("listen", endless),
+        stages=[("classify", lambda item: item)],
+        sink=("execute", execute),
+        queue_size=2
+    )
+    thread = run_in_thread(pipeline)
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert received == ["command 0", "command 1", "command 2"]
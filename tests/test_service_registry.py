@@ -0,0 +1,80 @@
+"""Tests for the lazy service registry"""
+import pytest
+from utils.service_registry import ServiceRegistry
+
+class Box:
+    def __init__(self, items):
+        self.items = list(items)
+        self.entered = False
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __enter__(self):
+        self.entered = True
+        return self
+
+    def __exit__(self, *exc):
+        self.entered = False
+        return False
+
+def test_service_is_built_on_first_use_only():
+    registry = ServiceRegistry()
+    built = []
+    proxy = registry.register("box", lambda: built.append(1) or Box([1, 2]))
+
+    assert not registry.is_built("box")
+    assert "not built" in repr(proxy)
+    assert proxy.items == [1, 2]
+    assert proxy.items == [1, 2]
+    assert built == [1]
+
+def test_truth_value_follows_the_service():
+    registry = ServiceRegistry()
+    empty = registry.register("empty", lambda: Box([]))
+    full = registry.register("full", lambda: Box([1]))
+
+    assert not empty
+    assert full
+
+def test_container_protocols_are_forwarded():
+    registry = ServiceRegistry()
+    proxy = registry.register("box", lambda: Box([3, 4, 5]))
+
+    assert len(proxy) == 3
+    assert list(proxy) == [3, 4, 5]
+    assert 4 in proxy
+    assert proxy[0] == 3
+
+def test_context_manager_and_equality_are_forwarded():
+    registry = ServiceRegistry()
+    proxy = registry.register("box", lambda: Box([]))
+
+    with proxy as box:
+        assert box.entered
+    assert not proxy.entered
+    assert proxy == registry.get("box")
+    assert hash(proxy) == hash(registry.get("box"))
+
+def test_callable_service():
+    registry = ServiceRegistry()
+    proxy = registry.register("double", lambda: (lambda x: x * 2))
+
+    assert proxy(21) == 42
+
+def test_failed_construction_is_not_truthy():
+    registry = ServiceRegistry()
+
+    def broken():
+        raise RuntimeError("no audio device")
+
+    proxy = registry.register("broken", broken)
+    with pytest.raises(RuntimeError):
+        bool(proxy)
+    assert not registry.is_built("broken")
@@ -0,0 +1,165 @@
+"""Tests for the speech cache and how TextToSpeech uses it"""
+import os
+import wave
+import pytest
+from config.settings import Settings
+from core.speech_cache import SpeechCache, cache_key
+from core.text_to_speech import TextToSpeech, Utterance, PRIORITY_NORMAL
+
+def write_wav(path, seconds=0.1, rate=8000):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\1\0" * int(seconds * rate))
+
+def rendered(cache, text, pin=False, seconds=0.1):
+    """Put a freshly 'rendered' clip for text into the cache"""
+    key = cache_key(text, "voice", 150, 1.0)
+    path = cache.render_path(key)
+    write_wav(path, seconds)
+    cache.put(key, text, path, pin=pin)
+    return key
+
+def test_key_depends_on_voice_settings():
+    key = cache_key("hello", "voice", 150, 1.0)
+    assert key == cache_key("hello", "voice", 150, 1.0)
+    assert key != cache_key("hello", "voice", 180, 1.0)
+    assert key != cache_key("hello", "other", 150, 1.0)
+    assert key != cache_key("hello there", "voice", 150, 1.0)
+
+def test_put_then_get(tmp_path):
+    cache = SpeechCache(str(tmp_path), max_bytes=10**6)
+    key = rendered(cache, "hello")
+
+    clip = cache.get(key)
+    assert clip.sample_rate == 8000
+    assert len(clip.frames) == 1600
+    assert not os.path.exists(cache.render_path(key))
+    assert cache.get(cache_key("other", "voice", 150, 1.0)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_least_recently_used_clip_is_evicted(tmp_path):
+    cache = SpeechCache(str(tmp_path), max_bytes=4000)
+    first = rendered(cache, "first")
+    second = rendered(cache, "second")
+    cache.get(first)
+    third = rendered(cache, "third")
+
+    assert first in cache and third in cache
+    assert second not in cache
+    assert not os.path.exists(cache.path_for(second))
+
+def test_pinned_clips_are_never_evicted(tmp_path):
+    cache = SpeechCache(str(tmp_path), max_bytes=2000)
+    pinned = rendered(cache, "welcome", pin=True)
+    for text in ("one", "two", "three"):
+        rendered(cache, text)
+
+    assert pinned in cache
+    assert cache.get_statistics()["clips"] == 2
+
+def test_index_survives_restart(tmp_path):
+    cache = SpeechCache(str(tmp_path), max_bytes=10**6)
+    key = rendered(cache, "hello")
+    cache.flush()
+
+    reopened = SpeechCache(str(tmp_path), max_bytes=10**6)
+    assert key in reopened
+    assert reopened.get(key).sample_rate == 8000
+
+def test_load_does_not_count(tmp_path):
+    cache = SpeechCache(str(tmp_path), max_bytes=10**6)
+    key = rendered(cache, "hello")
+
+    assert cache.load(key) is not None
+    assert cache.load(cache_key("other", "voice", 150, 1.0)) is None
+    assert (cache.hits, cache.misses) == (0, 0)
+
+def test_unreadable_clip_is_dropped(tmp_path):
+    cache = SpeechCache(str(tmp_path), max_bytes=10**6)
+    key = rendered(cache, "hello")
+    cache.clips.clear()
+    with open(cache.path_for(key), "wb") as f:
+        f.write(b"not a wav file")
+
+    assert cache.get(key) is None
+    assert key not in cache
+
+class FakeEngine:
+    """pyttsx3 stand-in that records what it says and writes WAV files"""
+
+    def __init__(self):
+        self.said = []
+        self.rendered = []
+        self._pending = None
+
+    def say(self, text):
+        self.said.append(text)
+
+    def save_to_file(self, text, path):
+        self._pending = (text, path)
+
+    def runAndWait(self):
+        if self._pending:
+            text, path = self._pending
+            write_wav(path)
+            self.rendered.append(text)
+            self._pending = None
+
+@pytest.fixture
+def speaker(tmp_path, monkeypatch):
+    """TextToSpeech with a fake engine and no worker thread (jobs run by hand)"""
+    monkeypatch.setattr(Settings, "ENABLE_TTS", False)
+    tts = TextToSpeech()
+    tts.engine = FakeEngine()
+    tts.cache = SpeechCache(str(tmp_path), max_bytes=10**6)
+    tts._voice = ("voice", 150, 1.0)
+    tts.played = []
+    tts._play_clip = lambda clip, utterance: tts.played.append(utterance.text)
+    return tts
+
+def say(tts, text):
+    with tts._lock:
+        utterance = Utterance(text, PRIORITY_NORMAL, next(tts._seq), text, None)
+        tts._latest[text] = utterance.seq
+    tts._play(utterance)
+
+def run_background_jobs(tts):
+    while not tts._queue.empty():
+        tts._play(tts._queue.get())
+
+def test_miss_is_spoken_live_then_rendered_in_background(speaker):
+    say(speaker, "opening notepad")
+
+    assert speaker.engine.said == ["opening notepad"]
+    assert speaker.engine.rendered == []
+
+    run_background_jobs(speaker)
+    assert speaker.engine.rendered == ["opening notepad"]
+    # The render job's lookup isn't a second miss
+    assert (speaker.cache.hits, speaker.cache.misses) == (0, 1)
+
+    say(speaker, "opening notepad")
+    assert speaker.played == ["opening notepad"]
+    assert speaker.engine.said == ["opening notepad"]
+    stats = speaker.get_statistics()["cache"]
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+def test_repeated_miss_is_rendered_once(speaker):
+    say(speaker, "hello")
+    say(speaker, "hello")
+    run_background_jobs(speaker)
+
+    assert speaker.engine.rendered == ["hello"]
+
+def test_prerendered_phrase_plays_from_cache(speaker):
+    speaker.prerender(["how can I help you?"])
+    run_background_jobs(speaker)
+
+    say(speaker, "how can I help you?")
+
+    assert speaker.played == ["how can I help you?"]
+    assert speaker.engine.said == []
+    assert len(speaker.cache.pinned) == 1
+    assert (speaker.cache.hits, speaker.cache.misses) == (1, 0)
@@ -0,0 +1,143 @@
+"""Tests for the TTS queue: priorities, coalescing, expiry and barge-in"""
+import time
+import pytest
+from config.settings import Settings
+from core.text_to_speech import TextToSpeech, PRIORITY_URGENT
+
+class FakeEngine:
+    """pyttsx3 stand-in; during() runs while an utterance is being spoken"""
+
+    def __init__(self):
+        self.said = []
+        self.stopped = False
+        self.during = None
+        self._text = None
+
+    def say(self, text):
+        self._text = text
+
+    def runAndWait(self):
+        if self.during:
+            self.during()
+        self.said.append(self._text)
+
+    def stop(self):
+        self.stopped = True
+
+@pytest.fixture
+def tts(monkeypatch):
+    """TextToSpeech with a fake engine and no worker thread (drain() plays the queue)"""
+    monkeypatch.setattr(Settings, "ENABLE_TTS", False)
+    speaker = TextToSpeech()
+    monkeypatch.setattr(Settings, "ENABLE_TTS", True)
+    speaker.engine = FakeEngine()
+    return speaker
+
+def drain(tts):
+    while not tts._queue.empty():
+        tts._play(tts._queue.get())
+    return tts.engine.said
+
+def test_urgent_is_spoken_before_queued_replies(tts):
+    tts.speak("first reply")
+    tts.speak("second reply")
+    tts.speak("how can I help?", priority=PRIORITY_URGENT)
+
+    assert drain(tts) == ["how can I help?", "first reply", "second reply"]
+
+def test_same_key_keeps_only_the_newest(tts):
+    tts.speak("Opening notepad", key="open:notepad")
+    tts.speak("the time is 10:00")
+    tts.speak("Notepad is open", key="open:notepad")
+
+    assert drain(tts) == ["the time is 10:00", "Notepad is open"]
+    assert tts.stats["coalesced"] == 1
+
+def test_same_text_coalesces_by_default(tts):
+    tts.speak("done")
+    tts.speak("done")
+
+    assert drain(tts) == ["done"]
+
+def test_stale_message_is_skipped(tts):
+    tts.speak("old news", max_age=0.01)
+    tts.speak("still fresh", max_age=10)
+    time.sleep(0.05)
+
+    assert drain(tts) == ["still fresh"]
+    assert tts.stats["expired"] == 1
+
+def test_interrupt_drops_everything_queued_before_it(tts):
+    tts.speak("one")
+    tts.speak("two")
+    tts.interrupt()
+    tts.speak("three")
+
+    assert drain(tts) == ["three"]
+    assert tts.stats["interrupted"] == 0
+
+def test_interrupt_stops_speech_in_flight(tts):
+    def barge_in():
+        tts.interrupt()
+        tts._on_word("started-word", 0, 3)
+
+    tts.engine.during = barge_in
+    tts.speak("a long answer")
+    drain(tts)
+
+    assert tts.engine.stopped
+    assert tts.stats["interrupted"] == 1
+    assert tts.stats["spoken"] == 0
+
+def test_interrupt_stops_cached_clip_playback(tts):
+    class Stream:
+        def __init__(self):
+            self.blocks = 0
+
+        def write(self, data):
+            self.blocks += 1
+            if self.blocks == 2:
+                tts.interrupt()
+
+        def stop_stream(self):
+            pass
+
+        def close(self):
+            pass
+
+    class Audio:
+        stream = Stream()
+
+        def open(self, **options):
+            return self.stream
+
+        def get_format_from_width(self, width):
+            return width
+
+    class Clip:
+        frames = b"\0" * 16000 * 2
+        sample_rate = 16000
+        sample_width = 2
+        channels = 1
+
+    class Cache:
+        def get(self, key, pin=False):
+            return Clip()
+
+    tts._audio = Audio()
+    tts.cache = Cache()
+    tts._voice = ("voice", 150, 1.0)
+    tts.speak("a cached answer")
+    drain(tts)
+
+    # One second of audio in 50 ms blocks, cut off after the second
+    assert tts._audio.stream.blocks == 2
+    assert tts.stats["interrupted"] == 1
+    assert tts.stats["spoken"] == 0
+
+def test_uninterrupted_speech_counts_as_spoken(tts):
+    tts.speak("hello")
+    drain(tts)
+
+    assert tts.stats["spoken"] == 1
+    assert tts.stats["interrupted"] == 0
@@ -0,0 +1,62 @@
+"""Tests for the warm-up scheduler"""
+import time
+import threading
+from utils.service_registry import ServiceRegistry
+from utils.warmup import WarmupScheduler
+
+def recording_registry(delays=None):
+    """Registry whose services remember the thread that built them and when"""
+    registry = ServiceRegistry()
+    built = {}
+    delays = delays or {}
+
+    def factory(name):
+        def build():
+            time.sleep(delays.get(name, 0))
+            built[name] = (threading.current_thread(), time.monotonic())
+            return name
+        return build
+
+    for name in ("slow", "voice", "detector", "other"):
+        registry.register(name, factory(name))
+    return registry, built
+
+def test_pool_task_waits_for_its_main_thread_dependency():
+    registry, built = recording_registry({"slow": 0.2, "voice": 0.05})
+    scheduler = WarmupScheduler(registry, max_workers=2)
+    scheduler.add("slow")
+    # Held up on the main thread by "slow", while "detector" is free to run on the pool
+    scheduler.add("voice", depends_on=["slow"], main_thread=True)
+    scheduler.add("detector", depends_on=["voice"])
+
+    scheduler.start()
+    assert scheduler.wait(timeout=5)
+
+    assert built["voice"][0] is threading.main_thread()
+    assert built["detector"][0] is not threading.main_thread()
+    assert built["slow"][0] is not threading.main_thread()
+    assert built["slow"][1] <= built["voice"][1] <= built["detector"][1]
+
+def test_failed_main_thread_task_fails_its_dependents():
+    registry = ServiceRegistry()
+    registry.register("voice", lambda: 1 / 0)
+    registry.register("detector", lambda: "detector")
+    scheduler = WarmupScheduler(registry)
+    scheduler.add("voice", main_thread=True)
+    scheduler.add("detector", depends_on=["voice"])
+
+    scheduler.start()
+
+    assert not scheduler.wait(timeout=5)
+    assert not registry.is_built("detector")
+
+def test_independent_tasks_run_concurrently():
+    registry, built = recording_registry({"slow": 0.2, "other": 0.2})
+    scheduler = WarmupScheduler(registry, max_workers=2)
+    scheduler.add("slow").add("other")
+
+    started = time.monotonic()
+    scheduler.start()
+    assert scheduler.wait(timeout=5)
+
+    assert time.monotonic() - started < 0.35
@@ -0,0 +1,73 @@
+"""
+Wake Word Enrollment
+Record the wake word a few times so it can be spotted on-device
+
+The recordings are reduced to MFCC templates and saved to
+Settings.WAKE_WORD_TEMPLATES_FILE together with a threshold learned from
+how much they differ from each other. Re-run after changing WAKE_WORD or
+microphone.
+
+Usage:
+    python -m tools.enroll_wake_word
+    python -m tools.enroll_wake_word --samples 5
+    python -m tools.enroll_wake_word --wav hey1.wav hey2.wav hey3.wav
+"""
+import sys
+import argparse
+import speech_recognition as sr
+from config.settings import Settings
+
+def record_samples(count):
+    """Record the wake word from the microphone, count times"""
+    from core.voice_listener import listener
+
+    recordings = []
+    while len(recordings) < count:
+        input(f"Press Enter, then say '{Settings.WAKE_WORD}' ({len(recordings) + 1}/{count})...")
+        listener.discard_pending()
+        audio = listener.record(timeout=5, phrase_time_limit=3)
+        if audio is None:
+            print("⚠️  Didn't hear anything - try again")
+            continue
+        recordings.append(audio)
+        print(f"✓ Recorded {len(audio.frame_data) / (audio.sample_rate * audio.sample_width):.2f}s")
+    return recordings
+
+def load_samples(paths):
+    """Read wake word recordings from WAV files"""
+    recognizer = sr.Recognizer()
+    recordings = []
+    for path in paths:
+        with sr.AudioFile(path) as source:
+            recordings.append(recognizer.record(source))
+    return recordings
+
+def main(argv=None):
+    """Enroll the wake word"""
+    parser = argparse.ArgumentParser(description=f"Enroll '{Settings.WAKE_WORD}' for on-device wake word spotting")
+    parser.add_argument("--samples", type=int, default=3, help="Recordings to take from the microphone")
+    parser.add_argument("--wav", nargs="+", help="Enroll from WAV files instead of the microphone")
+    args = parser.parse_args(argv)
+
+    from core.keyword_spotter import KeywordSpotter
+
+    spotter = KeywordSpotter()
+    if not spotter.available:
+        print("❌ Keyword spotting needs numpy and ENABLE_WAKE_WORD_SPOTTER=true")
+        return 1
+
+    recordings = load_samples(args.wav) if args.wav else record_samples(max(1, args.samples))
+    try:
+        threshold = spotter.enroll(recordings)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"✅ Enrolled {len(spotter.templates)} template(s) for '{Settings.WAKE_WORD}' (threshold {threshold:.2f})")
+    print(f"   Saved to {spotter.templates_file}")
+    if len(spotter.templates) < 2:
+        print("   Tip: enroll at least 3 samples so the threshold can be learned")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+LLM Stand-in Server
+Local OpenAI-compatible and Anthropic-style endpoints for exercising the LLM transport
+
+Serves recorded responses (or a fixed "unknown" classification) with
+configurable latency and failure rate, streamed or not. Point the assistant
+at it with GROQ_BASE_URL, OPENAI_BASE_URL or ANTHROPIC_BASE_URL set to
+http://127.0.0.1:<port>/v1.
+
+Usage:
+    python -m tools.llm_standin_server --port 8765 --latency 0.3 --fail-rate 0.1
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+DEFAULT_CONTENT = '{"intent": "unknown", "action": null, "confidence": 0.0, "parameters": {}}'
+
+class StandinConfig:
+    """Behaviour of a stand-in server"""
+
+    def __init__(self, responses=None, latency=0.0, jitter=0.0, fail_rate=0.0, fail_status=503, chunk_size=8, plan=None):
+        """
+        Initialize config
+
+        Args:
+            responses: Mapping of user message (or the text after "Classify: ") -> content
+            latency: Seconds before the first byte
+            jitter: Extra random latency in seconds
+            fail_rate: Fraction of requests answered with fail_status
+            fail_status: HTTP status for injected failures
+            chunk_size: Characters per streamed delta
+            plan: Per-request overrides for the first requests, in arrival
+                order - dicts with "latency", "status" (answer with this
+                error instead) and "retry_after" (seconds, sent as Retry-After)
+        """
+        self.responses = responses or {}
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.chunk_size = chunk_size
+        self.plan = list(plan or [])
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def content_for(self, messages):
+        """Pick the response content for a conversation"""
+        user_text = ""
+        for message in messages:
+            if message.get("role") == "user":
+                content = message.get("content", "")
+                user_text = content if isinstance(content, str) else json.dumps(content)
+
+        key = user_text[len("Classify: "):] if user_text.startswith("Classify: ") else user_text
+        return self.responses.get(key, self.responses.get(user_text, DEFAULT_CONTENT))
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Request handler for chat completions (/chat/completions) and messages (/messages)"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_request(self):
+        """Read the JSON body, apply latency and injected failures"""
+        config = self.server.config
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        with config.lock:
+            index = config.requests
+            config.requests += 1
+        step = config.plan[index] if index < len(config.plan) else {}
+
+        time.sleep(step.get("latency", config.latency) + random.uniform(0, config.jitter))
+
+        if "status" in step:
+            headers = {"Retry-After": str(step["retry_after"])} if "retry_after" in step else None
+            self._send_json(step["status"], {"error": {"message": "planned failure"}}, headers)
+            return None
+        if random.random() < config.fail_rate:
+            self._send_json(config.fail_status, {"error": {"message": "injected failure"}})
+            return None
+        return request
+
+    def do_POST(self):
+        try:
+            self._handle_post()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up (deadline or a cancelled hedge)
+            pass
+
+    def _start_stream(self):
+        """Send headers for a server-sent event stream"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+    def _send_event(self, payload, event=None):
+        """Write one server-sent event"""
+        prefix = f"event: {event}\n" if event else ""
+        self.wfile.write(f"{prefix}data: {json.dumps(payload)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _handle_post(self):
+        path = self.path.rstrip("/")
+        if path.endswith("/chat/completions"):
+            self._handle_chat_completions()
+        elif path.endswith("/messages"):
+            self._handle_messages()
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def _handle_chat_completions(self):
+        """OpenAI-compatible chat completions"""
+        request = self._read_request()
+        if request is None:
+            return
+
+        content = self.server.config.content_for(request.get("messages", []))
+        model = request.get("model", "standin")
+
+        if not request.get("stream"):
+            self._send_json(200, {
+                "id": "standin",
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}]
+            })
+            return
+
+        self._start_stream()
+        size = self.server.config.chunk_size
+        for i in range(0, len(content), size):
+            self._send_event({
+                "id": "standin",
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": content[i:i + size]}, "finish_reason": None}]
+            })
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _handle_messages(self):
+        """Anthropic-style messages"""
+        request = self._read_request()
+        if request is None:
+            return
+
+        content = self.server.config.content_for(request.get("messages", []))
+        model = request.get("model", "standin")
+
+        if not request.get("stream"):
+            self._send_json(200, {
+                "id": "standin",
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [{"type": "text", "text": content}],
+                "stop_reason": "end_turn"
+            })
+            return
+
+        self._start_stream()
+        self._send_event({"type": "message_start", "message": {"id": "standin", "model": model}}, "message_start")
+        self._send_event({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}, "content_block_start")
+        size = self.server.config.chunk_size
+        for i in range(0, len(content), size):
+            self._send_event(
+                {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": content[i:i + size]}},
+                "content_block_delta"
+            )
+        self._send_event({"type": "content_block_stop", "index": 0}, "content_block_stop")
+        self._send_event({"type": "message_stop"}, "message_stop")
+        self.close_connection = True
+
+def start_standin_server(port=0, handler=StandinHandler, **config):
+    """
+    Start a stand-in server on a background thread
+
+    Args:
+        port: Port to bind on 127.0.0.1 (0 picks a free one)
+        handler: Request handler class
+        **config: StandinConfig options
+
+    Returns:
+        tuple: (server, base_url) - call server.shutdown() when done
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.config = StandinConfig(**config)
+    threading.Thread(target=server.serve_forever, daemon=True, name="llm-standin").start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+def main(argv=None):
+    """Run a stand-in server in the foreground"""
+    parser = argparse.ArgumentParser(description="Local stand-in for an OpenAI-compatible LLM API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--responses", help="JSON file mapping command text to response content")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=503)
+    args = parser.parse_args(argv)
+
+    responses = {}
+    if args.responses:
+        with open(args.responses, "r", encoding="utf-8") as f:
+            responses = json.load(f)
+
+    server, base_url = start_standin_server(
+        port=args.port,
+        responses=responses,
+        latency=args.latency,
+        jitter=args.jitter,
+        fail_rate=args.fail_rate,
+        fail_status=args.fail_status
+    )
+    print(f"🧪 LLM stand-in listening on {base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Circuit Breaker
+Stops calling a failing backend and probes it in the background until it recovers
+"""
+import time
+import threading
+from utils.logger import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a backend whose circuit is open"""
+
+class CircuitBreaker:
+    """
+    Closed -> open after consecutive failures -> half-open probe -> closed
+
+    With a probe callable, recovery is checked on a background thread and
+    callers are rejected until a probe succeeds, so no user request pays for
+    a trial call. Without one, the first call after reset_timeout is let
+    through as the half-open trial.
+    """
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0, probe=None, max_reset_timeout=300.0):
+        """
+        Initialize breaker
+
+        Args:
+            name: Name used in logs
+            failure_threshold: Consecutive failures (or timeouts) that trip the circuit
+            reset_timeout: Seconds open before the first probe
+            probe: Callable that raises if the backend is still down
+            max_reset_timeout: Cap for the doubling wait between failed probes
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.probe = probe
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+
+        self._wait = reset_timeout
+        self._trial_in_flight = False
+        self._probe_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Check whether a call may go through now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.probe is not None:
+                return False
+
+            # No background probe: let one trial call through once the wait is over
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self._wait:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """Record a successful call"""
+        with self._lock:
+            if self._probe_owns_recovery():
+                return
+            was_open = self._close()
+        if was_open:
+            logger.info(f"Circuit '{self.name}' closed - backend recovered")
+
+    def record_failure(self):
+        """Record a failed or timed-out call"""
+        with self._lock:
+            if self._probe_owns_recovery():
+                return
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN:
+                # Failed trial: back off before the next one
+                self._wait = min(self.max_reset_timeout, self._wait * 2)
+            elif self.state == OPEN or self.consecutive_failures < self.failure_threshold:
+                return
+            self._trip()
+
+    def _probe_owns_recovery(self):
+        """
+        True while the background probe decides when to close (lock held)
+
+        Calls that started before the circuit opened can still finish after
+        it did; their outcome says nothing about the backend now, and letting
+        them in would close the circuit under a failing probe or start a
+        second probe thread.
+        """
+        return self.probe is not None and self.state != CLOSED
+
+    def _close(self):
+        """Close the circuit (lock held); returns whether it was open"""
+        was_open = self.state != CLOSED
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._wait = self.reset_timeout
+        self._trial_in_flight = False
+        return was_open
+
+    def _trip(self):
+        """Open the circuit (lock held)"""
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.trips += 1
+        self._trial_in_flight = False
+        logger.warning(
+            f"Circuit '{self.name}' open after {self.consecutive_failures} failures; "
+            f"retrying in {self._wait:.0f}s"
+        )
+
+        if self.probe is not None and not self._probe_running:
+            self._probe_running = True
+            threading.Thread(target=self._probe_loop, daemon=True, name=f"{self.name}-probe").start()
+
+    def _probe_loop(self):
+        """Probe the backend until it answers, doubling the wait after each failure"""
+        while True:
+            with self._lock:
+                wait = self._wait
+            time.sleep(wait)
+
+            with self._lock:
+                self.state = HALF_OPEN
+            try:
+                self.probe()
+            except Exception as e:
+                with self._lock:
+                    self.state = OPEN
+                    self.opened_at = time.monotonic()
+                    self._wait = min(self.max_reset_timeout, self._wait * 2)
+                logger.debug(f"Circuit '{self.name}' probe failed: {e}")
+                continue
+
+            with self._lock:
+                self._close()
+                self._probe_running = False
+            logger.info(f"Circuit '{self.name}' closed - backend recovered")
+            return
+
+    def get_statistics(self):
+        """Get breaker state"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "trips": self.trips
+        }
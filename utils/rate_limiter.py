@@ -0,0 +1,47 @@
+"""
+Rate Limiter
+Thread-safe token bucket for pacing API requests
+"""
+import time
+import threading
+
+class RateLimiter:
+    """Token bucket limiting calls to `rate` per second with bursts of `burst`"""
+
+    def __init__(self, rate, burst=1):
+        """
+        Initialize limiter
+
+        Args:
+            rate: Tokens added per second (<= 0 disables limiting)
+            burst: Maximum tokens that can accumulate
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute, burst=1):
+        """Create a limiter from a requests-per-minute quota"""
+        return cls(requests_per_minute / 60.0, burst)
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait_time = (1 - self.tokens) / self.rate
+
+            time.sleep(wait_time)
@@ -0,0 +1,159 @@
+"""
+Service Registry - Lazy Singletons
+Builds the module-level singletons on first use instead of at import time
+"""
+import threading
+from contextlib import nullcontext
+from utils.logger import logger
+
+class ServiceRegistry:
+    """Registry of lazily constructed singleton services"""
+
+    def __init__(self):
+        """Initialize empty registry"""
+        self._factories = {}
+        self._instances = {}
+        self._locks = {}
+        self._building = set()
+        self._lock = threading.Lock()
+
+        # Optional hook: callable(name) -> context manager wrapped around construction
+        self.instrument = None
+
+    def register(self, name, factory):
+        """
+        Register a singleton factory
+
+        Args:
+            name: Unique service name
+            factory: Zero-argument callable that builds the service
+
+        Returns:
+            LazyProxy: Proxy that builds the service on first attribute access
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._locks[name] = threading.RLock()
+            self._instances.pop(name, None)
+        return LazyProxy(self, name)
+
+    def get(self, name):
+        """
+        Get a service, building it if this is the first use
+
+        Args:
+            name: Service name
+
+        Returns:
+            object: The service instance
+        """
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+
+        if name not in self._factories:
+            raise KeyError(f"Unknown service: {name}")
+
+        with self._locks[name]:
+            if name in self._instances:
+                return self._instances[name]
+
+            if name in self._building:
+                raise RuntimeError(f"Circular dependency while building service: {name}")
+
+            self._building.add(name)
+            try:
+                logger.debug(f"Building service on first use: {name}")
+                context = self.instrument(name) if self.instrument else nullcontext()
+                with context:
+                    instance = self._factories[name]()
+                self._instances[name] = instance
+            finally:
+                self._building.discard(name)
+
+        return instance
+
+    def is_built(self, name):
+        """Check whether a service has already been constructed"""
+        return name in self._instances
+
+    def names(self):
+        """Get all registered service names in registration order"""
+        return list(self._factories)
+
+    def build_all(self):
+        """Construct every registered service (used for eager startup and profiling)"""
+        for name in self.names():
+            self.get(name)
+
+class LazyProxy:
+    """
+    Stand-in for a singleton that forwards everything to the real instance
+
+    Python looks special methods up on the type, not the instance, so the
+    protocols a service might support (truth value, len, iteration, with,
+    comparison, calls) are forwarded explicitly.
+    """
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry, name):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def _resolve(self):
+        """Get the real instance, building it if needed"""
+        return self._registry.get(self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._resolve(), attr, value)
+
+    def __bool__(self):
+        return bool(self._resolve())
+
+    def __len__(self):
+        return len(self._resolve())
+
+    def __iter__(self):
+        return iter(self._resolve())
+
+    def __contains__(self, item):
+        return item in self._resolve()
+
+    def __getitem__(self, key):
+        return self._resolve()[key]
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __enter__(self):
+        return self._resolve().__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._resolve().__exit__(exc_type, exc_value, traceback)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyProxy):
+            other = other._resolve()
+        return self._resolve() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._resolve())
+
+    def __str__(self):
+        return str(self._resolve())
+
+    def __repr__(self):
+        if self._registry.is_built(self._name):
+            return repr(self._resolve())
+        return f"<LazyProxy '{self._name}' (not built)>"
+
+# Global service registry
+registry = ServiceRegistry()
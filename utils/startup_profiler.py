@@ -0,0 +1,236 @@
+"""
+Startup Profiler
+Records wall time and RSS for every tracked import and singleton construction
+
+Enabled with `python main.py --profile-startup`. This module must stay free of
+project imports so it can be installed before anything else is loaded.
+"""
+import os
+import sys
+import json
+import time
+import threading
+import importlib.abc
+from contextlib import contextmanager
+
+try:
+    import psutil
+    _PROCESS = psutil.Process()
+except ImportError:
+    _PROCESS = None
+
+# Project packages are tracked module by module, heavy third-party
+# dependencies only at their top-level import
+PROJECT_PACKAGES = ("config", "core", "memory", "actions", "utils")
+THIRD_PARTY_MODULES = (
+    "speech_recognition", "pyaudio", "pyttsx3", "groq", "openai", "anthropic",
+    "httpx", "chromadb", "sentence_transformers", "torch", "numpy", "psutil", "dotenv"
+)
+
+def get_rss():
+    """Get resident set size of this process in bytes"""
+    if _PROCESS is not None:
+        return _PROCESS.memory_info().rss
+    try:
+        import resource
+        # ru_maxrss is peak RSS in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except Exception:
+        return 0
+
+class _TimedLoader(importlib.abc.Loader):
+    """Loader wrapper that measures module execution"""
+
+    def __init__(self, loader, profiler, name):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler.measure(self._name, kind="import"):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+class _ProfilingFinder(importlib.abc.MetaPathFinder):
+    """Meta path finder that wraps the loaders of tracked modules"""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+        self._local = threading.local()
+
+    @staticmethod
+    def _is_tracked(fullname):
+        if fullname.split(".")[0] in PROJECT_PACKAGES:
+            return True
+        return fullname in THIRD_PARTY_MODULES
+
+    def find_spec(self, fullname, path, target=None):
+        if not self._is_tracked(fullname) or getattr(self._local, "busy", False):
+            return None
+
+        # Let the remaining finders locate the module, then wrap its loader
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.busy = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self._profiler, fullname)
+        return spec
+
+class StartupProfiler:
+    """Collect a startup timeline of imports and singleton construction"""
+
+    def __init__(self):
+        """Initialize profiler (disabled until installed)"""
+        self.enabled = False
+        self.events = []
+        self._origin = time.perf_counter()
+        self._origin_rss = get_rss()
+        self._finder = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def install(self):
+        """Start recording imports and singleton construction"""
+        if self.enabled:
+            return
+
+        self.enabled = True
+        self._origin = time.perf_counter()
+        self._origin_rss = get_rss()
+        self._finder = _ProfilingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+        from utils.service_registry import registry
+        registry.instrument = lambda name: self.measure(name, kind="singleton")
+
+    def uninstall(self):
+        """Stop recording"""
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+        self.enabled = False
+
+    @contextmanager
+    def measure(self, label, kind="step"):
+        """
+        Measure wall time and RSS growth of a block
+
+        Args:
+            label: Name shown in the report
+            kind: Event kind (import, singleton, step)
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        depth = len(stack)
+        stack.append(label)
+        start = time.perf_counter()
+        rss_before = get_rss()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            end = time.perf_counter()
+            rss_after = get_rss()
+            stack.pop()
+
+            event = {
+                "label": label,
+                "kind": kind,
+                "thread": threading.current_thread().name,
+                "depth": depth,
+                "start_ms": round((start - self._origin) * 1000, 3),
+                "duration_ms": round((end - start) * 1000, 3),
+                "rss_before_mb": round(rss_before / 1024 ** 2, 2),
+                "rss_after_mb": round(rss_after / 1024 ** 2, 2),
+                "rss_delta_mb": round((rss_after - rss_before) / 1024 ** 2, 2),
+            }
+            if error:
+                event["error"] = error
+
+            with self._lock:
+                self.events.append(event)
+
+    def get_summary(self):
+        """
+        Get the recorded timeline
+
+        Returns:
+            dict: Totals plus events sorted by start time
+        """
+        events = sorted(self.events, key=lambda e: (e["start_ms"], -e["duration_ms"]))
+        top_level = [e for e in events if e["depth"] == 0]
+
+        return {
+            "total_ms": round((time.perf_counter() - self._origin) * 1000, 3),
+            "rss_start_mb": round(self._origin_rss / 1024 ** 2, 2),
+            "rss_end_mb": round(get_rss() / 1024 ** 2, 2),
+            "imports_ms": round(sum(e["duration_ms"] for e in top_level if e["kind"] == "import"), 3),
+            "singletons_ms": round(sum(e["duration_ms"] for e in top_level if e["kind"] == "singleton"), 3),
+            "slowest": [e["label"] for e in sorted(events, key=lambda e: -e["duration_ms"])[:10]],
+            "events": events,
+        }
+
+    def format_waterfall(self, width=40):
+        """
+        Format the timeline as a text waterfall
+
+        Args:
+            width: Width of the bar column in characters
+
+        Returns:
+            str: Printable report
+        """
+        summary = self.get_summary()
+        total = max(summary["total_ms"], 1e-9)
+        lines = [
+            "=" * 100,
+            f"Startup profile: {summary['total_ms']:.0f} ms total, "
+            f"RSS {summary['rss_start_mb']:.1f} -> {summary['rss_end_mb']:.1f} MB",
+            "=" * 100,
+            f"{'start':>9} {'time':>9} {'rss':>8}  {'':<{width}}  event",
+        ]
+
+        for event in summary["events"]:
+            offset = int(event["start_ms"] / total * width)
+            length = max(1, int(event["duration_ms"] / total * width))
+            bar = (" " * offset + "#" * length)[:width]
+            label = "  " * event["depth"] + f"[{event['kind']}] {event['label']}"
+            if event.get("error"):
+                label += f"  !! {event['error']}"
+            lines.append(
+                f"{event['start_ms']:>7.0f}ms {event['duration_ms']:>7.1f}ms "
+                f"{event['rss_delta_mb']:>+6.1f}MB  {bar:<{width}}  {label}"
+            )
+
+        lines.append("=" * 100)
+        lines.append("Slowest: " + ", ".join(summary["slowest"][:5]))
+        return "\n".join(lines)
+
+    def save(self, filepath):
+        """Write the timeline as JSON"""
+        os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(self.get_summary(), f, indent=2)
+
+# Global profiler instance
+startup_profiler = StartupProfiler()
@@ -0,0 +1,153 @@
+"""
+Warm-up Scheduler
+Builds independent subsystems concurrently, respecting declared dependencies
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from utils.logger import logger
+from utils.service_registry import registry as default_registry
+
+class WarmupScheduler:
+    """Construct registry services in parallel on a thread pool"""
+
+    def __init__(self, registry=None, max_workers=4):
+        """
+        Initialize scheduler
+
+        Args:
+            registry: ServiceRegistry holding the services (default: global registry)
+            max_workers: Size of the warm-up thread pool
+        """
+        self.registry = registry or default_registry
+        self.max_workers = max_workers
+        self.tasks = {}
+        self.futures = {}
+        self.executor = None
+        self._started = False
+        self._lock = threading.Lock()
+
+    def add(self, name, depends_on=(), main_thread=False):
+        """
+        Declare a service to warm up
+
+        Args:
+            name: Registry service name
+            depends_on: Services that must be built first
+            main_thread: Build on the thread calling start() instead of the pool
+                (for objects with thread affinity, e.g. the COM-based SAPI voice)
+        """
+        if self._started:
+            raise RuntimeError("Cannot add warm-up tasks after start()")
+        self.tasks[name] = {"depends_on": tuple(depends_on), "main_thread": main_thread}
+        return self
+
+    def _ordered_tasks(self):
+        """Get task names in dependency order"""
+        ordered = []
+        visiting = set()
+
+        def visit(name):
+            if name in ordered:
+                return
+            if name in visiting:
+                raise RuntimeError(f"Circular warm-up dependency at: {name}")
+            visiting.add(name)
+            for dep in self.tasks.get(name, {}).get("depends_on", ()):
+                if dep in self.tasks:
+                    visit(dep)
+            visiting.discard(name)
+            ordered.append(name)
+
+        for name in self.tasks:
+            visit(name)
+        return ordered
+
+    def _build(self, name):
+        """
+        Wait for dependencies, then build the service
+
+        Declared dependencies are only ever waited on, never built here, so a
+        main-thread service is not constructed on a pool thread when a pool
+        task that needs it gets there first.
+        """
+        for dep in self.tasks[name]["depends_on"]:
+            future = self.futures.get(dep)
+            if future is not None:
+                future.result()
+            else:
+                self.registry.get(dep)
+
+        self.registry.get(name)
+        logger.debug(f"Warm-up complete: {name}")
+        return name
+
+    def start(self):
+        """
+        Start warming up all declared services
+
+        Pool tasks are submitted in dependency order so a task never waits on
+        a dependency queued behind it. Main-thread tasks are built inline while
+        the pool runs the others, and publish their outcome through a future
+        that pool tasks depending on them wait on.
+        """
+        with self._lock:
+            if self._started:
+                return self
+            self._started = True
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="warmup"
+        )
+        ordered = self._ordered_tasks()
+        main_thread_tasks = [name for name in ordered if self.tasks[name]["main_thread"]]
+
+        # Created before any pool task runs, so a pool task always finds them
+        for name in main_thread_tasks:
+            self.futures[name] = Future()
+
+        for name in ordered:
+            if not self.tasks[name]["main_thread"]:
+                self.futures[name] = self.executor.submit(self._build, name)
+
+        for name in main_thread_tasks:
+            future = self.futures[name]
+            try:
+                future.set_result(self._build(name))
+            except Exception as e:
+                logger.error(f"Warm-up failed for {name}: {e}")
+                future.set_exception(e)
+
+        self.executor.shutdown(wait=False)
+        logger.info(f"Warm-up started for: {', '.join(self.tasks)}")
+        return self
+
+    def wait(self, names=None, timeout=None):
+        """
+        Wait until the given services are built
+
+        Args:
+            names: Services to wait for (default: all)
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: True if all of them were built successfully
+        """
+        if names is None:
+            names = list(self.tasks)
+
+        futures = [self.futures[name] for name in names if name in self.futures]
+        done, pending = wait_futures(futures, timeout=timeout)
+
+        ok = not pending
+        for future in done:
+            error = future.exception()
+            if error:
+                logger.error(f"Warm-up failed: {error}")
+                ok = False
+
+        return ok and all(self.registry.is_built(name) for name in names)
+
+    def is_ready(self, name):
+        """Check whether a service finished warming up"""
+        return self.registry.is_built(name)